@@ -2,39 +2,96 @@
 API 模块 - 负责获取黄金价格数据
 """
 
+import asyncio
 import requests
 import json
+import socket
 import time
 import threading
-import re
+import zlib
+from array import array
+from collections import deque
 from datetime import datetime
-from typing import Tuple, Optional, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+from typing import Tuple, Optional, Any, Iterable, Callable, NamedTuple
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from websocket import WebSocketApp
-from bs4 import BeautifulSoup
 
 from .config import Config
+from .async_api import get_async_engine, open_stream_socket
+from .http_client import get_http_pool
+from .circuit_breaker import CircuitBreaker
+from .hedging import HedgeController
+from .sources import get_source_registry
+from .json_codec import loads as decode_json
+from .backoff import exponential_backoff
+from .disk_cache import get_cache_dir, load_json, save_json
+from .boc_rate import extract_boc_rate
+
+# 抓取结果类型
+FETCH_OK = 'ok'  # 获取到新数据
+FETCH_UNCHANGED = 'unchanged'  # 内容与上次相同，未重新解析
+FETCH_ERROR = 'error'  # 获取失败
+FETCH_CIRCUIT_OPEN = 'circuit_open'  # 数据源熔断中，未发起请求
 
 
 class GoldPriceAPI:
     """黄金价格 API 客户端"""
 
+    # 已知的价格字段路径（按优先级）
+    KNOWN_PRICE_PATHS = (
+        ('data', 'resultData', 'datas', 'price'),
+        ('data', 'price'),
+    )
+
     def __init__(self):
         self.config = Config()
-        self.current_api_index = self.config.CURRENT_API_INDEX
+        self.http = get_http_pool()
+        self.registry = get_source_registry()
+        self.current_source_id = self.config.DEFAULT_SOURCE_ID
+
+        # 长期存活的抓取线程池（避免每次轮询创建/销毁线程）
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.FETCH_MAX_WORKERS,
+            thread_name_prefix='gold-fetch'
+        )
+        self._pending_futures = {}  # {source_id: Future}，同一数据源的在途请求复用
+        self._queue_depth = 0  # 已提交但尚未开始执行的任务数
+        self._pending_lock = threading.Lock()
+
+        # 每个数据源上次成功提取价格的路径 {source_id: tuple}
+        self._price_paths = {}
+
+        # 条件请求与内容指纹：{source_id: {...}}，用于跳过未变化的响应
+        self._validators = {}  # ETag / Last-Modified
+        self._fingerprints = {}  # 响应体 CRC32
+        self._last_results = {}  # 上次成功解析的结果
+        self._fetch_outcomes = {}  # 最近一次抓取的结果类型
+
+        # 每个数据源独立的熔断器
+        self.breakers = {source_id: CircuitBreaker() for source_id in self.registry.http_ids()}
+
+        # 对冲请求（按数据源 p95 延迟补发请求，降低长尾延迟）
+        self.hedger = HedgeController()
+
+        # 响应解析器 {Config.SOURCES 中的 parser 名称: 解析函数}
+        self.parsers = {
+            'json_price': self._extract_price,
+        }
 
     def switch_api(self):
         """切换到下一个API"""
-        self.current_api_index = (self.current_api_index + 1) % len(self.config.API_NAMES)
+        self.current_source_id = self.registry.next_id(self.current_source_id)
         return self.get_current_api_name()
 
     def get_current_api_name(self) -> str:
         """获取当前API的名称"""
-        return self.config.API_NAMES[self.current_api_index]
+        return self.registry.get(self.current_source_id).name
 
     def get_current_api_url(self) -> str:
         """获取当前API的URL"""
-        return self.config.API_URLS[self.current_api_index]
+        return self.registry.get(self.current_source_id).url
 
     def fetch_price(self) -> Tuple[Optional[float], str, str]:
         """
@@ -44,263 +101,1129 @@ class GoldPriceAPI:
             Tuple[Optional[float], str, str]: (价格浮点数, 显示文本, 更新时间)
             如果获取失败，价格为 None
         """
-        return self._fetch_price_from_api(self.current_api_index)
+        return self._fetch_price_from_api(self.current_source_id)
 
-    def fetch_all_prices(self) -> dict:
+    def fetch_all_prices(self, source_ids: Optional[Iterable[str]] = None,
+                         priority_id: Optional[str] = None,
+                         deadline: Optional[float] = None,
+                         on_late_result: Optional[Callable[[str, tuple], None]] = None) -> dict:
         """
-        从所有API并行获取实时金价（使用线程池）
+        从多个API并行获取实时金价（使用线程池），在截止时间内返回已到达的结果
+
+        Args:
+            source_ids: 要获取的数据源ID，默认获取全部 HTTP 数据源
+            priority_id: 优先数据源（通常是当前显示的数据源），其结果到达后立即返回
+            deadline: 本轮最长等待时间（秒），默认 Config.REFRESH_DEADLINE
+            on_late_result: 超过截止时间或优先结果返回后才到达的结果回调 (source_id, 结果)，
+                            在抓取线程中调用
 
         Returns:
-            dict: {api_index: (价格浮点数, 显示文本, 更新时间, API名称)}
+            dict: {source_id: (价格浮点数, 显示文本, 更新时间, API名称)}，只包含已到达的结果
         """
         results = {}
+        if source_ids is None:
+            source_ids = self.registry.http_ids()
+        if deadline is None:
+            deadline = self.config.REFRESH_DEADLINE
+
+        # 使用常驻线程池并行请求
+        future_to_id = {
+            self.submit_fetch(source_id): source_id
+            for source_id in source_ids
+        }
+
+        # 收集截止时间内到达的结果，优先数据源到达后不再等待其他数据源
+        try:
+            for future in as_completed(future_to_id, timeout=deadline):
+                source_id = future_to_id[future]
+                results[source_id] = self._collect_result(source_id, future)
+                if source_id == priority_id:
+                    break
+        except FuturesTimeoutError:
+            pass
 
-        # 使用线程池并行请求所有API
-        with ThreadPoolExecutor(max_workers=len(self.config.API_URLS)) as executor:
-            # 提交所有任务
-            future_to_index = {
-                executor.submit(self._fetch_price_from_api, i): i
-                for i in range(len(self.config.API_URLS))
-            }
-
-            # 收集结果
-            for future in as_completed(future_to_index):
-                api_index = future_to_index[future]
-                try:
-                    price, display, update_time = future.result()
-                    results[api_index] = (price, display, update_time, self.config.API_NAMES[api_index])
-                except Exception as e:
-                    # 如果某个API失败，返回错误信息
-                    results[api_index] = (None, f"请求失败: {str(e)}", "", self.config.API_NAMES[api_index])
+        # 未到达的结果在完成时通过回调补充
+        for future, source_id in future_to_id.items():
+            if source_id in results:
+                continue
+            if future.done():
+                results[source_id] = self._collect_result(source_id, future)
+            elif on_late_result is not None:
+                future.add_done_callback(
+                    lambda f, i=source_id: on_late_result(i, self._collect_result(i, f))
+                )
 
         return results
 
-    def _fetch_price_from_api(self, api_index: int) -> Tuple[Optional[float], str, str]:
+    def _collect_result(self, source_id: str, future: Future) -> tuple:
+        """
+        从已完成的 Future 中取出结果
+
+        Args:
+            source_id: 数据源ID
+            future: 已完成的抓取任务
+
+        Returns:
+            tuple: (价格浮点数, 显示文本, 更新时间, API名称)
+        """
+        name = self.registry.get(source_id).name
+        try:
+            price, display, update_time = future.result()
+            return price, display, update_time, name
+        except Exception as e:
+            # 如果某个API失败（包括任务被取消），返回错误信息
+            return None, f"请求失败: {str(e)}", "", name
+
+    def _get_timeout(self, source_id: str) -> Tuple[float, float]:
+        """
+        获取数据源的 (连接超时, 读取超时)
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            Tuple[float, float]: 传给 requests 的超时元组
+        """
+        source = self.registry.get(source_id)
+        return source.connect_timeout, source.read_timeout
+
+    def submit_fetch(self, source_id: str) -> Future:
+        """
+        提交单个数据源的抓取任务，若该数据源已有未完成的请求则直接复用
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            Future: 结果为 (价格浮点数, 显示文本, 更新时间) 的 Future
+        """
+        with self._pending_lock:
+            future = self._pending_futures.get(source_id)
+            if future is not None and not future.done():
+                return future
+
+            self._queue_depth += 1
+            future = self.executor.submit(self._run_fetch_task, source_id)
+            future.add_done_callback(self._on_fetch_task_done)
+            self._pending_futures[source_id] = future
+            return future
+
+    def _run_fetch_task(self, source_id: str) -> Tuple[Optional[float], str, str]:
+        """线程池任务入口：出队计数后执行抓取"""
+        with self._pending_lock:
+            self._queue_depth -= 1
+        return self._fetch_price_from_api(source_id)
+
+    def _on_fetch_task_done(self, future: Future):
+        """任务完成回调：被取消的任务不会执行，需要在这里修正排队计数"""
+        if future.cancelled():
+            with self._pending_lock:
+                self._queue_depth -= 1
+
+    def get_queue_depth(self) -> int:
+        """获取抓取线程池中排队等待执行的任务数"""
+        with self._pending_lock:
+            return self._queue_depth
+
+    def cancel_pending(self):
+        """取消所有尚未开始执行的抓取任务"""
+        with self._pending_lock:
+            futures = list(self._pending_futures.values())
+            self._pending_futures.clear()
+        for future in futures:
+            future.cancel()
+
+    def shutdown(self):
+        """关闭抓取线程池（取消排队任务，不等待在途请求）"""
+        self.cancel_pending()
+        self.executor.shutdown(wait=False)
+        self.hedger.shutdown()
+
+    def _fetch_price_from_api(self, source_id: str) -> Tuple[Optional[float], str, str]:
         """
-        从指定的API获取实时金价
+        从指定的数据源获取实时金价，内容未变化时直接返回上次结果
 
         Args:
-            api_index: API索引
+            source_id: 数据源ID
 
         Returns:
             Tuple[Optional[float], str, str]: (价格浮点数, 显示文本, 更新时间)
         """
+        # 熔断中的数据源直接失败，不占用任何等待时间
+        if not self.breakers[source_id].allow_request():
+            return self._finish_fetch(source_id, FETCH_CIRCUIT_OPEN, (None, "数据源熔断中", ""))
+
         try:
-            response = requests.get(
-                self.config.API_URLS[api_index],
-                headers=self.config.HEADERS,
-                timeout=self.config.API_TIMEOUT
+            source = self.registry.get(source_id)
+            url = source.url
+            headers = self._build_request_headers(source_id)
+            timeout = self._get_timeout(source_id)
+            response = self.hedger.execute(
+                source_id,
+                lambda: self.http.get(url, headers=headers, timeout=timeout),
+                on_discard=lambda discarded: discarded.close()
             )
 
+            # 服务端确认未修改（条件请求命中）
+            if response.status_code == 304 and source_id in self._last_results:
+                return self._finish_fetch(source_id, FETCH_UNCHANGED, self._refresh_last_result(source_id))
+
             if response.status_code == 200:
+                # 响应体指纹与上次相同，跳过 JSON 解析和价格提取
+                fingerprint = zlib.crc32(response.content)
+                if fingerprint == self._fingerprints.get(source_id) and source_id in self._last_results:
+                    return self._finish_fetch(source_id, FETCH_UNCHANGED, self._refresh_last_result(source_id))
+
                 data = response.json()
-                price = self._extract_price(data)
+                price = self.parsers[source.parser](data, source_id)
 
                 if price is not None:
                     current_time = datetime.now().strftime("%H:%M:%S")
                     price_float = float(price)
-                    return price_float, f"{price} 元/克", current_time
+                    result = (price_float, f"{price} {source.unit}", current_time)
+                    self._remember_response(source_id, response, fingerprint, result)
+                    return self._finish_fetch(source_id, FETCH_OK, result)
                 else:
-                    return None, "价格字段未找到", ""
+                    return self._finish_fetch(source_id, FETCH_ERROR, (None, "价格字段未找到", ""))
             else:
-                return None, f"API错误: {response.status_code}", ""
+                return self._finish_fetch(source_id, FETCH_ERROR, (None, f"API错误: {response.status_code}", ""))
 
         except requests.exceptions.RequestException as e:
-            return None, f"网络错误: {str(e)}", ""
+            return self._finish_fetch(source_id, FETCH_ERROR, (None, f"网络错误: {str(e)}", ""))
         except json.JSONDecodeError as e:
-            return None, f"JSON解析错误: {str(e)}", ""
+            return self._finish_fetch(source_id, FETCH_ERROR, (None, f"JSON解析错误: {str(e)}", ""))
         except Exception as e:
-            return None, f"未知错误: {str(e)}", ""
+            return self._finish_fetch(source_id, FETCH_ERROR, (None, f"未知错误: {str(e)}", ""))
 
-    def _extract_price(self, data: dict) -> Optional[Any]:
+    def _build_request_headers(self, source_id: str) -> dict:
         """
-        从 API 响应数据中提取价格
+        构造请求头，服务端提供过 ETag/Last-Modified 时附带条件请求头
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            dict: 请求头
+        """
+        validators = self._validators.get(source_id)
+        if not validators:
+            return self.config.HEADERS
+
+        headers = dict(self.config.HEADERS)
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def _remember_response(self, source_id: str, response: requests.Response,
+                           fingerprint: int, result: Tuple[Optional[float], str, str]):
+        """记录成功响应的校验信息和结果，供后续请求判断是否变化"""
+        self._validators[source_id] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        self._fingerprints[source_id] = fingerprint
+        self._last_results[source_id] = result
+
+    def _refresh_last_result(self, source_id: str) -> Tuple[Optional[float], str, str]:
+        """内容未变化：沿用上次的价格和显示文本，更新时间改为本次确认的时间"""
+        price, display_text, _ = self._last_results[source_id]
+        result = (price, display_text, datetime.now().strftime("%H:%M:%S"))
+        self._last_results[source_id] = result
+        return result
+
+    def _finish_fetch(self, source_id: str, outcome: str,
+                      result: Tuple[Optional[float], str, str]) -> Tuple[Optional[float], str, str]:
+        """记录本次抓取结果类型，更新熔断器并返回结果"""
+        self._fetch_outcomes[source_id] = outcome
+        if outcome in (FETCH_OK, FETCH_UNCHANGED):
+            self.breakers[source_id].record_success()
+        elif outcome == FETCH_ERROR:
+            self.breakers[source_id].record_failure()
+        return result
+
+    def get_fetch_outcome(self, source_id: str) -> Optional[str]:
+        """
+        获取指定数据源最近一次抓取的结果类型
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            Optional[str]: FETCH_OK / FETCH_UNCHANGED / FETCH_ERROR / FETCH_CIRCUIT_OPEN，尚未抓取时为 None
+        """
+        return self._fetch_outcomes.get(source_id)
+
+    def get_hedge_metrics(self) -> dict:
+        """
+        获取对冲请求指标
+
+        Returns:
+            dict: {source_id: {'requests', 'hedges', 'hedge_wins', 'hedge_rate', 'win_rate', 'p95'}}
+        """
+        return self.hedger.get_metrics()
+
+    def get_source_health(self, source_id: str) -> Optional[dict]:
+        """
+        获取数据源的健康状态
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            Optional[dict]: 熔断器健康状态（见 CircuitBreaker.get_health），非 HTTP 数据源返回 None
+        """
+        breaker = self.breakers.get(source_id)
+        return breaker.get_health() if breaker else None
+
+    def _extract_price(self, data: dict, source_id: Optional[str] = None) -> Optional[Any]:
+        """
+        从 API 响应数据中提取价格，优先使用该数据源上次成功的路径
 
         Args:
             data: API 响应的 JSON 数据
+            source_id: 数据源ID（用于记忆成功路径），为 None 时不记忆
 
         Returns:
             价格值，如果未找到则返回 None
         """
-        # 尝试第一种可能的路径
-        try:
-            return data['data']['resultData']['datas']['price']
-        except (KeyError, TypeError):
-            pass
+        # 直接走已学习的路径，失效时才重新学习
+        learned_path = self._price_paths.get(source_id)
+        if learned_path is not None:
+            price = self._get_by_path(data, learned_path)
+            if price is not None:
+                return price
+            self._price_paths.pop(source_id, None)
+
+        # 尝试已知的路径
+        for path in self.KNOWN_PRICE_PATHS:
+            price = self._get_by_path(data, path)
+            if price is not None:
+                self._remember_price_path(source_id, path)
+                return price
+
+        # 有界遍历数据结构查找价格
+        path = self._find_price_path(data)
+        if path is None:
+            return None
+        self._remember_price_path(source_id, path)
+        return self._get_by_path(data, path)
+
+    def _remember_price_path(self, source_id: Optional[str], path: tuple):
+        """记录数据源成功提取价格的路径"""
+        if source_id is not None:
+            self._price_paths[source_id] = path
+
+    @staticmethod
+    def _get_by_path(data: Any, path: tuple) -> Optional[Any]:
+        """
+        按路径取值
 
-        # 尝试第二种可能的路径
-        try:
-            return data['data']['price']
-        except (KeyError, TypeError):
-            pass
+        Args:
+            data: 要取值的对象
+            path: 由字典键（str）和列表下标（int）组成的路径
 
-        # 遍历数据结构查找价格
-        return self._find_price_recursive(data)
+        Returns:
+            路径上的价格值（数字或字符串），路径不存在时返回 None
+        """
+        obj = data
+        try:
+            for key in path:
+                obj = obj[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return obj if isinstance(obj, (int, float, str)) else None
 
-    def _find_price_recursive(self, obj: Any, path: str = "") -> Optional[Any]:
+    def _find_price_path(self, data: Any) -> Optional[tuple]:
         """
-        递归查找价格字段
+        迭代查找价格字段，限制深度和访问节点数，保证耗时有上限
 
         Args:
-            obj: 要搜索的对象
-            path: 当前路径（用于调试）
+            data: 要搜索的对象
 
         Returns:
-            找到的价格值，否则返回 None
+            找到的价格路径，否则返回 None
         """
-        if isinstance(obj, dict):
-            for key, value in obj.items():
+        max_depth = self.config.PRICE_SEARCH_MAX_DEPTH
+        budget = self.config.PRICE_SEARCH_MAX_NODES
+
+        # 节点只记录 (父节点序号, 键)，找到后再回溯出路径，遍历过程中不拼接路径
+        parents = [(-1, None)]
+        stack = [(data, 0, 0)]  # (对象, 深度, 节点序号)
+
+        while stack:
+            obj, depth, node = stack.pop()
+
+            if isinstance(obj, dict):
+                items = obj.items()
+            elif isinstance(obj, list):
+                items = enumerate(obj)
+            else:
+                continue
+
+            children = []
+            for key, value in items:
+                budget -= 1
+                if budget < 0:
+                    return None
                 if key == "price" and isinstance(value, (int, float, str)):
-                    return value
-                elif isinstance(value, (dict, list)):
-                    result = self._find_price_recursive(value, f"{path}.{key}")
-                    if result is not None:
-                        return result
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                result = self._find_price_recursive(item, f"{path}[{i}]")
-                if result is not None:
-                    return result
+                    return self._build_path(parents, node, key)
+                if depth < max_depth and isinstance(value, (dict, list)):
+                    children.append((key, value))
+
+            # 逆序入栈，保持与原先递归相同的先后顺序
+            for key, value in reversed(children):
+                parents.append((node, key))
+                stack.append((value, depth + 1, len(parents) - 1))
+
         return None
 
+    @staticmethod
+    def _build_path(parents: list, node: int, key: Any) -> tuple:
+        """根据父节点链回溯出完整路径"""
+        path = [key]
+        while node > 0:
+            node, parent_key = parents[node]
+            path.append(parent_key)
+        path.reverse()
+        return tuple(path)
+
 
 class ExchangeRateAPI:
-    """汇率 API 客户端 - 获取美元兑人民币汇率"""
+    """
+    汇率 API 客户端 - 获取美元兑人民币汇率
+
+    缓存过期后先返回旧汇率，同时在共享的异步 I/O 事件循环上刷新（同一时间只有一次刷新），调用方不会等待网络请求。
+    刷新时同时请求所有汇率来源，采用第一个通过合理性检查的结果。
+    汇率及获取时间保存在磁盘缓存中，本机所有进程和实例共享，启动时直接使用（过期的同样先用再刷新）。
+    """
+
+    EXCHANGE_RATE_CACHE = 'exchange_rate'  # 汇率的磁盘缓存名称
 
     def __init__(self):
         self.config = Config()
-        self.cached_rate = None
-        self.cache_time = 0
+        self.http = get_http_pool()
+        # 长期存活的汇率请求线程池（每次刷新复用，慢来源的请求在池中自行结束）
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.EXCHANGE_RATE_MAX_WORKERS,
+            thread_name_prefix='exchange-rate'
+        )
+        # 汇率来源 {名称: 获取函数}，获取函数返回汇率、(汇率, 汇率表) 或 None（可通过 register_provider 追加）
+        self.providers = {
+            'exchangerate_api': self._fetch_from_primary_api,
+            'boc': self._fetch_from_boc
+        }
+        self.last_provider = None  # 最近一次被采用的汇率来源
+        # 主汇率 API 返回的完整汇率表 (币种→序号, array('d') 每 1 美元兑各币种, 获取时间)，整体替换
+        self._table = None
+        self._save_lock = threading.Lock()  # 汇率与汇率表可能由事件循环线程和汇率请求线程分别写入磁盘
+        # 当前汇率状态 (汇率, 每克换算系数 汇率/OUNCE_TO_GRAM, 获取时间)，整体替换，读取时无需加锁
+        self._state = None
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._last_attempt = 0.0  # 最近一次开始刷新的时间（time.time）
+        self._listeners = []  # 汇率更新回调 [callback(rate, factor)]
+        # 使用本机其他进程或实例保存的汇率
+        self._load_cache()
+
+    @property
+    def cached_rate(self) -> Optional[float]:
+        """已获取的汇率（尚未获取时为 None）"""
+        state = self._state
+        return state[0] if state else None
+
+    @property
+    def cache_time(self) -> float:
+        """已获取汇率的时间（time.time），尚未获取时为 0"""
+        state = self._state
+        return state[2] if state else 0
+
+    def register_provider(self, name: str, fetch: Callable[[], Optional[float]]):
+        """
+        注册汇率来源（同名来源会被替换）
+
+        Args:
+            name: 来源名称
+            fetch: 获取函数，返回美元兑人民币汇率，获取不到时返回 None；在刷新线程池中调用。
+                同一响应中带有完整汇率表时可返回 (汇率, {币种: 每 1 美元兑该币种})，该来源的汇率通过合理性检查时汇率表即被采用（不要求该来源赢得竞速）
+        """
+        self.providers[name] = fetch
+
+    def add_listener(self, callback: Callable[[float, float], None]):
+        """
+        注册汇率更新回调
+
+        Args:
+            callback: 回调函数 (汇率, 每克换算系数)，在异步 I/O 事件循环线程中调用，不应阻塞
+        """
+        self._listeners.append(callback)
 
     def get_usd_to_cny(self) -> float:
         """
-        获取美元兑人民币汇率，优先使用缓存
+        获取美元兑人民币汇率，不阻塞（缓存过期时返回旧汇率并在后台刷新）
 
         Returns:
-            float: 美元兑人民币汇率
+            float: 美元兑人民币汇率，尚未获取到时返回默认汇率
         """
-        # 检查缓存是否有效
-        if self._is_cache_valid():
-            return self.cached_rate
+        return self.get_conversion()[0]
 
-        # 尝试从主 API 获取
-        rate = self._fetch_from_primary_api()
-        if rate is not None:
-            self.cached_rate = rate
-            self.cache_time = time.time()
-            return rate
+    def get_conversion(self) -> Tuple[float, float]:
+        """
+        获取汇率及美元/盎司到人民币/克的换算系数，不阻塞（缓存过期时返回旧值并在后台刷新）
 
-        # 主 API 失败，尝试中国银行
-        rate = self._fetch_from_boc()
-        if rate is not None:
-            self.cached_rate = rate
-            self.cache_time = time.time()
-            return rate
+        Returns:
+            Tuple[float, float]: (汇率, 每克换算系数)，尚未获取到时使用默认汇率
+        """
+        if not self._is_cache_valid():
+            self._start_refresh()
+        return self.peek_conversion()
+
+    def peek_conversion(self) -> Tuple[float, float]:
+        """
+        读取当前的汇率及换算系数，不触发刷新
+
+        Returns:
+            Tuple[float, float]: (汇率, 每克换算系数)，尚未获取到时使用默认汇率
+        """
+        state = self._state
+        if state is None:
+            rate = self.config.DEFAULT_EXCHANGE_RATE
+            return rate, rate / self.config.OUNCE_TO_GRAM
+        return state[0], state[1]
 
-        # 都失败，返回默认汇率
-        return self.config.DEFAULT_EXCHANGE_RATE
+    def get_rate(self, currency: str) -> Optional[float]:
+        """
+        获取每 1 美元兑指定币种的汇率，不阻塞（汇率表缺失或过期时在后台刷新）
+
+        Args:
+            currency: 币种代码（如 'CNY'、'HKD'）
+
+        Returns:
+            Optional[float]: 汇率，汇率表中没有该币种时返回 None
+        """
+        currency = currency.upper()
+        if currency == 'USD':
+            return 1.0
+        if currency == 'CNY':
+            # 人民币汇率可能来自任一来源，与价格换算使用同一汇率
+            return self.get_conversion()[0]
+
+        table = self._table
+        if not self._is_table_valid():
+            self._start_refresh()
+        if table is None:
+            return None
+        index = table[0].get(currency)
+        return table[1][index] if index is not None else None
+
+    def _set_table(self, rates: dict, fetched_at: Optional[float] = None):
+        """
+        替换汇率表（跳过无效数值）
+
+        Args:
+            rates: {币种: 每 1 美元兑该币种}
+            fetched_at: 获取时间（time.time），默认当前时间
+        """
+        index = {}
+        values = array('d')
+        for currency, value in rates.items():
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if value > 0:
+                index[currency] = len(values)
+                values.append(value)
+        self._table = (index, values, time.time() if fetched_at is None else fetched_at)
 
     def _is_cache_valid(self) -> bool:
         """检查缓存是否有效"""
-        if self.cached_rate is None:
+        state = self._state
+        if state is None:
             return False
-        return (time.time() - self.cache_time) < self.config.EXCHANGE_RATE_CACHE_TIME
+        return (time.time() - state[2]) < self.config.EXCHANGE_RATE_CACHE_TIME
 
-    def _fetch_from_primary_api(self) -> Optional[float]:
-        """从主汇率 API 获取汇率"""
+    def _is_table_valid(self) -> bool:
+        """检查汇率表是否有效"""
+        table = self._table
+        if table is None:
+            return False
+        return (time.time() - table[2]) < self.config.EXCHANGE_RATE_CACHE_TIME
+
+    def _start_refresh(self):
+        """启动后台刷新（已有刷新进行中或刚失败过时跳过）"""
+        with self._refresh_lock:
+            now = time.time()
+            if self._refreshing or now - self._last_attempt < self.config.EXCHANGE_RATE_RETRY_INTERVAL:
+                return
+            self._refreshing = True
+            self._last_attempt = now
+        get_async_engine().submit(self._refresh())
+
+    def refresh(self) -> Optional[float]:
+        """
+        请求最新汇率（阻塞，最长 EXCHANGE_RATE_RACE_TIMEOUT 秒），成功后替换汇率状态并通知回调
+
+        Returns:
+            Optional[float]: 新汇率，都失败时返回 None（继续使用旧汇率）
+        """
+        try:
+            return get_async_engine().submit(self._refresh()).result()
+        except CancelledError:
+            # 事件循环已停止（程序退出）
+            return None
+
+    async def _refresh(self) -> Optional[float]:
+        """
+        刷新汇率（在异步 I/O 事件循环上运行）
+
+        Returns:
+            Optional[float]: 新汇率，都失败时返回 None
+        """
         try:
-            response = requests.get(
+            # 其他进程或实例可能刚刚刷新过（汇率表缺失或过期时仍需请求，否则非人民币显示一直等待汇率表）
+            if self._load_cache() and self._is_cache_valid() and self._is_table_valid():
+                return self.cached_rate
+            rate = await self._race_providers()
+            if rate is None:
+                return None
+            self._set_rate(rate)
+            self._save_cache()
+            return rate
+        finally:
+            with self._refresh_lock:
+                self._refreshing = False
+
+    async def _race_providers(self) -> Optional[float]:
+        """
+        同时请求所有汇率来源，返回第一个通过合理性检查的汇率（其余请求在线程池中自行结束）
+
+        汇率表与汇率的竞速分开：附带汇率表的来源只要其汇率通过合理性检查，汇率表就被采用并写入磁盘缓存，
+        即使汇率由其他来源（如推送中的美元兑离岸人民币报价）先返回。
+
+        Returns:
+            Optional[float]: 汇率，全部失败、异常或超时时返回 None
+        """
+        providers = dict(self.providers)
+        if not providers:
+            return None
+        reference = self.cached_rate or self.config.DEFAULT_EXCHANGE_RATE
+        try:
+            futures = {
+                asyncio.wrap_future(self.executor.submit(self._call_provider, fetch, reference)): name
+                for name, fetch in providers.items()
+            }
+        except RuntimeError:
+            # 线程池已关闭（程序退出时仍在进行的刷新）
+            return None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.EXCHANGE_RATE_RACE_TIMEOUT
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    print("汇率来源均未在超时时间内返回有效汇率")
+                    return None
+                for future in done:
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"汇率来源 {name} 获取失败: {e}")
+                        continue
+                    if result is None:
+                        continue
+                    rate, rates = result if isinstance(result, tuple) else (result, None)
+                    if not self._is_plausible(rate, reference):
+                        print(f"汇率来源 {name} 返回的汇率 {rate} 偏离 {reference} 过大，已忽略")
+                        continue
+                    self.last_provider = name
+                    return rate
+            return None
+        finally:
+            # 落选或超时的请求结束后取走其结果，避免事件循环报告未取回的异常
+            for future in futures:
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    def _call_provider(self, fetch: Callable[[], Any], reference: float) -> Any:
+        """
+        调用汇率来源（在汇率请求线程中），附带的汇率表在返回前采用，不论该来源是否赢得竞速
+
+        Args:
+            fetch: 获取函数
+            reference: 参考汇率（与竞速使用同一参考值），来源的汇率需通过合理性检查汇率表才被采用
+
+        Returns:
+            Any: 获取函数的返回值
+        """
+        result = fetch()
+        if isinstance(result, tuple) and self._is_plausible(result[0], reference):
+            self._set_table(result[1])
+            self._save_cache()
+        return result
+
+    def shutdown(self):
+        """关闭汇率请求线程池（不等待在途请求；此后的刷新直接返回 None）"""
+        self.executor.shutdown(wait=False)
+
+    def _is_plausible(self, rate: float, reference: float) -> bool:
+        """
+        检查汇率是否合理（相对参考汇率的偏离不超过 EXCHANGE_RATE_MAX_DEVIATION）
+
+        Args:
+            rate: 待检查的汇率
+            reference: 参考汇率（上次汇率或默认汇率）
+
+        Returns:
+            bool: 是否合理
+        """
+        if rate <= 0:
+            return False
+        return abs(rate / reference - 1) <= self.config.EXCHANGE_RATE_MAX_DEVIATION
+
+    def _set_rate(self, rate: float, fetched_at: Optional[float] = None):
+        """
+        替换汇率状态（汇率与换算系数一起替换）并通知回调
+
+        Args:
+            rate: 美元兑人民币汇率
+            fetched_at: 获取时间（time.time），默认当前时间
+        """
+        factor = rate / self.config.OUNCE_TO_GRAM
+        self._state = (rate, factor, time.time() if fetched_at is None else fetched_at)
+        for callback in list(self._listeners):
+            try:
+                callback(rate, factor)
+            except Exception as e:
+                print(f"汇率更新回调失败: {e}")
+
+    def _load_cache(self) -> bool:
+        """
+        读取磁盘缓存中的汇率（比当前汇率新时采用）
+
+        Returns:
+            bool: 是否采用了缓存中的汇率
+        """
+        data = load_json(self.EXCHANGE_RATE_CACHE)
+        if not isinstance(data, dict):
+            return False
+        try:
+            rate = float(data['rate'])
+            fetched_at = float(data['fetched_at'])
+            rates_fetched_at = float(data.get('rates_fetched_at', fetched_at))
+        except (KeyError, TypeError, ValueError):
+            return False
+        if rate <= 0 or (self._state is not None and fetched_at <= self._state[2]):
+            return False
+
+        rates = data.get('rates')
+        if isinstance(rates, dict):
+            self._set_table(rates, rates_fetched_at)
+        self.last_provider = data.get('provider')
+        self._set_rate(rate, fetched_at)
+        return True
+
+    def _save_cache(self):
+        """把当前汇率（及汇率表）原子写入磁盘缓存"""
+        with self._save_lock:
+            state = self._state
+            if state is None:
+                return
+            data = {'rate': state[0], 'fetched_at': state[2], 'provider': self.last_provider}
+            table = self._table
+            if table is not None:
+                index, values, rates_fetched_at = table
+                data['rates'] = {currency: values[i] for currency, i in index.items()}
+                data['rates_fetched_at'] = rates_fetched_at
+            save_json(self.EXCHANGE_RATE_CACHE, data)
+
+    def _fetch_from_primary_api(self) -> Optional[Tuple[float, dict]]:
+        """
+        从主汇率 API 获取汇率
+
+        Returns:
+            Optional[Tuple[float, dict]]: (美元兑人民币汇率, 同一响应中的完整汇率表)，失败时返回 None
+        """
+        try:
+            response = self.http.get(
                 self.config.EXCHANGE_RATE_APIS[0],
                 timeout=5
             )
             if response.status_code == 200:
                 data = response.json()
-                # exchangerate-api.com 的响应格式
+                # exchangerate-api.com 的响应格式（同一响应中的所有币种一并返回，由 _accept_table 采用）
                 if 'rates' in data and 'CNY' in data['rates']:
-                    return float(data['rates']['CNY'])
+                    return float(data['rates']['CNY']), data['rates']
         except Exception as e:
             print(f"主汇率API获取失败: {e}")
         return None
 
     def _fetch_from_boc(self) -> Optional[float]:
-        """从中国银行官网获取汇率"""
+        """从中国银行官网获取汇率（流式解析，读到美元行即停止下载和解析）"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 self.config.EXCHANGE_RATE_APIS[1],
                 headers=self.config.HEADERS,
-                timeout=10
+                timeout=10,
+                stream=True
             )
-            if response.status_code == 200:
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # 查找包含美元汇率的表格行
-                # 中国银行的页面结构：找到包含"美元"的行
-                rows = soup.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) > 0:
-                        # 第一列通常是货币名称
-                        if '美元' in cells[0].get_text():
-                            # 现汇买入价通常在第3或第4列
-                            # 我们使用现汇买入价（适合价格转换）
-                            if len(cells) >= 4:
-                                rate_text = cells[3].get_text().strip()
-                                # 移除可能的空格和换行
-                                rate_text = re.sub(r'\s+', '', rate_text)
-                                try:
-                                    rate = float(rate_text)
-                                    if rate > 0:
-                                        return rate
-                                except ValueError:
-                                    pass
+            try:
+                if response.status_code == 200:
+                    response.encoding = 'utf-8'
+                    return extract_boc_rate(response.iter_content(chunk_size=8192, decode_unicode=True))
+            finally:
+                response.close()
         except Exception as e:
             print(f"中国银行汇率获取失败: {e}")
         return None
 
 
+class Quote(NamedTuple):
+    """
+    品种报价快照（不可变）：原始美元报价及按当时汇率换算的人民币/克价格
+
+    每次收到报价都生成新快照并整体替换行情表中的引用，读取方拿到的快照不会再被修改。
+    """
+    bid: float  # 买入价（美元/盎司）
+    ask: float  # 卖出价（美元/盎司）
+    time: str  # 收到报价的时间
+    bid_cny: float  # 买入价（人民币/克）
+    ask_cny: float  # 卖出价（人民币/克）
+    spread_usd: float  # 点差（美元/盎司）
+    spread_cny: float  # 点差（人民币/克）
+    exchange_rate: float  # 换算使用的美元兑人民币汇率
+
+
+class _ConnectionLane:
+    """单条 WebSocket 连接的状态（冗余模式下同时保持多条）"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.ws = None
+        self.url = None  # 当前使用的地址
+        self.prepared_socket = None  # 择优时已建立的连接 (地址, TCP/TLS 连接)，交给下一次连接直接使用
+        self.thread = None
+        self.connected = False
+        self.failures = 0  # 连续连接失败次数（连接成功后清零）
+        self.last_activity = 0.0  # 最近一次收到消息或 pong 的时间（time.monotonic）
+        self.last_message = 0.0  # 最近一次收到推送消息的时间（pong 不算）
+        # 断线检测：从最后一次收到数据到发现断线的耗时
+        self.stale_reconnects = 0  # 看门狗因长时间无数据强制重连的次数
+        self.last_detect_latency = None
+        self.max_detect_latency = None
+        # 领先/落后统计：先到的报价计入 first_arrivals，重复到达的计入 duplicates 及其落后时间
+        self.first_arrivals = 0
+        self.duplicates = 0
+        self.lag_total = 0.0
+        self.positions = {}  # {symbol: 本连接最近送达（发布或被判为重复）的报价的发布序号}
+
+    def get_stats(self) -> dict:
+        """连接统计"""
+        return {
+            'url': self.url,
+            'connected': self.connected,
+            'failures': self.failures,
+            'stale_reconnects': self.stale_reconnects,
+            'last_detect_latency': self.last_detect_latency,
+            'max_detect_latency': self.max_detect_latency,
+            'first_arrivals': self.first_arrivals,
+            'duplicates': self.duplicates,
+            'avg_lag_ms': self.lag_total / self.duplicates * 1000 if self.duplicates else 0.0
+        }
+
+
 class LondonGoldWebSocket:
-    """伦敦金 WebSocket 客户端 - 获取实时金价"""
+    """伦敦金 WebSocket 客户端 - 获取实时金价及同一推送中的其他品种行情"""
+
+    WS_LINKS_CACHE = 'ws_links'  # 候选地址的磁盘缓存名称
 
     def __init__(self):
         self.config = Config()
+        self.http = get_http_pool()
         self.exchange_rate_api = ExchangeRateAPI()
-        self.ws = None
-        self.latest_data = None  # 存储最新的价格数据: {'bid': float, 'ask': float, 'time': str}
-        self.is_connected = False
-        self.reconnect_count = 0
+
+        # 冗余模式下同时连接两个不同地址，报价按先到为准合并
+        lane_count = 2 if self.config.WS_REDUNDANT_CONNECTIONS else 1
+        self.lanes = [_ConnectionLane(i) for i in range(lane_count)]
+        # {symbol: deque[(发布序号, (bid, ask), 到达时间)]}，按发布顺序保留最近 WS_DEDUPE_WINDOW 个报价；
+        # 与各连接的位置（lane.positions）一起用于丢弃落后连接送达的已发布报价
+        self._recent_ticks = {}
+        self._tick_seq = {}  # {symbol: 最近一次发布的序号}
+
+        # 行情表：按品种预分配 {symbol: Quote 或 None}。写入方（接收线程、汇率刷新）在锁内替换快照引用，
+        # 读取方直接读取引用，不加锁
+        registry = get_source_registry()
+        sources = [registry.get(source_id) for source_id in registry.websocket_ids()]
+        self._names = {source.symbol: source.name for source in sources}
+        self._units = {source.symbol: source.unit for source in sources}  # 品种的价格单位（来自数据源配置）
+        # 推送帧解析器（同一连接上的所有数据源共用一种帧格式）
+        self.parsers = {'quote_list': self._parse_quote_list}
+        self._parse_frame = self._select_parser({source.parser for source in sources})
+        self.quotes = {symbol: None for symbol in (*self.config.WS_SYMBOLS, *self._names)}
+        self._subscribers = {}  # {symbol: [callback(symbol, quote)]}
+        self._tracked_symbols = list(self.quotes)  # 关注的品种（预分配 + 订阅）
+        self._filter_tokens = ()  # 预过滤用的品种标记，不含任何标记的帧不解码
+        self._update_filter_tokens()
+        self.skipped_frames = 0  # 被预过滤跳过的帧数
+        # 接收线程换算人民币价格使用的 (汇率, 每克换算系数)，汇率更新时整体替换，接收线程不请求汇率
+        self._conversion = self.exchange_rate_api.peek_conversion()
+        self.exchange_rate_api.add_listener(self._apply_conversion)
+        # 推送中的美元兑离岸人民币报价作为本地汇率来源（无需网络请求，报价新鲜时通常最先返回）
+        self.exchange_rate_api.register_provider('london_usdcnh', self._get_usdcnh_rate)
+
+        self.is_connected = False  # 任意一条连接可用即为已连接
         self.lock = threading.Lock()
-        self.thread = None
         self.should_stop = False
+        self._generation = 0  # 每次 start 递增，停止后尚未退出的旧连接线程据此退出
+        # 重连等待可被提前唤醒（网络恢复、停止）
+        self._wake_event = threading.Event()
+        # 无数据看门狗（停止时唤醒退出）
+        self._stop_event = threading.Event()
+        self._watchdog_thread = None
+        self._races = set()  # 尚有握手未结束的地址择优（全部结束后置位的 Event）
+
+        # 连接统计（time.monotonic）
+        self._connected_since = None  # 本次连接建立时间
+        self._disconnected_at = None  # 最近一次断开时间，恢复连接后清空
+        self._total_reconnects = 0  # 断开后成功恢复的次数
+        self._last_recover_time = None  # 最近一次从断开到恢复的耗时（秒）
+
+    @property
+    def reconnect_count(self) -> int:
+        """连续连接失败次数（多条连接时取最少的一条）"""
+        return min(lane.failures for lane in self.lanes)
+
+    def is_running(self) -> bool:
+        """连接线程是否在运行"""
+        return any(lane.thread is not None and lane.thread.is_alive() for lane in self.lanes)
 
     def start(self):
-        """启动 WebSocket 连接（在后台线程）"""
-        if self.thread is None or not self.thread.is_alive():
+        """
+        启动 WebSocket 连接（每条连接一个后台线程）
+
+        停止后旧线程可能仍在择优地址（数秒），此时同样启动新线程，旧线程择优结束后发现已过期即退出。
+        """
+        if self.is_running() and not self.should_stop:
+            return
+        with self.lock:
+            self._generation += 1
+            generation = self._generation
             self.should_stop = False
-            self.thread = threading.Thread(target=self._run, daemon=True)
-            self.thread.start()
+        self._wake_event.clear()
+        self._stop_event.clear()
+        # 主动停止（如休市）后重新启动不计入断线恢复
+        self._disconnected_at = None
+        for lane in self.lanes:
+            lane.failures = 0
+            lane.thread = threading.Thread(
+                target=self._run, args=(lane.index, generation), name=f'london-ws-{lane.index}', daemon=True
+            )
+            lane.thread.start()
+
+        if self.config.WS_TICK_TIMEOUT > 0:
+            self._watchdog_thread = threading.Thread(target=self._watchdog, name='london-ws-watchdog', daemon=True)
+            self._watchdog_thread.start()
 
-    def _run(self):
-        """WebSocket 运行循环"""
-        while not self.should_stop:
+    def _watchdog(self):
+        """看门狗循环：定期检查已连接但长时间没有数据的连接"""
+        while not self._stop_event.wait(self.config.WS_WATCHDOG_INTERVAL):
+            self._check_stale(time.monotonic())
+
+    def _check_stale(self, now: float):
+        """
+        强制重连超过 WS_TICK_TIMEOUT 没有收到推送的连接（如切换 Wi-Fi 后的半开连接、服务端停推）
+
+        Args:
+            now: 当前时间（time.monotonic）
+        """
+        for lane in self.lanes:
+            if not lane.connected or now - lane.last_message <= self.config.WS_TICK_TIMEOUT:
+                continue
+            print(f"WebSocket 连接 {lane.index} 已 {now - lane.last_message:.0f} 秒无推送，强制重连")
+            lane.stale_reconnects += 1
+            self._mark_disconnected(lane.index)
+            if lane.ws:
+                lane.ws.close()
+
+    def _run(self, lane_index: int = 0, generation: Optional[int] = None):
+        """
+        WebSocket 运行循环：断开后按指数退避（带抖动）无限重连
+
+        Args:
+            lane_index: 连接序号
+            generation: 启动序号（默认当前），停止或重新启动后本线程退出
+        """
+        lane = self.lanes[lane_index]
+        if generation is None:
+            generation = self._generation
+        while not self._is_stopped(generation):
             try:
-                ws_url = self._fetch_ws_url()
-                self._connect(ws_url)
+                url = self._fetch_ws_url(lane_index)
+                # 择优地址可能耗时数秒，期间可能已停止（如休市），不再建立连接
+                if self._is_stopped(generation):
+                    if self.should_stop:
+                        self._close_prepared_socket(lane)
+                    break
+                lane.url = url
+                self._connect(url, lane_index)
             except Exception as e:
                 print(f"WebSocket 连接异常: {e}")
+            self._mark_disconnected(lane_index)
 
-            # 如果需要停止或达到最大重连次数，退出
-            if self.should_stop or self.reconnect_count >= self.config.MAX_WS_RECONNECT_ATTEMPTS:
+            if self._is_stopped(generation):
                 break
 
-            # 等待后重连
-            time.sleep(self.config.WS_RECONNECT_INTERVAL)
-            self.reconnect_count += 1
+            # 等待后重连，网络恢复或停止时提前唤醒
+            lane.failures += 1
+            delay = exponential_backoff(
+                lane.failures,
+                self.config.WS_RECONNECT_INTERVAL,
+                self.config.WS_RECONNECT_MAX_INTERVAL
+            )
+            if self._wake_event.wait(delay):
+                self._wake_event.clear()
+
+    def _is_stopped(self, generation: int) -> bool:
+        """连接线程是否应退出（已停止，或已重新启动由新线程接替）"""
+        return self.should_stop or generation != self._generation
+
+    @staticmethod
+    def _close_prepared_socket(lane: _ConnectionLane):
+        """关闭择优时保留但不再使用的连接"""
+        prepared, lane.prepared_socket = lane.prepared_socket, None
+        if prepared is not None:
+            prepared[1].close()
+
+    def notify_network_available(self):
+        """网络恢复通知：断开的连接跳过剩余的退避等待，立即重连"""
+        disconnected = [lane for lane in self.lanes if not lane.connected]
+        if disconnected:
+            for lane in disconnected:
+                lane.failures = 0
+            self._wake_event.set()
+
+    def _mark_disconnected(self, lane_index: int = 0):
+        """记录连接断开，所有连接都断开时才记为整体断线（重复调用只记录第一次）"""
+        now = time.monotonic()
+        with self.lock:
+            lane = self.lanes[lane_index]
+            if lane.connected and not self.should_stop:
+                # 以最后一次收到数据的时间近似断线时间，记录检测耗时
+                latency = now - lane.last_activity
+                lane.last_detect_latency = latency
+                lane.max_detect_latency = max(latency, lane.max_detect_latency or 0.0)
+            lane.connected = False
+            if any(lane.connected for lane in self.lanes):
+                return
+            self.is_connected = False
+            if self._connected_since is not None:
+                self._connected_since = None
+                self._disconnected_at = now
+
+    def get_connection_stats(self) -> dict:
+        """
+        获取连接统计
+
+        Returns:
+            dict: {'connected': 是否已连接, 'uptime': 本次连接持续时间（秒，未连接为 0）,
+                   'reconnects': 断开后恢复的次数, 'consecutive_failures': 连续失败次数,
+                   'last_recover_time': 最近一次断开到恢复的耗时（秒，无记录为 None）,
+                   'down_for': 当前已断开的时间（秒，已连接为 0）,
+                   'lanes': 每条连接的地址、状态和领先/落后统计}
+        """
+        now = time.monotonic()
+        connected_since = self._connected_since
+        disconnected_at = self._disconnected_at
+        return {
+            'connected': self.is_connected,
+            'uptime': now - connected_since if connected_since is not None else 0.0,
+            'reconnects': self._total_reconnects,
+            'consecutive_failures': self.reconnect_count,
+            'last_recover_time': self._last_recover_time,
+            'down_for': now - disconnected_at if disconnected_at is not None and connected_since is None else 0.0,
+            'lanes': [lane.get_stats() for lane in self.lanes]
+        }
+
+    def _fetch_ws_url(self, lane_index: Optional[int] = None) -> str:
+        """
+        获取 WebSocket 地址
+
+        候选地址缓存在磁盘中（有效期 WS_LINKS_CACHE_TTL），缓存有效时跳过地址发现接口。每次连接前
+        与按上次排名靠前的候选地址并行建立连接，取最快的地址并记录排名；胜出的连接交给该连接序号
+        直接使用（lane.prepared_socket），不再重新建立，因此择优不增加握手次数，冷启动同样择优。
+        冗余模式下跳过其他连接正在使用的地址。
 
-    def _fetch_ws_url(self) -> str:
-        """获取 WebSocket 地址，失败时返回备用地址"""
+        Args:
+            lane_index: 连接序号，None 表示不属于任何连接（只查询地址）
+
+        Returns:
+            str: WebSocket 地址，全部失败时返回备用地址
+        """
+        lane = self.lanes[lane_index] if lane_index is not None else None
+        in_use = {other.url for other in self.lanes if other is not lane and other.connected}
+
+        cached = self._load_cached_links()
+        if cached is not None:
+            discovered_at, links, latencies = cached
+        else:
+            discovered_at, links, latencies = time.time(), self._discover_ws_links(), {}
+            if links:
+                save_json(self.WS_LINKS_CACHE, {'discovered_at': discovered_at, 'links': links})
+        available = [link for link in links if link not in in_use]
+
+        if available:
+            winner = self._race_ws_links(
+                available[:self.config.WS_RACE_CANDIDATES], links, discovered_at, latencies
+            )
+            if winner:
+                url, sock = winner
+                if lane is not None:
+                    self._close_prepared_socket(lane)
+                    lane.prepared_socket = (url, sock)
+                else:
+                    sock.close()
+                print(f"使用握手最快的 WebSocket 地址: {url}")
+                return url
+
+        # 使用备用地址
+        print(f"使用备用 WebSocket 地址: {self.config.WS_BACKUP_URL}")
+        return self.config.WS_BACKUP_URL
+
+    def _load_cached_links(self) -> Optional[Tuple[float, list, dict]]:
+        """
+        读取磁盘缓存的候选地址
+
+        Returns:
+            Optional[Tuple[float, list, dict]]: (发现时间, 按握手速度排序的地址, {地址: 最近一次测得的耗时（秒）})，
+                不存在或已过期时返回 None
+        """
+        data = load_json(self.WS_LINKS_CACHE)
         try:
-            response = requests.get(
+            discovered_at = float(data['discovered_at'])
+            links = [link for link in data['links'] if isinstance(link, str) and link]
+            latencies = {
+                link: float(latency) for link, latency in (data.get('latencies') or {}).items() if link in links
+            }
+        except (TypeError, KeyError, ValueError, AttributeError):
+            return None
+        if not links or time.time() - discovered_at > self.config.WS_LINKS_CACHE_TTL:
+            return None
+        return discovered_at, links, latencies
+
+    def _discover_ws_links(self) -> list:
+        """
+        通过地址发现接口获取所有候选 WebSocket 地址
+
+        Returns:
+            list: 候选地址（按接口返回顺序去重），失败时返回空列表
+        """
+        try:
+            response = self.http.get(
                 self.config.WS_DOMAIN_API,
                 headers=self.config.HEADERS,
                 timeout=5
@@ -308,164 +1231,558 @@ class LondonGoldWebSocket:
             if response.status_code == 200:
                 data = response.json()
                 if data.get('code') == 0 and 'data' in data and 'hq_ws_links' in data['data']:
-                    ws_links = data['data']['hq_ws_links']
-                    # 获取第一个 WebSocket 地址
-                    first_key = list(ws_links.keys())[0] if ws_links else None
-                    if first_key and ws_links[first_key]:
-                        print(f"获取到动态 WebSocket 地址: {ws_links[first_key]}")
-                        return ws_links[first_key]
+                    ws_links = data['data']['hq_ws_links'] or {}
+                    links = list(dict.fromkeys(link for link in ws_links.values() if link))
+                    print(f"获取到 {len(links)} 个动态 WebSocket 地址")
+                    return links
         except Exception as e:
             print(f"动态获取 WebSocket 地址失败: {e}")
+        return []
 
-        # 使用备用地址
-        print(f"使用备用 WebSocket 地址: {self.config.WS_BACKUP_URL}")
-        return self.config.WS_BACKUP_URL
+    def _race_ws_links(self, candidates: list, links: list, discovered_at: float,
+                       known_latencies: Optional[dict] = None) -> Optional[Tuple[str, socket.socket]]:
+        """
+        并行与候选地址建立连接，返回最先成功的地址及其连接（其余连接随即关闭）；
+        全部结束后按耗时更新缓存中的排名
+
+        握手都在共享的异步 I/O 事件循环上进行，不为择优启动线程；调用方线程只等待结果。
+
+        排名按每个地址最近一次测得的耗时排序：未参与本次握手的地址（如其他连接正在使用的最快地址）沿用
+        之前测得的耗时，不会因未参与而排到后面；从未测得耗时的地址保持原顺序排在最后。
+        结束较晚的握手在调用方返回后才写入排名，写入开始时的缓存目录。
+
+        Args:
+            candidates: 参与握手的地址
+            links: 全部候选地址
+            discovered_at: 地址发现时间（写回缓存时保留，不延长有效期）
+            known_latencies: 之前测得的耗时 {地址: 秒}
+
+        Returns:
+            Optional[Tuple[str, socket.socket]]: (最快的地址, 已建立的连接)，全部失败或超时时返回 None
+        """
+        cache_dir = get_cache_dir()
+        latencies = {}
+        pending = [len(candidates)]
+        all_done = threading.Event()
+        self._races.add(all_done)
+        result = {}  # 'winner': (url, sock)；'closed': 调用方已停止等待
+        decided = threading.Event()
+        lock = threading.Lock()
+
+        def on_done(url: str, latency: float, sock: Optional[socket.socket]):
+            with lock:
+                latencies[url] = latency
+                pending[0] -= 1
+                finished = pending[0] == 0
+                keep = sock is not None and 'winner' not in result and 'closed' not in result
+                if keep:
+                    result['winner'] = (url, sock)
+            if sock is not None and not keep:
+                sock.close()
+            if keep or finished:
+                decided.set()
+            if finished:
+                measured = dict(known_latencies or {})
+                measured.update(latencies)
+                ranked = sorted(links, key=lambda link: measured.get(link, float('inf')))
+                measured = {link: latency for link, latency in measured.items() if latency != float('inf')}
+                save_json(self.WS_LINKS_CACHE, {
+                    'discovered_at': discovered_at, 'links': ranked, 'latencies': measured
+                }, cache_dir)
+                self._races.discard(all_done)
+                all_done.set()
+
+        async def probe(url: str):
+            try:
+                latency, sock = await asyncio.wait_for(self._probe_ws_link(url), self.config.WS_HANDSHAKE_TIMEOUT)
+            except asyncio.CancelledError:
+                # 事件循环停止（程序退出）
+                on_done(url, float('inf'), None)
+                raise
+            except Exception:
+                latency, sock = float('inf'), None
+            on_done(url, latency, sock)
+
+        async def race():
+            await asyncio.gather(*(probe(url) for url in candidates))
+
+        get_async_engine().submit(race())
+        decided.wait(self.config.WS_HANDSHAKE_TIMEOUT + 1)
+        with lock:
+            # 超时后才完成的连接由 on_done 关闭
+            result['closed'] = True
+            return result.get('winner')
+
+    def wait_for_races(self, timeout: float) -> bool:
+        """
+        等待进行中的地址择优全部结束（排名已写入缓存），用于退出或测试清理
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否全部结束
+        """
+        deadline = time.monotonic() + timeout
+        for done in list(self._races):
+            if not done.wait(max(0.0, deadline - time.monotonic())):
+                return False
+        return True
 
-    def _connect(self, ws_url: str):
-        """建立 WebSocket 连接"""
-        self.ws = WebSocketApp(
+    async def _probe_ws_link(self, url: str) -> Tuple[float, socket.socket]:
+        """
+        与地址建立 TCP 连接（wss 地址同时完成 TLS 握手），连接交给 WebSocketApp 继续完成 WebSocket 握手
+
+        Args:
+            url: WebSocket 地址
+
+        Returns:
+            Tuple[float, socket.socket]: (建立连接的耗时（秒）, 已建立的连接)，失败时抛出异常
+        """
+        parts = urlsplit(url)
+        secure = parts.scheme == 'wss'
+        start = time.monotonic()
+        sock = await open_stream_socket(
+            parts.hostname, parts.port or (443 if secure else 80), secure, self.config.WS_HANDSHAKE_TIMEOUT
+        )
+        return time.monotonic() - start, sock
+
+    def _connect(self, ws_url: str, lane_index: int = 0):
+        """
+        建立 WebSocket 连接（阻塞直到连接断开）
+
+        Args:
+            ws_url: WebSocket 地址
+            lane_index: 连接序号
+        """
+        lane = self.lanes[lane_index]
+        # 择优时为该地址建立的连接直接用于 WebSocket 握手，不重新连接
+        prepared_socket = None
+        if lane.prepared_socket is not None and lane.prepared_socket[0] == ws_url:
+            prepared_socket = lane.prepared_socket[1]
+            lane.prepared_socket = None
+        self._close_prepared_socket(lane)
+        lane.ws = WebSocketApp(
             ws_url,
-            on_message=self._on_message,
-            on_error=self._on_error,
-            on_close=self._on_close,
-            on_open=self._on_open
+            socket=prepared_socket,
+            on_message=lambda ws, message: self._on_message(ws, message, lane_index),
+            on_error=lambda ws, error: self._on_error(ws, error, lane_index),
+            on_close=lambda ws, code, msg: self._on_close(ws, code, msg, lane_index),
+            on_open=lambda ws: self._on_open(ws, lane_index),
+            on_pong=lambda ws, data: self._touch(lane_index)
+        )
+        # 心跳：超过 ping_timeout 未收到 pong 时 run_forever 报错返回，进入重连
+        lane.ws.run_forever(
+            ping_interval=self.config.WS_PING_INTERVAL,
+            ping_timeout=self.config.WS_PING_TIMEOUT
         )
-        self.ws.run_forever()
 
-    def _on_open(self, ws):
+    def _touch(self, lane_index: int):
+        """记录连接收到数据（消息或 pong）"""
+        self.lanes[lane_index].last_activity = time.monotonic()
+
+    def _on_open(self, ws, lane_index: int = 0):
         """连接建立回调"""
-        print("WebSocket 已连接")
-        self.is_connected = True
-        self.reconnect_count = 0
+        if self.should_stop:
+            # 停止时正在握手的连接：建立后立即关闭（run_forever 开始前的 close 不生效）
+            if ws is not None:
+                ws.close()
+            return
+        print(f"WebSocket 已连接 (连接 {lane_index})")
+        if ws is not None and ws.sock is not None:
+            # 择优时的连接带有握手超时，连接建立后改由心跳检测断线
+            ws.sock.settimeout(None)
+        now = time.monotonic()
+        with self.lock:
+            lane = self.lanes[lane_index]
+            lane.connected = True
+            lane.failures = 0
+            lane.last_activity = now
+            lane.last_message = now
+            if not self.is_connected:
+                # 从全部断开中恢复（冗余模式下另一条连接仍在时不算断线）
+                if self._disconnected_at is not None:
+                    self._last_recover_time = now - self._disconnected_at
+                    self._total_reconnects += 1
+                    self._disconnected_at = None
+                self._connected_since = now
+            self.is_connected = True
+
+    def _update_filter_tokens(self):
+        """根据关注的品种生成预过滤标记（调用方持有锁或处于初始化阶段）"""
+        self._filter_tokens = (
+            tuple(f'"{symbol}"' for symbol in self._tracked_symbols),
+            tuple(f'"{symbol}"'.encode() for symbol in self._tracked_symbols)
+        )
+
+    def _has_tracked_symbol(self, message) -> bool:
+        """
+        预过滤：原始消息中是否出现关注的品种（子串查找，不解码）
+
+        Args:
+            message: 原始消息（str 或 bytes）
+
+        Returns:
+            bool: 是否需要解码
+        """
+        text_tokens, bytes_tokens = self._filter_tokens
+        tokens = bytes_tokens if isinstance(message, (bytes, bytearray)) else text_tokens
+        return any(token in message for token in tokens)
+
+    def _on_message(self, ws, message, lane_index: int = 0):
+        """
+        接收消息回调：跳过不含关注品种的帧，其余一次遍历解析帧中的所有品种，按当前汇率生成报价快照
+
+        冗余模式下同一报价 (symbol, bid, ask) 以先到的连接为准：每个品种按发布序号保留最近发布的若干报价，
+        每条连接记录自己在其中的位置。连接送达的报价若在其位置之后已发布过，说明该连接落后，丢弃并把位置
+        前移到该报价；否则为新报价，发布并把位置移到最新。落后连接重放的整段旧报价因此都被丢弃，
+        不会用旧报价覆盖新报价；同一连接在自己位置之后再次送达相同报价视为价格回到该值，照常发布。
+
+        Args:
+            ws: WebSocketApp
+            message: 原始消息
+            lane_index: 收到消息的连接序号
+        """
+        arrived_at = time.monotonic()
+        lane = self.lanes[lane_index]
+        lane.last_activity = lane.last_message = arrived_at
+        if not self._has_tracked_symbol(message):
+            self.skipped_frames += 1
+            return
 
-    def _on_message(self, ws, message):
-        """接收消息回调"""
         try:
-            data = json.loads(message)
-            # 数据格式: [{"symbol": "GOLD", "bid": 2850.5, "ask": 2851.5, ...}, ...]
-            if isinstance(data, list):
-                for item in data:
-                    if item.get('symbol') == 'GOLD':
-                        bid = float(item.get('bid', 0))
-                        ask = float(item.get('ask', 0))
-
-                        with self.lock:
-                            self.latest_data = {
-                                'bid': bid,
-                                'ask': ask,
-                                'time': datetime.now().strftime("%H:%M:%S")
-                            }
-                        break
+            ticks = self._parse_frame(decode_json(message))
         except Exception as e:
             print(f"解析 WebSocket 消息失败: {e}")
+            return
+
+        if not ticks:
+            return
+        now = datetime.now().strftime("%H:%M:%S")
+        with self.lock:
+            # 换算汇率与快照在同一临界区内读取和替换，汇率更新不会被按旧汇率生成的快照覆盖
+            conversion = self._conversion
+            lane = self.lanes[lane_index]
+            accepted = []
+            for symbol, bid, ask in ticks:
+                key = (bid, ask)
+                recent = self._recent_ticks.get(symbol)
+                if recent is None:
+                    recent = self._recent_ticks[symbol] = deque(maxlen=self.config.WS_DEDUPE_WINDOW)
+                position = lane.positions.get(symbol, 0)
+                seen = next((tick for tick in recent if tick[0] > position and tick[1] == key), None)
+                if seen is not None:
+                    # 另一条连接已在本连接的位置之后送达该报价：本连接落后，丢弃
+                    lane.positions[symbol] = seen[0]
+                    lane.duplicates += 1
+                    lane.lag_total += arrived_at - seen[2]
+                    continue
+                seq = self._tick_seq[symbol] = self._tick_seq.get(symbol, 0) + 1
+                recent.append((seq, key, arrived_at))
+                lane.positions[symbol] = seq
+                lane.first_arrivals += 1
+                quote = self._make_quote(bid, ask, now, conversion)
+                self.quotes[symbol] = quote
+                accepted.append((symbol, quote))
+        self._notify(accepted)
+
+    def _notify(self, updates: list):
+        """
+        通知订阅者（在锁外调用，回调耗时不影响行情写入）
+
+        Args:
+            updates: [(symbol, Quote)]
+        """
+        callbacks = [
+            (callback, symbol, quote)
+            for symbol, quote in updates
+            for callback in list(self._subscribers.get(symbol, ()))
+        ]
+        for callback, symbol, quote in callbacks:
+            try:
+                callback(symbol, quote)
+            except Exception as e:
+                print(f"WebSocket 订阅回调失败: {e}")
+
+    def _get_usdcnh_rate(self) -> Optional[float]:
+        """
+        由推送中的美元兑离岸人民币报价计算汇率（买卖中间价）
+
+        Returns:
+            Optional[float]: 汇率，未收到报价或报价已超过 WS_USDCNH_MAX_AGE 秒未更新时返回 None
+        """
+        symbol = self.config.WS_USDCNH_SYMBOL
+        with self.lock:
+            quote = self.quotes.get(symbol)
+            recent = self._recent_ticks.get(symbol)
+            if quote is None or not recent:
+                return None
+            arrived_at = recent[-1][2]
+        if time.monotonic() - arrived_at > self.config.WS_USDCNH_MAX_AGE:
+            return None
+        return (quote.bid + quote.ask) / 2
+
+    def _make_quote(self, bid: float, ask: float, update_time: str,
+                    conversion: Tuple[float, float]) -> Quote:
+        """
+        生成报价快照（换算不涉及网络请求）
+
+        Args:
+            bid: 买入价（美元/盎司）
+            ask: 卖出价（美元/盎司）
+            update_time: 报价时间
+            conversion: (美元兑人民币汇率, 每克换算系数)
+
+        Returns:
+            Quote: 报价快照
+        """
+        exchange_rate, factor = conversion
+        bid_cny = self._convert_price(bid, factor)
+        ask_cny = self._convert_price(ask, factor)
+        return Quote(
+            bid=bid, ask=ask, time=update_time,
+            bid_cny=bid_cny, ask_cny=ask_cny,
+            spread_usd=ask - bid, spread_cny=ask_cny - bid_cny,
+            exchange_rate=exchange_rate
+        )
+
+    def refresh_exchange_rate(self) -> float:
+        """
+        按汇率缓存同步换算汇率（不阻塞：缓存过期时汇率在后台刷新，完成后通过回调更新快照）
+
+        Returns:
+            float: 当前美元兑人民币汇率
+        """
+        exchange_rate, factor = self.exchange_rate_api.get_conversion()
+        self._apply_conversion(exchange_rate, factor)
+        return exchange_rate
+
+    def _apply_conversion(self, exchange_rate: float, factor: float):
+        """
+        替换换算汇率，并按新汇率重新生成已有快照
 
-    def _on_error(self, ws, error):
+        汇率在锁内替换，此后生成的报价均使用新汇率；替换快照前确认其未被新报价覆盖，避免回退到旧报价。
+
+        Args:
+            exchange_rate: 美元兑人民币汇率
+            factor: 每克换算系数
+        """
+        conversion = (exchange_rate, factor)
+        with self.lock:
+            if self._conversion == conversion:
+                return
+            self._conversion = conversion
+
+        updated = []
+        for symbol, quote in list(self.quotes.items()):
+            if quote is None or quote.exchange_rate == exchange_rate:
+                continue
+            new_quote = self._make_quote(quote.bid, quote.ask, quote.time, conversion)
+            with self.lock:
+                if self.quotes.get(symbol) is quote:
+                    self.quotes[symbol] = new_quote
+                    updated.append((symbol, new_quote))
+        self._notify(updated)
+
+    def _select_parser(self, parser_names: set) -> Callable[[Any], list]:
+        """
+        按数据源配置选择推送帧解析器
+
+        Args:
+            parser_names: WebSocket 数据源配置的解析器名称
+
+        Returns:
+            Callable: 解析函数
+
+        Raises:
+            ValueError: 数据源配置了不同的解析器或未知的解析器
+        """
+        if len(parser_names) > 1:
+            raise ValueError(f"同一 WebSocket 连接的数据源必须使用同一解析器: {sorted(parser_names)}")
+        name = next(iter(parser_names), 'quote_list')
+        if name not in self.parsers:
+            raise ValueError(f"未知的 WebSocket 解析器: {name}")
+        return self.parsers[name]
+
+    @staticmethod
+    def _parse_quote_list(data: Any) -> list:
+        """
+        解析报价列表帧: [{"symbol": "GOLD", "bid": 2850.5, "ask": 2851.5, ...}, ...]
+
+        Args:
+            data: 解码后的帧
+
+        Returns:
+            list: [(symbol, bid, ask)]，跳过无法解析的条目
+        """
+        if not isinstance(data, list):
+            return []
+        ticks = []
+        for item in data:
+            symbol = item.get('symbol') if isinstance(item, dict) else None
+            if not symbol:
+                continue
+            try:
+                ticks.append((symbol, float(item.get('bid', 0)), float(item.get('ask', 0))))
+            except (TypeError, ValueError):
+                continue
+        return ticks
+
+    def subscribe(self, symbol: str, callback: Callable[[str, Quote], None]):
+        """
+        订阅品种行情，每次该品种报价快照更新时回调
+
+        Args:
+            symbol: 品种代码（如 'GOLD'、'SILVER'）
+            callback: 回调函数 (symbol, Quote)，在 WebSocket 线程（或刷新汇率的线程）中调用，不能阻塞
+        """
+        with self.lock:
+            self._subscribers.setdefault(symbol, []).append(callback)
+            self.quotes.setdefault(symbol, None)
+            if symbol not in self._tracked_symbols:
+                self._tracked_symbols.append(symbol)
+                self._update_filter_tokens()
+
+    def unsubscribe(self, symbol: str, callback: Callable[[str, Quote], None]):
+        """取消订阅品种行情"""
+        with self.lock:
+            callbacks = self._subscribers.get(symbol, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def get_quote(self, symbol: str) -> Optional[Quote]:
+        """
+        获取品种的最新报价快照（不加锁）
+
+        Args:
+            symbol: 品种代码
+
+        Returns:
+            Optional[Quote]: 报价快照，尚未收到报价时返回 None
+        """
+        return self.quotes.get(symbol)
+
+    def get_symbols(self) -> list:
+        """获取行情表中的所有品种"""
+        return list(self.quotes)
+
+    def _symbol_name(self, symbol: str) -> str:
+        """品种的显示名称（来自数据源配置），未配置时使用品种代码"""
+        return self._names.get(symbol, symbol)
+
+    def _symbol_unit(self, symbol: str) -> str:
+        """品种的价格单位（来自数据源配置），未配置时使用人民币/克"""
+        return self._units.get(symbol, '元/克')
+
+    def _on_error(self, ws, error, lane_index: int = 0):
         """错误回调"""
-        print(f"WebSocket 错误: {error}")
-        self.is_connected = False
+        print(f"WebSocket 错误 (连接 {lane_index}): {error}")
+        self._mark_disconnected(lane_index)
 
-    def _on_close(self, ws, close_status_code, close_msg):
+    def _on_close(self, ws, close_status_code, close_msg, lane_index: int = 0):
         """连接关闭回调"""
-        print(f"WebSocket 已关闭: {close_status_code} - {close_msg}")
-        self.is_connected = False
+        print(f"WebSocket 已关闭 (连接 {lane_index}): {close_status_code} - {close_msg}")
+        self._mark_disconnected(lane_index)
 
-    def _convert_price(self, usd_per_oz: float) -> float:
+    def _convert_price(self, usd_per_oz: float, factor: float) -> float:
         """
         将美元/盎司转换为人民币/克
 
         Args:
             usd_per_oz: 美元/盎司价格
+            factor: 每克换算系数（汇率 / OUNCE_TO_GRAM）
 
         Returns:
             float: 人民币/克价格（保留2位小数）
         """
-        exchange_rate = self.exchange_rate_api.get_usd_to_cny()
-        cny_per_gram = (usd_per_oz * exchange_rate) / self.config.OUNCE_TO_GRAM
-        return round(cny_per_gram, self.config.PRICE_DECIMAL_PLACES)
+        return round(usd_per_oz * factor, self.config.PRICE_DECIMAL_PLACES)
 
-    def get_latest_price(self) -> Tuple[Optional[float], str, str]:
+    def get_latest_price(self, symbol: str = 'GOLD') -> Tuple[Optional[float], str, str]:
         """
-        获取最新价格（转换后的人民币/克）
+        获取品种的最新价格（转换后的人民币/克），汇率缓存过期时触发后台刷新（不阻塞）
+
+        Args:
+            symbol: 品种代码，默认伦敦金
 
         Returns:
             Tuple[Optional[float], str, str]: (价格浮点数, 显示文本, 更新时间)
             如果离线，价格为 None
         """
-        with self.lock:
-            if self.latest_data is None:
-                if not self.is_connected:
-                    return (None, "伦敦金: 离线", "")
-                else:
-                    return (None, "伦敦金: 等待数据...", "")
-
-            try:
-                # 获取当前汇率
-                exchange_rate = self.exchange_rate_api.get_usd_to_cny()
-
-                # 转换买入价（用于主显示）
-                bid_cny = self._convert_price(self.latest_data['bid'])
-                ask_cny = self._convert_price(self.latest_data['ask'])
-                spread_usd = self.latest_data['ask'] - self.latest_data['bid']
-                spread_cny = ask_cny - bid_cny
+        self.refresh_exchange_rate()
+        return self.get_cached_price(symbol)
 
-                # 生成详细的显示文本
-                display_text = f"{bid_cny:.2f} 元/克"
-
-                # 生成工具提示（在 widget 中会用到）
-                # 这里只返回基本的显示文本
-
-                # 存储详细信息供工具提示使用
-                self.latest_data['bid_cny'] = bid_cny
-                self.latest_data['ask_cny'] = ask_cny
-                self.latest_data['spread_usd'] = spread_usd
-                self.latest_data['spread_cny'] = spread_cny
-                self.latest_data['exchange_rate'] = exchange_rate
+    def get_cached_price(self, symbol: str = 'GOLD') -> Tuple[Optional[float], str, str]:
+        """
+        按最新报价快照获取价格，不刷新汇率（不阻塞，可在 WebSocket 线程中调用）
 
-                return (bid_cny, display_text, self.latest_data['time'])
-            except Exception as e:
-                print(f"价格转换失败: {e}")
-                return (None, "伦敦金: 转换错误", "")
+        Args:
+            symbol: 品种代码，默认伦敦金
 
-    def get_detailed_info(self, base_price: float, last_alert_price: Optional[float],
+        Returns:
+            Tuple[Optional[float], str, str]: (价格浮点数, 显示文本, 更新时间)
+            如果离线，价格为 None
+        """
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            name = self._symbol_name(symbol)
+            if not self.is_connected:
+                return (None, f"{name}: 离线", "")
+            return (None, f"{name}: 等待数据...", "")
+        return (quote.bid_cny, f"{quote.bid_cny:.2f} {self._symbol_unit(symbol)}", quote.time)
+
+    def get_detailed_info(self, symbol: str, base_price: float, last_alert_price: Optional[float],
                           update_time: str, change_vs_base: float,
-                          change_percent_vs_base: float, change_symbol: str) -> tuple:
+                          change_percent_vs_base: float, change_symbol: str, display=None) -> tuple:
         """
         获取详细信息文本（用于多行显示）
 
         Args:
+            symbol: 品种代码
             base_price: 基准价格
             last_alert_price: 上次提醒价格
             update_time: 更新时间
             change_vs_base: 相对基准价格的变化
             change_percent_vs_base: 相对基准价格的变化百分比
             change_symbol: 变化符号 (↑/↓/→)
+            display: PriceDisplay 实例，提供时买入价和汇率按显示币种/单位输出（基准价格等由调用方按同一
+                显示币种/单位传入）；默认按人民币输出
 
         Returns:
             tuple: (买入价行, 基准行, 更新和API行, 上次提醒和汇率行)
         """
-        with self.lock:
-            if self.latest_data is None or 'bid_cny' not in self.latest_data:
-                return ("伦敦金: 无数据", "", "", "")
+        name = self._symbol_name(symbol)
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            return (f"{name}: 无数据", "", "", "")
 
-            # 第一行：买入价（仅人民币/克，不显示盎司）
-            line1 = f"{self.latest_data['bid_cny']:.2f} 元/克"
+        # 第一行：买入价（不显示盎司）
+        line1 = f"{quote.bid_cny:.2f} {self._symbol_unit(symbol)}"
+        rate_text = f"汇率: {quote.exchange_rate:.4f}"
+        if display is not None:
+            line1 = display.apply((quote.bid_cny, line1, quote.time, name))[1]
+            rate_text = display.rate_text(quote.exchange_rate)
 
-            # 第二行：基准价格和变化
-            line2 = f"基准: {base_price:.2f}  {change_symbol} {change_vs_base:+.2f} ({change_percent_vs_base:+.2f}%)"
+        # 第二行：基准价格和变化
+        line2 = f"基准: {base_price:.2f}  {change_symbol} {change_vs_base:+.2f} ({change_percent_vs_base:+.2f}%)"
 
-            # 第三行：更新时间和API名称
-            line3 = f"更新: {update_time} | API: 伦敦金"
+        # 第三行：更新时间和API名称
+        line3 = f"更新: {update_time} | API: {name}"
 
-            # 第四行：上次提醒和汇率
-            alert_info = f"上次提醒: {last_alert_price:.2f}" if last_alert_price else "上次提醒: 无"
-            line4 = f"{alert_info} | 汇率: {self.latest_data['exchange_rate']:.4f}"
+        # 第四行：上次提醒和汇率
+        alert_info = f"上次提醒: {last_alert_price:.2f}" if last_alert_price else "上次提醒: 无"
+        line4 = f"{alert_info} | {rate_text}"
 
-            return (line1, line2, line3, line4)
+        return (line1, line2, line3, line4)
 
     def stop(self):
         """停止 WebSocket 连接"""
-        self.should_stop = True
-        if self.ws:
-            self.ws.close()
+        with self.lock:
+            self.should_stop = True
+        self._wake_event.set()
+        self._stop_event.set()
+        for lane in self.lanes:
+            if lane.ws:
+                lane.ws.close()
+            lane.connected = False
         self.is_connected = False
 
@@ -0,0 +1,170 @@
+"""
+异步 I/O 模块 - 在单个 asyncio 事件循环上调度后台 I/O
+
+事件循环运行在一个进程内共享的后台线程上，调用方在任意线程通过 submit() 提交协程：
+- WebSocket 候选地址择优的 TCP/TLS 握手直接在事件循环上进行（非阻塞 socket），候选地址再多也不增加线程；
+- 汇率刷新的编排（读缓存、竞速、写回）作为协程运行，不再为每次刷新启动线程。
+requests 是阻塞库且项目不引入异步 HTTP 依赖，HTTP 请求仍在调用方的线程池中执行，由协程等待其结果。
+"""
+
+import asyncio
+import socket
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Coroutine, Optional
+
+from .config import Config
+
+
+class AsyncEngine:
+    """运行在独立线程上的 asyncio 事件循环（停止后再次提交时自动重新启动）"""
+
+    def __init__(self):
+        self.config = Config()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """启动事件循环线程（已在运行时跳过）"""
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self):
+        """启动事件循环线程（调用方持有 _lock）"""
+        if self.loop is not None:
+            return
+        # 使用 selector 事件循环：Windows 默认的 proactor 循环不支持 add_reader，无法完成非阻塞 TLS 握手
+        self.loop = asyncio.SelectorEventLoop()
+        # 无法异步完成的系统调用（DNS 解析）使用的线程池
+        executor = ThreadPoolExecutor(
+            max_workers=self.config.ASYNC_IO_MAX_WORKERS,
+            thread_name_prefix='gold-async-io'
+        )
+        self.loop.set_default_executor(executor)
+        self.thread = threading.Thread(
+            target=self._run, args=(self.loop, executor), name='gold-async-loop', daemon=True
+        )
+        self.thread.start()
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor):
+        """事件循环线程入口：停止后取消未完成的协程，关闭事件循环及其线程池"""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+            executor.shutdown(wait=False)
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        从任意线程提交协程到事件循环（事件循环未运行时先启动）
+
+        Args:
+            coro: 要执行的协程
+
+        Returns:
+            Future: 可在其他线程等待的 concurrent.futures.Future，事件循环停止时被取消
+        """
+        with self._lock:
+            self._start_locked()
+            # 持锁提交：stop 的停止请求一定排在已提交的协程之后，协程要么运行要么被取消，不会悬空
+            return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self, timeout: float = 2):
+        """
+        停止事件循环（未完成的协程被取消）
+
+        Args:
+            timeout: 等待事件循环线程退出的最长时间（秒）
+        """
+        with self._lock:
+            loop, thread = self.loop, self.thread
+            self.loop = None
+            if loop is None:
+                return
+            loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+async def open_stream_socket(host: str, port: int, secure: bool, timeout: float) -> socket.socket:
+    """
+    在事件循环上建立 TCP 连接（secure 时同时完成 TLS 握手），不占用线程
+
+    Args:
+        host: 主机名
+        port: 端口
+        secure: 是否进行 TLS 握手（校验证书与主机名）
+        timeout: 返回的连接上阻塞读写的超时（秒）；握手本身的超时由调用方用 asyncio.wait_for 控制
+
+    Returns:
+        socket.socket: 已建立的阻塞模式连接，失败时抛出异常
+    """
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    error = None
+    for family, type_, proto, _, address in infos:
+        sock = socket.socket(family, type_, proto)
+        try:
+            sock.setblocking(False)
+            await loop.sock_connect(sock, address)
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(
+                    sock, server_hostname=host, do_handshake_on_connect=False
+                )
+                await _do_handshake(loop, sock)
+            sock.settimeout(timeout)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+        except BaseException:
+            # 超时或取消
+            sock.close()
+            raise
+    raise error or OSError(f"无法解析地址: {host}")
+
+
+async def _do_handshake(loop: asyncio.AbstractEventLoop, sock: ssl.SSLSocket):
+    """在非阻塞 socket 上完成 TLS 握手，等待可读/可写时让出事件循环"""
+    while True:
+        try:
+            sock.do_handshake()
+            return
+        except ssl.SSLWantReadError:
+            await _wait_ready(loop, sock, writable=False)
+        except ssl.SSLWantWriteError:
+            await _wait_ready(loop, sock, writable=True)
+
+
+async def _wait_ready(loop: asyncio.AbstractEventLoop, sock: socket.socket, writable: bool):
+    """等待 socket 可读或可写"""
+    future = loop.create_future()
+    fd = sock.fileno()
+    if writable:
+        loop.add_writer(fd, lambda: future.done() or future.set_result(None))
+    else:
+        loop.add_reader(fd, lambda: future.done() or future.set_result(None))
+    try:
+        await future
+    finally:
+        if writable:
+            loop.remove_writer(fd)
+        else:
+            loop.remove_reader(fd)
+
+
+# 进程内共享的事件循环
+_engine = AsyncEngine()
+
+
+def get_async_engine() -> AsyncEngine:
+    """获取进程内共享的异步 I/O 事件循环"""
+    return _engine
@@ -0,0 +1,24 @@
+"""
+退避模块 - 指数退避与随机抖动计算
+"""
+
+import random
+
+
+def exponential_backoff(attempt: int, base: float, cap: float, jitter: bool = True) -> float:
+    """
+    计算第 attempt 次重试前的等待时间
+
+    Args:
+        attempt: 连续失败次数（从 1 开始）
+        base: 首次等待时间（秒）
+        cap: 最大等待时间（秒）
+        jitter: 是否加入随机抖动（full jitter 的一半，避免大量客户端同时重试）
+
+    Returns:
+        float: 等待时间（秒）
+    """
+    delay = min(cap, base * (2 ** max(attempt - 1, 0)))
+    if jitter:
+        delay = delay / 2 + random.uniform(0, delay / 2)
+    return delay
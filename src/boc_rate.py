@@ -0,0 +1,103 @@
+"""
+中国银行牌价解析模块 - 流式查找指定货币所在的行，解析到后立即停止
+"""
+
+from html.parser import HTMLParser
+from typing import Iterable, Optional
+
+# 中国银行外汇牌价页面的列：货币名称、现汇买入价、现钞买入价、现汇卖出价、现钞卖出价、中行折算价、发布日期、发布时间
+BOC_SPOT_SELL_COLUMN = 3  # 现汇卖出价
+BOC_QUOTE_UNIT = 100  # 牌价为每 100 外币兑人民币
+
+
+class BocRateParser(HTMLParser):
+    """
+    按行收集 <td> 文本，找到首列包含目标货币且指定列为有效数字的行后记录汇率
+
+    只保存当前行的单元格，不构建文档树；找到后 rate 不为 None，调用方可停止继续输入。
+    """
+
+    def __init__(self, currency: str = '美元', column: int = BOC_SPOT_SELL_COLUMN):
+        """
+        Args:
+            currency: 货币名称（匹配首列文本）
+            column: 取值的列序号（从 0 开始）
+        """
+        super().__init__(convert_charrefs=True)
+        self.currency = currency
+        self.column = column
+        self.rate = None  # 每 1 外币兑人民币
+        self._cells = None  # 当前行已结束的单元格文本，不在行内时为 None
+        self._cell = None  # 当前单元格的文本片段，不在单元格内时为 None
+
+    def handle_starttag(self, tag, attrs):
+        """开始标签：进入新行或新单元格（未闭合的单元格视为结束）"""
+        if self.rate is not None:
+            return
+        if tag == 'tr':
+            self._cells = []
+            self._cell = None
+        elif tag == 'td' and self._cells is not None:
+            self._end_cell()
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        """结束标签：结束单元格或行，行结束时检查是否为目标货币"""
+        if self.rate is not None:
+            return
+        if tag == 'td':
+            self._end_cell()
+        elif tag == 'tr' and self._cells is not None:
+            self._end_cell()
+            self._check_row(self._cells)
+            self._cells = None
+
+    def handle_data(self, data):
+        """文本：只收集单元格内的文本"""
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _end_cell(self):
+        """结束当前单元格（去掉所有空白）"""
+        if self._cell is not None and self._cells is not None:
+            self._cells.append(''.join(''.join(self._cell).split()))
+        self._cell = None
+
+    def _check_row(self, cells: list):
+        """
+        检查一行是否为目标货币，是则记录汇率
+
+        Args:
+            cells: 该行所有单元格的文本
+        """
+        if len(cells) <= self.column or self.currency not in cells[0]:
+            return
+        try:
+            rate = float(cells[self.column]) / BOC_QUOTE_UNIT
+        except ValueError:
+            return
+        if rate > 0:
+            self.rate = rate
+
+
+def extract_boc_rate(chunks: Iterable[str], currency: str = '美元',
+                     column: int = BOC_SPOT_SELL_COLUMN) -> Optional[float]:
+    """
+    从中国银行牌价页面中提取货币汇率，逐块解析，找到目标行后不再读取后续内容
+
+    Args:
+        chunks: 页面文本块（如 response.iter_content(decode_unicode=True)）
+        currency: 货币名称
+        column: 取值的列序号（默认现汇卖出价）
+
+    Returns:
+        Optional[float]: 每 1 外币兑人民币的汇率，未找到时返回 None
+    """
+    parser = BocRateParser(currency, column)
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parser.feed(chunk)
+        if parser.rate is not None:
+            break
+    return parser.rate
@@ -0,0 +1,100 @@
+"""
+熔断模块 - 数据源故障时快速失败，按指数退避探测恢复
+"""
+
+import threading
+import time
+from typing import Optional
+
+from .config import Config
+from .backoff import exponential_backoff
+
+# 熔断器状态
+STATE_CLOSED = 'closed'  # 正常：请求放行
+STATE_OPEN = 'open'  # 熔断：请求直接失败，不占用任何等待时间
+STATE_HALF_OPEN = 'half_open'  # 半开：放行一个探测请求
+
+
+class CircuitBreaker:
+    """单个数据源的熔断器"""
+
+    # 状态对应的健康提示（用于界面显示）
+    HEALTH_TEXT = {
+        STATE_CLOSED: "正常",
+        STATE_OPEN: "熔断",
+        STATE_HALF_OPEN: "探测中",
+    }
+
+    def __init__(self):
+        self.config = Config()
+        self.state = STATE_CLOSED
+        self.failures = 0  # 连续失败次数
+        self.open_count = 0  # 连续熔断次数（决定退避时长）
+        self.retry_at = 0.0  # 熔断结束、允许探测的时间（time.monotonic）
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self, now: Optional[float] = None) -> bool:
+        """
+        判断是否放行请求
+
+        Args:
+            now: 当前时间（time.monotonic），默认取当前时间
+
+        Returns:
+            bool: 是否允许发起请求
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN and now >= self.retry_at:
+                self.state = STATE_HALF_OPEN
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """记录请求成功，恢复为关闭状态"""
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self.open_count = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, now: Optional[float] = None):
+        """
+        记录请求失败，达到阈值或探测失败时熔断
+
+        Args:
+            now: 当前时间（time.monotonic），默认取当前时间
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN or self.failures >= self.config.BREAKER_FAILURE_THRESHOLD:
+                self.open_count += 1
+                self.state = STATE_OPEN
+                self.retry_at = now + exponential_backoff(
+                    self.open_count,
+                    self.config.BREAKER_BASE_DELAY,
+                    self.config.BREAKER_MAX_DELAY
+                )
+
+    def get_health(self) -> dict:
+        """
+        获取健康状态
+
+        Returns:
+            dict: {'state': 状态, 'text': 显示文本, 'failures': 连续失败次数, 'retry_in': 距离下次探测的秒数}
+        """
+        with self._lock:
+            retry_in = max(self.retry_at - time.monotonic(), 0.0) if self.state == STATE_OPEN else 0.0
+            return {
+                'state': self.state,
+                'text': self.HEALTH_TEXT[self.state],
+                'failures': self.failures,
+                'retry_in': retry_in
+            }
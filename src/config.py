@@ -8,17 +8,89 @@ import os
 class Config:
     """应用程序配置类"""
 
-    # API 配置
-    # 可切换的API列表
-    API_URLS = [
-        "https://api.jdjygold.com/gw2/generic/jrm/h5/m/stdLatestPrice?productSku=1961543816",  # 浙商的API
-        "https://api.jdjygold.com/gw/generic/hj/h5/m/latestPrice"  # 民生的API
+    # 数据源配置（按显示顺序，滚轮切换时循环）
+    # 字段：
+    #   id: 唯一标识；name: 显示名称；transport: 'http'（轮询）或 'websocket'（推送）
+    #   url: HTTP 地址；parser: HTTP 响应或 WebSocket 推送帧的解析器；symbol: WebSocket 行情代码
+    #   interval: 基准轮询间隔（秒）；unit: 价格单位
+    #   connect_timeout / read_timeout: HTTP 连接/读取超时（秒），缺省使用 API_CONNECT_TIMEOUT / API_READ_TIMEOUT
+    #   sessions: 交易时段，days 为开盘所在星期（0=周一），end 不晚于 start 表示次日收盘；为空表示不限
+    #   holidays: 节假日（'YYYY-MM-DD'，当天开盘的时段整段休市）
+    SOURCES = [
+        {
+            'id': 'czbank',
+            'name': '浙商银行',
+            'transport': 'http',
+            'url': 'https://api.jdjygold.com/gw2/generic/jrm/h5/m/stdLatestPrice?productSku=1961543816',
+            'parser': 'json_price',
+            'interval': 5,
+            'unit': '元/克',
+            'sessions': [{'days': [0, 1, 2, 3, 4], 'start': '09:00', 'end': '02:30'}],
+            'holidays': [],
+        },
+        {
+            'id': 'cmbc',
+            'name': '民生银行',
+            'transport': 'http',
+            'url': 'https://api.jdjygold.com/gw/generic/hj/h5/m/latestPrice',
+            'parser': 'json_price',
+            'interval': 5,
+            'unit': '元/克',
+            'sessions': [{'days': [0, 1, 2, 3, 4], 'start': '09:00', 'end': '02:30'}],
+            'holidays': [],
+        },
+        {
+            'id': 'london_gold',
+            'name': '伦敦金',
+            'transport': 'websocket',
+            'parser': 'quote_list',
+            'symbol': 'GOLD',
+            'unit': '元/克',
+            # 每日 05:00-06:00 休市
+            'sessions': [{'days': [0, 1, 2, 3, 4], 'start': '06:00', 'end': '05:00'}],
+            'holidays': [],
+        },
+        {
+            'id': 'london_silver',
+            'name': '伦敦银',
+            'transport': 'websocket',
+            'parser': 'quote_list',
+            'symbol': 'SILVER',
+            'unit': '元/克',
+            'sessions': [{'days': [0, 1, 2, 3, 4], 'start': '06:00', 'end': '05:00'}],
+            'holidays': [],
+        },
     ]
-    API_NAMES = ["浙商银行", "民生银行", "伦敦金"]  # API名称，用于显示
-    API_TIMEOUT = 5  # API 请求超时时间（秒）
-
-    # 当前使用的API索引
-    CURRENT_API_INDEX = 0  # 默认使用浙商的API（索引0）
+    DEFAULT_SOURCE_ID = 'czbank'  # 默认显示的数据源
+
+    API_CONNECT_TIMEOUT = 3  # API 连接超时时间（秒）
+    API_READ_TIMEOUT = 5  # API 读取超时时间（秒）
+    REFRESH_DEADLINE = 0.8  # 每轮刷新最长等待时间（秒），未到达的结果稍后补充到缓存
+
+    # HTTP 连接池配置（所有数据源共享 keep-alive 连接）
+    HTTP_POOL_CONNECTIONS = 4  # 缓存的主机连接池数量
+    HTTP_POOL_MAXSIZE = 8  # 每个主机的最大连接数
+    HTTP_IDLE_TIMEOUT = 60  # 会话空闲超时（秒），超时后重建连接
+    FETCH_MAX_WORKERS = 4  # 常驻抓取线程池的最大线程数
+    ASYNC_IO_MAX_WORKERS = 2  # 异步 I/O 事件循环上无法异步完成的调用（DNS 解析）使用的最大线程数
+
+    # 对冲请求配置（请求超过该数据源 p95 延迟仍未返回时补发一次，取先到的结果）
+    HEDGE_ENABLED = os.getenv('HEDGE_ENABLED', 'false').lower() == 'true'
+    HEDGE_BUDGET_RATIO = 0.1  # 每个请求积累的对冲预算（即对冲请求占比上限）
+    HEDGE_BUDGET_BURST = 2  # 对冲预算最多积累的次数
+    HEDGE_MIN_SAMPLES = 20  # 计算 p95 所需的最少延迟样本数
+    HEDGE_LATENCY_WINDOW = 100  # 保留的最近延迟样本数
+    HEDGE_MIN_DELAY = 0.05  # 最短对冲等待时间（秒）
+    HEDGE_MAX_WORKERS = 4  # 对冲请求线程池的最大线程数
+
+    # 熔断配置（数据源连续失败后快速失败，按指数退避探测恢复）
+    BREAKER_FAILURE_THRESHOLD = 3  # 连续失败多少次后熔断
+    BREAKER_BASE_DELAY = 10  # 首次熔断时长（秒）
+    BREAKER_MAX_DELAY = 300  # 最长熔断时长（秒）
+
+    # 价格字段查找配置（响应结构未知时的兜底遍历上限）
+    PRICE_SEARCH_MAX_DEPTH = 8  # 最大遍历深度
+    PRICE_SEARCH_MAX_NODES = 2000  # 最大访问节点数
 
     # 请求头配置
     HEADERS = {
@@ -28,7 +100,27 @@ class Config:
     }
 
     # 更新频率配置
-    UPDATE_INTERVAL = 5  # 价格更新间隔（秒）
+    UPDATE_INTERVAL = 5  # 价格更新间隔（秒），自适应轮询的基准间隔
+
+    # 自适应轮询配置（每个数据源独立间隔）
+    POLL_TICK_INTERVAL = 500  # 调度器检查到期数据源的间隔（毫秒）
+    POLL_MIN_INTERVAL = 1  # 行情剧烈波动时的最小间隔（秒）
+    POLL_MAX_INTERVAL = 60  # 价格持平时逐步放宽到的最大间隔（秒）
+    POLL_RELAX_FACTOR = 1.5  # 价格持平时每次放宽的倍数
+    POLL_FAST_MOVE_PERCENT = 0.05  # 近期波动率（单次变动百分比的加权平均）达到该值时收紧间隔
+    POLL_VOLATILITY_SMOOTHING = 0.5  # 波动率指数加权系数
+    POLL_ERROR_BACKOFF_MAX = 60  # 请求失败时退避的最大间隔（秒）
+    POLL_MAX_REQUESTS_PER_MINUTE = 120  # 所有数据源共享的每分钟请求数预算
+    PUSH_RENDER_FPS = 20  # WebSocket 推送行情每秒最多渲染次数（行情爆发时合并报价）
+
+    # 交易日历配置（休市期间暂停轮询和 WebSocket）
+    MARKET_CALENDAR_ENABLED = os.getenv('MARKET_CALENDAR_ENABLED', 'true').lower() == 'true'
+    MARKET_UTC_OFFSET = 8  # 交易时段使用的时区（北京时间）
+    MARKET_PREOPEN_LEAD = 120  # 开盘前提前恢复的时间（秒）
+    MARKET_CHECK_INTERVAL = 30  # 检查开收盘状态的间隔（秒）；各数据源的交易时段见 SOURCES
+
+    # 本地缓存目录（为空时 Windows 使用 %LOCALAPPDATA%\AnyGold，其他平台使用 ~/.anygold）
+    CACHE_DIR = os.getenv('ANYGOLD_CACHE_DIR', '')
 
     # 提醒配置
     ALERT_THRESHOLD = 1.0  # 价格变动提醒阈值（百分比）
@@ -36,8 +128,20 @@ class Config:
     # WebSocket 配置（伦敦金实时价格）
     WS_DOMAIN_API = "https://www.jrjr.com/api/getDomainInfo"  # 动态获取WebSocket地址
     WS_BACKUP_URL = "wss://alb-1ko0lowmvacsqia0ij.cn-shenzhen.alb.aliyuncs.com:26203"  # 备用WebSocket地址
-    WS_RECONNECT_INTERVAL = 5  # WebSocket重连间隔（秒）
-    MAX_WS_RECONNECT_ATTEMPTS = 5  # 最大重连次数
+    WS_LINKS_CACHE_TTL = 24 * 3600  # 动态 WebSocket 地址的磁盘缓存有效期（秒）
+    WS_RACE_CANDIDATES = 3  # 并行握手择优的候选地址数
+    WS_HANDSHAKE_TIMEOUT = 5  # 候选地址握手超时（秒）
+    WS_SYMBOLS = ['GOLD', 'SILVER', 'PLATINUM', 'USDX', 'USDCNH']  # 预分配行情表的品种（推送中的其他品种首次出现时追加）
+    JSON_DECODER = os.getenv('JSON_DECODER', 'auto')  # 推送消息的 JSON 解码库：auto/orjson/ujson/json（未安装时回退标准库）
+    WS_REDUNDANT_CONNECTIONS = os.getenv('WS_REDUNDANT_CONNECTIONS', 'false').lower() == 'true'  # 同时保持两条连接（不同地址），报价先到为准
+    WS_DEDUPE_WINDOW = 8  # 冗余模式下每个品种记住的最近报价数，落后连接重放其中的报价时丢弃
+    WS_RECONNECT_INTERVAL = 5  # WebSocket首次重连间隔（秒），连续失败时指数退避，永不放弃
+    WS_RECONNECT_MAX_INTERVAL = 60  # WebSocket重连间隔上限（秒）
+    # WebSocket 断线检测（断线后最迟 min(WS_PING_INTERVAL + WS_PING_TIMEOUT, WS_TICK_TIMEOUT + WS_WATCHDOG_INTERVAL) 秒发现）
+    WS_PING_INTERVAL = 10  # 心跳 ping 间隔（秒）
+    WS_PING_TIMEOUT = 5  # 等待 pong 的超时（秒），需小于 WS_PING_INTERVAL
+    WS_TICK_TIMEOUT = 30  # 超过该时间未收到推送消息则强制重连（秒），0 表示关闭看门狗
+    WS_WATCHDOG_INTERVAL = 1  # 看门狗检查间隔（秒）
 
     # 汇率配置
     EXCHANGE_RATE_APIS = [
@@ -45,12 +149,28 @@ class Config:
         "https://www.boc.cn/sourcedb/whpj/"  # 备用：中国银行官网汇率
     ]
     EXCHANGE_RATE_CACHE_TIME = 3600  # 汇率缓存时间（秒）
+    EXCHANGE_RATE_RETRY_INTERVAL = 60  # 汇率刷新失败后再次尝试的最短间隔（秒），期间继续使用旧汇率
+    EXCHANGE_RATE_RACE_TIMEOUT = 10  # 同时请求所有汇率来源，等待第一个有效结果的最长时间（秒）
+    EXCHANGE_RATE_MAX_WORKERS = 4  # 汇率请求线程池的最大线程数
+    EXCHANGE_RATE_MAX_DEVIATION = 0.1  # 新汇率相对上次汇率（尚无时为默认汇率）的最大偏离比例，超过视为异常数据
+    WS_USDCNH_SYMBOL = 'USDCNH'  # 伦敦金推送中的美元兑离岸人民币品种（报价新鲜时作为本地汇率来源）
+    WS_USDCNH_MAX_AGE = 60  # 美元兑离岸人民币报价超过该时间未更新则不作为汇率来源（秒）
     DEFAULT_EXCHANGE_RATE = 6.95  # 默认汇率（所有API都失败时使用）
 
     # 单位转换常量
     OUNCE_TO_GRAM = 31.1035  # 1盎司 = 31.1035克
     PRICE_DECIMAL_PLACES = 2  # 价格保留小数位数
 
+    # 显示币种和重量单位（数据源价格均为人民币/克，其他组合按汇率表换算后显示和提醒）
+    DISPLAY_CURRENCY = os.getenv('ANYGOLD_DISPLAY_CURRENCY', 'CNY').upper()  # 如 CNY、USD、HKD、EUR
+    DISPLAY_WEIGHT_UNIT = os.getenv('ANYGOLD_DISPLAY_UNIT', 'gram').lower()  # gram、ounce 或 tael
+    WEIGHT_UNITS = {  # {单位: (克数, 显示名称)}
+        'gram': (1.0, '克'),
+        'ounce': (OUNCE_TO_GRAM, '盎司'),
+        'tael': (37.429, '两'),  # 香港金衡两
+    }
+    CURRENCY_NAMES = {'CNY': '元', 'USD': '美元', 'HKD': '港元', 'EUR': '欧元'}  # 币种显示名称，未列出的显示代码
+
     # 窗口配置
     WINDOW_WIDTH = 230
     WINDOW_HEIGHT = 110
@@ -0,0 +1,80 @@
+"""
+磁盘缓存模块 - 在用户缓存目录中原子读写 JSON 数据
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+from .config import Config
+
+
+def get_cache_dir() -> str:
+    """
+    获取缓存目录（Config.CACHE_DIR 优先，Windows 默认 %LOCALAPPDATA%\\AnyGold，其他平台 ~/.anygold）
+
+    Returns:
+        str: 缓存目录路径（不保证已创建）
+    """
+    if Config.CACHE_DIR:
+        return Config.CACHE_DIR
+    local_app_data = os.getenv('LOCALAPPDATA')
+    if local_app_data:
+        return os.path.join(local_app_data, 'AnyGold')
+    return os.path.join(os.path.expanduser('~'), '.anygold')
+
+
+def _cache_path(name: str, cache_dir: Optional[str] = None) -> str:
+    """缓存文件路径"""
+    return os.path.join(cache_dir or get_cache_dir(), f"{name}.json")
+
+
+def load_json(name: str) -> Optional[Any]:
+    """
+    读取缓存
+
+    Args:
+        name: 缓存名称（不含扩展名）
+
+    Returns:
+        Optional[Any]: 缓存内容，不存在或已损坏时返回 None
+    """
+    try:
+        with open(_cache_path(name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_json(name: str, data: Any, cache_dir: Optional[str] = None) -> bool:
+    """
+    原子写入缓存：先写同目录下的临时文件，再用 os.replace 替换，读方不会看到写了一半的文件
+
+    Args:
+        name: 缓存名称（不含扩展名）
+        data: 可 JSON 序列化的数据
+        cache_dir: 缓存目录，默认 get_cache_dir()（后台线程稍后写入时传入开始时的目录）
+
+    Returns:
+        bool: 是否写入成功
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=cache_dir, prefix=f".{name}.", suffix='.tmp', delete=False
+        ) as f:
+            tmp_path = f.name
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, _cache_path(name, cache_dir))
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"写入缓存 {name} 失败: {e}")
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return False
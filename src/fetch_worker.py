@@ -0,0 +1,89 @@
+"""
+抓取工作者模块 - 在后台 Qt 线程中轮询数据源，通过队列信号把结果交给界面线程
+"""
+
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from .config import Config
+from .api import GoldPriceAPI, LondonGoldWebSocket
+from .scheduler import PollScheduler
+
+
+class PriceFetchWorker(QObject):
+    """
+    后台价格抓取工作者
+
+    需要 moveToThread 到独立的 QThread 后由 thread.started 触发 start()。
+    所有网络请求都在该线程（及 GoldPriceAPI 的抓取线程池）中完成，界面线程
+    只接收 prices_ready / late_price_ready 信号，不会被上游延迟阻塞。
+    WebSocket 报价由推送通道直接送达界面，这里只补充尚无报价时的连接状态。
+    """
+
+    # 一轮抓取结果 {source_id: (价格浮点数, 显示文本, 更新时间, API名称)}
+    prices_ready = Signal(object)
+    # 超过本轮截止时间才到达的单个结果 (source_id, 结果)
+    late_price_ready = Signal(str, object)
+
+    def __init__(self, api: GoldPriceAPI, london_gold_ws: LondonGoldWebSocket,
+                 scheduler: PollScheduler):
+        super().__init__()
+        self.config = Config()
+        self.api = api
+        self.london_gold_ws = london_gold_ws
+        self.scheduler = scheduler
+        self.timer: Optional[QTimer] = None
+        self.registry = api.registry
+        self._last_status = {}  # {source_id: 上次发送的 WebSocket 连接状态}，未变化时不重复发送
+
+    @Slot()
+    def start(self):
+        """开始轮询（在工作线程中调用，定时器归属工作线程）"""
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(self.config.POLL_TICK_INTERVAL)
+        self.poll()
+
+    @Slot()
+    def stop(self):
+        """停止轮询"""
+        if self.timer is not None:
+            self.timer.stop()
+
+    @Slot()
+    def poll(self):
+        """抓取已到期的数据源并发送结果"""
+        due_ids = self.scheduler.due_sources()
+        all_prices = self.api.fetch_all_prices(
+            due_ids,
+            priority_id=self.api.current_source_id,
+            on_late_result=self._on_late_result
+        )
+
+        # 根据结果调整各数据源的轮询间隔
+        for source_id, (price_data, _, _, _) in all_prices.items():
+            self.scheduler.record_result(source_id, price_data)
+
+        # 检查 WebSocket 报价的换算汇率是否过期（过期时在后台刷新，不阻塞轮询）
+        if self.london_gold_ws.is_connected:
+            self.london_gold_ws.refresh_exchange_rate()
+
+        # WebSocket 数据源尚无报价时发送连接状态（离线/等待数据），只在变化时发送
+        for source_id in self.registry.websocket_ids():
+            source = self.registry.get(source_id)
+            if self.london_gold_ws.get_quote(source.symbol) is not None:
+                continue
+            price_data, display_text, update_time = self.london_gold_ws.get_cached_price(source.symbol)
+            status = (price_data, display_text, update_time, source.name)
+            if status != self._last_status.get(source_id):
+                all_prices[source_id] = status
+                self._last_status[source_id] = status
+
+        if all_prices:
+            self.prices_ready.emit(all_prices)
+
+    def _on_late_result(self, source_id: str, result: tuple):
+        """迟到结果回调（在抓取线程池中调用）"""
+        self.scheduler.record_result(source_id, result[0])
+        self.late_price_ready.emit(source_id, result)
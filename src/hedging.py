@@ -0,0 +1,162 @@
+"""
+对冲请求模块 - 请求超过历史 p95 延迟仍未返回时补发一次，取先到的结果
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, Optional
+
+from .config import Config
+
+
+class HedgeController:
+    """按数据源统计延迟、控制对冲预算并执行对冲请求"""
+
+    def __init__(self):
+        self.config = Config()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.HEDGE_MAX_WORKERS,
+            thread_name_prefix='gold-hedge'
+        )
+        self._latencies: Dict[str, deque] = {}  # {source_id: 最近的请求耗时}
+        self._tokens: Dict[str, float] = {}  # {source_id: 剩余对冲预算}
+        self._metrics: Dict[str, dict] = {}  # {source_id: {'requests', 'hedges', 'hedge_wins'}}
+        self._lock = threading.Lock()
+
+    def execute(self, source_id: str, request: Callable[[], object],
+                on_discard: Optional[Callable[[object], None]] = None):
+        """
+        执行请求，必要时发出一次对冲请求
+
+        无法中断已经发出的 HTTP 请求，落败请求只会被取消（尚未开始时）或在完成后丢弃。
+
+        Args:
+            source_id: 数据源ID
+            request: 发起一次请求的无参函数，异常会向上抛出
+            on_discard: 落败请求完成后的清理回调（如关闭响应）
+
+        Returns:
+            先成功返回的请求结果
+        """
+        delay = self._hedge_delay(source_id)
+        if delay is None:
+            return self._timed(source_id, request)
+
+        primary = self.executor.submit(self._timed, source_id, request)
+        try:
+            return primary.result(timeout=delay)
+        except FuturesTimeoutError:
+            pass
+
+        if not self._take_token(source_id):
+            return primary.result()
+
+        hedge = self.executor.submit(self._timed, source_id, request)
+        futures = {primary: False, hedge: True}
+        error = None
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                error = e
+                continue
+
+            loser = hedge if future is primary else primary
+            if not loser.cancel() and on_discard is not None:
+                loser.add_done_callback(lambda f: self._discard(f, on_discard))
+            if futures[future]:
+                with self._lock:
+                    self._metrics[source_id]['hedge_wins'] += 1
+            return result
+        raise error
+
+    def _timed(self, source_id: str, request: Callable[[], object]):
+        """执行请求并记录耗时（超时和异常同样计入，它们正是慢尾部，不计入会低估 p95）"""
+        start = time.monotonic()
+        try:
+            return request()
+        finally:
+            self._record_latency(source_id, time.monotonic() - start)
+
+    @staticmethod
+    def _discard(future: Future, on_discard: Callable[[object], None]):
+        """清理落败请求的结果"""
+        if not future.cancelled() and future.exception() is None:
+            on_discard(future.result())
+
+    def _record_latency(self, source_id: str, latency: float):
+        """记录请求耗时"""
+        with self._lock:
+            samples = self._latencies.get(source_id)
+            if samples is None:
+                samples = self._latencies[source_id] = deque(maxlen=self.config.HEDGE_LATENCY_WINDOW)
+            samples.append(latency)
+
+    def _hedge_delay(self, source_id: str) -> Optional[float]:
+        """
+        计算对冲等待时间并计入请求数，样本不足或未启用时返回 None
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            Optional[float]: 等待多久后发出对冲请求（秒）
+        """
+        if not self.config.HEDGE_ENABLED:
+            return None
+        with self._lock:
+            metrics = self._metrics.setdefault(source_id, {'requests': 0, 'hedges': 0, 'hedge_wins': 0})
+            metrics['requests'] += 1
+            # 每个请求积累一部分对冲预算，预算上限避免长时间空闲后集中对冲
+            self._tokens[source_id] = min(
+                self._tokens.get(source_id, 0.0) + self.config.HEDGE_BUDGET_RATIO,
+                self.config.HEDGE_BUDGET_BURST
+            )
+            p95 = self._percentile(source_id, 0.95)
+        if p95 is None:
+            return None
+        return max(p95, self.config.HEDGE_MIN_DELAY)
+
+    def _percentile(self, source_id: str, q: float) -> Optional[float]:
+        """计算耗时分位数（调用方持有锁），样本不足时返回 None"""
+        samples = self._latencies.get(source_id)
+        if not samples or len(samples) < self.config.HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(q * (len(ordered) - 1))]
+
+    def _take_token(self, source_id: str) -> bool:
+        """消耗一次对冲预算"""
+        with self._lock:
+            if self._tokens.get(source_id, 0.0) < 1:
+                return False
+            self._tokens[source_id] -= 1
+            self._metrics[source_id]['hedges'] += 1
+            return True
+
+    def get_metrics(self) -> Dict[str, dict]:
+        """
+        获取对冲指标
+
+        Returns:
+            Dict[str, dict]: {source_id: {'requests', 'hedges', 'hedge_wins', 'hedge_rate', 'win_rate', 'p95'}}
+        """
+        with self._lock:
+            result = {}
+            for source_id, metrics in self._metrics.items():
+                requests_count = metrics['requests']
+                hedges = metrics['hedges']
+                result[source_id] = {
+                    **metrics,
+                    'hedge_rate': hedges / requests_count if requests_count else 0.0,
+                    'win_rate': metrics['hedge_wins'] / hedges if hedges else 0.0,
+                    'p95': self._percentile(source_id, 0.95)
+                }
+            return result
+
+    def shutdown(self):
+        """关闭对冲线程池"""
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,81 @@
+"""
+HTTP 模块 - 提供全局共享的连接池会话（keep-alive）
+"""
+
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import Config
+
+
+class HttpSessionPool:
+    """共享的 HTTP 会话池，所有数据源复用同一组 keep-alive 连接"""
+
+    def __init__(self):
+        self.config = Config()
+        self._session: Optional[requests.Session] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def get_session(self) -> requests.Session:
+        """
+        获取共享会话，空闲超时后重建（避免复用已被服务端或 VPN 断开的连接）
+
+        Returns:
+            requests.Session: 带连接池的会话
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._session is not None and now - self._last_used > self.config.HTTP_IDLE_TIMEOUT:
+                self._session.close()
+                self._session = None
+
+            if self._session is None:
+                self._session = self._create_session()
+
+            self._last_used = now
+            return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        通过共享会话发送 GET 请求
+
+        Args:
+            url: 请求地址
+            **kwargs: 透传给 requests.Session.get 的参数
+
+        Returns:
+            requests.Response: 响应对象
+        """
+        return self.get_session().get(url, **kwargs)
+
+    def close(self):
+        """关闭会话并释放所有连接"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _create_session(self) -> requests.Session:
+        """创建带连接池配置的会话"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.config.HTTP_POOL_MAXSIZE
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+
+# 进程内共享的会话池
+_http_pool = HttpSessionPool()
+
+
+def get_http_pool() -> HttpSessionPool:
+    """获取进程内共享的 HTTP 会话池"""
+    return _http_pool
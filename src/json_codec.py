@@ -0,0 +1,57 @@
+"""
+JSON 解码模块 - 已安装加速解码库时优先使用，否则回退到标准库
+"""
+
+import importlib
+import json
+from typing import Any, Callable, Optional, Tuple
+
+from .config import Config
+
+# 按优先级尝试的解码库（orjson/ujson 均为可选依赖，未安装时使用标准库 json）
+DECODER_PREFERENCE = ('orjson', 'ujson', 'json')
+
+
+def _load_decoder(name: str) -> Optional[Callable[[Any], Any]]:
+    """
+    加载指定解码库的 loads 函数
+
+    Args:
+        name: 解码库名称
+
+    Returns:
+        Optional[Callable]: loads 函数，未安装时返回 None
+    """
+    if name == 'json':
+        return json.loads
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+    return getattr(module, 'loads', None)
+
+
+def select_decoder(preferred: Optional[str] = None) -> Tuple[str, Callable[[Any], Any]]:
+    """
+    选择 JSON 解码函数
+
+    Args:
+        preferred: 指定的解码库（'orjson'/'ujson'/'json'），'auto' 或 None 时按 DECODER_PREFERENCE 选择；
+                   指定的库未安装时同样按优先级回退
+
+    Returns:
+        Tuple[str, Callable]: (解码库名称, loads 函数)，解析失败时 loads 抛出 ValueError
+    """
+    candidates = DECODER_PREFERENCE
+    if preferred and preferred != 'auto':
+        candidates = (preferred, *DECODER_PREFERENCE)
+
+    for name in candidates:
+        loads = _load_decoder(name)
+        if loads is not None:
+            return name, loads
+    return 'json', json.loads
+
+
+# 进程内共享的解码函数（导入时确定一次）
+DECODER_NAME, loads = select_decoder(Config.JSON_DECODER)
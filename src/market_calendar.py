@@ -0,0 +1,137 @@
+"""
+交易日历模块 - 判断数据源是否处于交易时段
+"""
+
+from datetime import datetime, date, time as dt_time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .config import Config
+from .sources import get_source_registry
+
+
+class MarketCalendar:
+    """单个数据源的交易日历（交易时段 + 节假日）"""
+
+    # 查找下次开盘时最多向后搜索的天数（覆盖长假）
+    SEARCH_DAYS = 21
+
+    def __init__(self, sessions: List[dict], holidays: Iterable[str] = (),
+                 utc_offset_hours: float = 8, preopen_lead: int = 0):
+        """
+        初始化交易日历
+
+        Args:
+            sessions: 交易时段列表，如 {'days': [0, 1, 2, 3, 4], 'start': '09:00', 'end': '02:30'}，
+                      days 为开盘所在的星期（0=周一），end 不晚于 start 表示跨越到次日收盘
+            holidays: 休市日期列表（'YYYY-MM-DD'），在这些日期开盘的时段整段休市
+            utc_offset_hours: 交易时段所用时区相对 UTC 的偏移（小时）
+            preopen_lead: 开盘前提前恢复的秒数
+        """
+        self.sessions = [
+            (frozenset(s['days']), self._parse_time(s['start']), self._parse_time(s['end']))
+            for s in sessions
+        ]
+        self.holidays = {date.fromisoformat(d) for d in holidays}
+        self.tz = timezone(timedelta(hours=utc_offset_hours))
+        self.preopen_lead = timedelta(seconds=preopen_lead)
+
+    @staticmethod
+    def _parse_time(text: str) -> dt_time:
+        """解析 'HH:MM' 格式的时间"""
+        hour, minute = text.split(':')
+        return dt_time(int(hour), int(minute))
+
+    def _now(self, now: Optional[datetime]) -> datetime:
+        """统一转换为交易日历所在时区的时间"""
+        if now is None:
+            return datetime.now(self.tz)
+        if now.tzinfo is None:
+            return now.replace(tzinfo=self.tz)
+        return now.astimezone(self.tz)
+
+    def _session_windows(self, day: date):
+        """生成在指定日期开盘的所有交易时段 (开盘时间, 收盘时间)"""
+        if day in self.holidays:
+            return
+        for days, start, end in self.sessions:
+            if day.weekday() not in days:
+                continue
+            open_at = datetime.combine(day, start, tzinfo=self.tz)
+            close_at = datetime.combine(day, end, tzinfo=self.tz)
+            if close_at <= open_at:
+                close_at += timedelta(days=1)
+            yield open_at, close_at
+
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        """
+        判断当前是否处于交易时段
+
+        Args:
+            now: 判断的时间，默认当前时间
+
+        Returns:
+            bool: 是否开市
+        """
+        now = self._now(now)
+        # 跨日时段可能在前一天开盘
+        for day in (now.date() - timedelta(days=1), now.date()):
+            for open_at, close_at in self._session_windows(day):
+                if open_at <= now < close_at:
+                    return True
+        return False
+
+    def next_open(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        获取下次开盘时间
+
+        Args:
+            now: 起算时间，默认当前时间
+
+        Returns:
+            Optional[datetime]: 下次开盘时间，搜索范围内没有交易时段时返回 None
+        """
+        now = self._now(now)
+        for offset in range(self.SEARCH_DAYS):
+            day = now.date() + timedelta(days=offset)
+            candidates = [open_at for open_at, _ in self._session_windows(day) if open_at > now]
+            if candidates:
+                return min(candidates)
+        return None
+
+    def is_active(self, now: Optional[datetime] = None) -> bool:
+        """
+        判断是否应保持轮询/连接：开市中，或距离开盘不足预热时间
+
+        Args:
+            now: 判断的时间，默认当前时间
+
+        Returns:
+            bool: 是否应处于活跃状态
+        """
+        now = self._now(now)
+        if self.is_open(now):
+            return True
+        next_open = self.next_open(now)
+        return next_open is not None and next_open - now <= self.preopen_lead
+
+
+def build_market_calendars() -> Dict[str, MarketCalendar]:
+    """
+    根据数据源注册表为每个数据源创建交易日历
+
+    Returns:
+        Dict[str, MarketCalendar]: {source_id: MarketCalendar}，未配置交易时段的数据源不受限制
+    """
+    config = Config()
+    registry = get_source_registry()
+    calendars = {}
+    for source_id in registry.ids():
+        source = registry.get(source_id)
+        if source.sessions:
+            calendars[source_id] = MarketCalendar(
+                source.sessions,
+                source.holidays,
+                config.MARKET_UTC_OFFSET,
+                config.MARKET_PREOPEN_LEAD
+            )
+    return calendars
@@ -0,0 +1,90 @@
+"""
+价格显示模块 - 把人民币/克价格换算为配置的显示币种和重量单位
+"""
+
+from typing import Optional
+
+from .config import Config
+
+
+class PriceDisplay:
+    """
+    显示币种/单位换算（数据源价格均为人民币/克）
+
+    汇率来自 ExchangeRateAPI 的汇率表，换算不发起网络请求；默认的人民币/克不做任何换算。
+    """
+
+    def __init__(self, rate_api, currency: Optional[str] = None, unit: Optional[str] = None):
+        """
+        Args:
+            rate_api: ExchangeRateAPI 实例
+            currency: 显示币种，默认 Config.DISPLAY_CURRENCY
+            unit: 重量单位（'gram'/'ounce'/'tael'），默认 Config.DISPLAY_WEIGHT_UNIT
+        """
+        self.config = Config()
+        self.rate_api = rate_api
+        self.currency = (currency or self.config.DISPLAY_CURRENCY).upper()
+        self.unit = (unit or self.config.DISPLAY_WEIGHT_UNIT).lower()
+        if self.unit not in self.config.WEIGHT_UNITS:
+            raise ValueError(f"未知的重量单位: {self.unit}")
+        self.grams, unit_name = self.config.WEIGHT_UNITS[self.unit]
+        self.label = f"{self.config.CURRENCY_NAMES.get(self.currency, self.currency)}/{unit_name}"
+        self.is_identity = self.currency == 'CNY' and self.unit == 'gram'
+
+    def convert(self, cny_per_gram: float) -> Optional[float]:
+        """
+        换算价格
+
+        Args:
+            cny_per_gram: 人民币/克价格
+
+        Returns:
+            Optional[float]: 显示币种/单位的价格，汇率尚未获取到时返回 None
+        """
+        if self.is_identity:
+            return cny_per_gram
+        cny_rate = self.rate_api.get_rate('CNY')
+        target_rate = self.rate_api.get_rate(self.currency)
+        if not cny_rate or target_rate is None:
+            return None
+        value = cny_per_gram / cny_rate * target_rate * self.grams
+        return round(value, self.config.PRICE_DECIMAL_PLACES)
+
+    def format(self, value: float) -> str:
+        """显示文本（如 "8123.45 港元/两"）"""
+        return f"{value:.2f} {self.label}"
+
+    def rate_text(self, usd_cny: float) -> str:
+        """
+        汇率显示文本：人民币显示时为美元兑人民币汇率，其他币种时为美元兑显示币种的汇率
+
+        Args:
+            usd_cny: 价格换算使用的美元兑人民币汇率
+
+        Returns:
+            str: 如 "汇率: 7.1000" 或 "汇率: 7.8000 (HKD)"
+        """
+        if self.currency == 'CNY':
+            return f"汇率: {usd_cny:.4f}"
+        rate = self.rate_api.get_rate(self.currency)
+        if rate is None:
+            return f"汇率: 等待{self.currency}汇率..."
+        return f"汇率: {rate:.4f} ({self.currency})"
+
+    def apply(self, result: tuple) -> tuple:
+        """
+        换算一条抓取结果
+
+        Args:
+            result: (价格浮点数, 显示文本, 更新时间, API名称)，价格为人民币/克
+
+        Returns:
+            tuple: 换算后的结果，价格为 None 时原样返回
+        """
+        price_data, display_text, update_time, api_name = result
+        if self.is_identity or price_data is None:
+            return result
+        value = self.convert(price_data)
+        if value is None:
+            return (None, f"{api_name}: 等待{self.currency}汇率...", update_time, api_name)
+        return (value, self.format(value), update_time, api_name)
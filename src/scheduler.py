@@ -0,0 +1,165 @@
+"""
+调度模块 - 按数据源自适应调整轮询间隔
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from .config import Config
+from .backoff import exponential_backoff
+
+
+class PollScheduler:
+    """
+    按数据源独立调度的轮询器
+
+    每个数据源有自己的轮询间隔：行情剧烈波动时收紧到最小间隔，价格持平时
+    逐步放宽，请求失败时指数退避；所有数据源共享每分钟请求数预算。
+    """
+
+    def __init__(self, source_ids: Iterable[str], base_intervals: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            source_ids: 参与调度的数据源ID
+            base_intervals: 各数据源的基准间隔（秒），缺省使用 Config.UPDATE_INTERVAL
+        """
+        self.config = Config()
+        base_intervals = base_intervals or {}
+        now = time.monotonic()
+        # {source_id: {'base', 'interval', 'next_due', 'last_price', 'volatility', 'errors', 'paused', 'fetched'}}
+        self._states = {
+            source_id: {
+                'base': float(base_intervals.get(source_id, self.config.UPDATE_INTERVAL)),
+                'interval': float(base_intervals.get(source_id, self.config.UPDATE_INTERVAL)),
+                'next_due': now,
+                'last_price': None,
+                'volatility': 0.0,
+                'errors': 0,
+                'paused': False,
+                'fetched': False
+            }
+            for source_id in source_ids
+        }
+        self._request_times = deque()  # 最近一分钟内发出请求的时间戳
+        # 抓取线程调度/记录结果，界面线程按交易日历暂停数据源
+        self._lock = threading.Lock()
+
+    def due_sources(self, now: Optional[float] = None) -> List[str]:
+        """
+        取出已到期且在请求预算内的数据源
+
+        取出的数据源会立即占用预算并推迟到下一个间隔，避免结果返回前被重复调度。
+
+        Args:
+            now: 当前时间（time.monotonic），默认取当前时间
+
+        Returns:
+            List[str]: 按到期先后排序的数据源ID
+        """
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            # 清理一分钟之前的请求记录
+            while self._request_times and now - self._request_times[0] >= 60:
+                self._request_times.popleft()
+            budget = self.config.POLL_MAX_REQUESTS_PER_MINUTE - len(self._request_times)
+
+            due = sorted(
+                (state['next_due'], source_id)
+                for source_id, state in self._states.items()
+                if state['next_due'] <= now and not (state['paused'] and state['fetched'])
+            )
+
+            result = []
+            for _, source_id in due[:max(budget, 0)]:
+                state = self._states[source_id]
+                state['next_due'] = now + state['interval']
+                self._request_times.append(now)
+                result.append(source_id)
+            return result
+
+    def record_result(self, source_id: str, price: Optional[float], now: Optional[float] = None):
+        """
+        根据抓取结果调整该数据源的轮询间隔
+
+        Args:
+            source_id: 数据源ID
+            price: 获取到的价格，失败时为 None
+            now: 当前时间（time.monotonic），默认取当前时间
+        """
+        state = self._states.get(source_id)
+        if state is None:
+            return
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            if price is None:
+                state['errors'] += 1
+                state['interval'] = exponential_backoff(
+                    state['errors'], state['base'], self.config.POLL_ERROR_BACKOFF_MAX
+                )
+            else:
+                state['errors'] = 0
+                state['interval'] = self._adapt_interval(state, price)
+                state['last_price'] = price
+
+            state['fetched'] = True
+            state['next_due'] = now + state['interval']
+
+    def _adapt_interval(self, state: dict, price: float) -> float:
+        """根据价格波动计算新的轮询间隔"""
+        last_price = state['last_price']
+        if not last_price:
+            return state['base']
+
+        change_percent = abs(price - last_price) / last_price * 100
+        # 指数加权的近期波动率
+        alpha = self.config.POLL_VOLATILITY_SMOOTHING
+        state['volatility'] = alpha * change_percent + (1 - alpha) * state['volatility']
+
+        if state['volatility'] >= self.config.POLL_FAST_MOVE_PERCENT:
+            return float(self.config.POLL_MIN_INTERVAL)
+        if change_percent == 0:
+            # 价格持平，逐步放宽
+            return min(state['interval'] * self.config.POLL_RELAX_FACTOR, self.config.POLL_MAX_INTERVAL)
+        return state['base']
+
+    def set_paused(self, source_id: str, paused: bool):
+        """
+        暂停或恢复数据源的轮询（如休市期间），恢复后立即到期
+
+        尚未获取过数据的数据源暂停后仍会获取一次，保证休市时也有价格可以展示。
+
+        Args:
+            source_id: 数据源ID
+            paused: 是否暂停
+        """
+        state = self._states.get(source_id)
+        if state is None:
+            return
+        with self._lock:
+            if state['paused'] == paused:
+                return
+            state['paused'] = paused
+            if not paused:
+                state['next_due'] = time.monotonic()
+
+    def get_interval(self, source_id: str) -> Optional[float]:
+        """获取数据源当前的轮询间隔（秒）"""
+        state = self._states.get(source_id)
+        return state['interval'] if state else None
+
+    def get_next_due_times(self) -> Dict[str, float]:
+        """
+        获取每个数据源的下次到期时间
+
+        Returns:
+            Dict[str, float]: {source_id: 距离下次轮询的秒数（已到期为 0）}
+        """
+        now = time.monotonic()
+        return {
+            source_id: max(state['next_due'] - now, 0.0)
+            for source_id, state in self._states.items()
+        }
@@ -0,0 +1,118 @@
+"""
+数据源模块 - 数据驱动的数据源注册表
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from .config import Config
+
+# 数据源传输方式
+TRANSPORT_HTTP = 'http'  # HTTP 轮询
+TRANSPORT_WEBSOCKET = 'websocket'  # WebSocket 推送
+
+
+class PriceSource:
+    """单个数据源的描述（来自 Config.SOURCES 的一项）"""
+
+    __slots__ = (
+        'id', 'name', 'transport', 'url', 'parser', 'symbol', 'interval', 'unit',
+        'connect_timeout', 'read_timeout', 'sessions', 'holidays'
+    )
+
+    def __init__(self, spec: dict):
+        """
+        Args:
+            spec: 数据源配置，字段见 Config.SOURCES 的说明
+        """
+        config = Config()
+        self.id: str = spec['id']
+        self.name: str = spec['name']
+        self.transport: str = spec['transport']
+        self.url: Optional[str] = spec.get('url')
+        self.parser: str = spec.get('parser', 'quote_list' if spec['transport'] == TRANSPORT_WEBSOCKET else 'json_price')
+        self.symbol: Optional[str] = spec.get('symbol')
+        self.interval: float = spec.get('interval', config.UPDATE_INTERVAL)
+        self.unit: str = spec.get('unit', '元/克')
+        self.connect_timeout: float = spec.get('connect_timeout', config.API_CONNECT_TIMEOUT)
+        self.read_timeout: float = spec.get('read_timeout', config.API_READ_TIMEOUT)
+        self.sessions: List[dict] = spec.get('sessions', [])
+        self.holidays: List[str] = spec.get('holidays', [])
+
+    @property
+    def is_http(self) -> bool:
+        """是否为 HTTP 轮询数据源"""
+        return self.transport == TRANSPORT_HTTP
+
+    @property
+    def is_websocket(self) -> bool:
+        """是否为 WebSocket 推送数据源"""
+        return self.transport == TRANSPORT_WEBSOCKET
+
+
+class SourceRegistry:
+    """数据源注册表，按 ID O(1) 查找，并保持配置中的显示顺序"""
+
+    def __init__(self, specs: Iterable[dict]):
+        """
+        Args:
+            specs: 数据源配置列表
+
+        Raises:
+            ValueError: 数据源 ID 重复或传输方式未知
+        """
+        self._sources: Dict[str, PriceSource] = {}
+        for spec in specs:
+            source = PriceSource(spec)
+            if source.id in self._sources:
+                raise ValueError(f"数据源 ID 重复: {source.id}")
+            if source.transport not in (TRANSPORT_HTTP, TRANSPORT_WEBSOCKET):
+                raise ValueError(f"未知的传输方式: {source.transport}")
+            self._sources[source.id] = source
+
+        self._ids = list(self._sources)
+        self._http_ids = [s.id for s in self._sources.values() if s.is_http]
+        self._websocket_ids = [s.id for s in self._sources.values() if s.is_websocket]
+
+    def get(self, source_id: str) -> PriceSource:
+        """
+        按 ID 获取数据源
+
+        Raises:
+            KeyError: 数据源不存在
+        """
+        return self._sources[source_id]
+
+    def __contains__(self, source_id: str) -> bool:
+        return source_id in self._sources
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def ids(self) -> List[str]:
+        """所有数据源 ID（显示顺序）"""
+        return self._ids
+
+    def http_ids(self) -> List[str]:
+        """HTTP 轮询数据源 ID"""
+        return self._http_ids
+
+    def websocket_ids(self) -> List[str]:
+        """WebSocket 推送数据源 ID"""
+        return self._websocket_ids
+
+    def next_id(self, source_id: str) -> str:
+        """获取显示顺序中的下一个数据源 ID（循环）"""
+        position = self._ids.index(source_id) if source_id in self._sources else -1
+        return self._ids[(position + 1) % len(self._ids)]
+
+
+# 进程内共享的数据源注册表
+_registry: Optional[SourceRegistry] = None
+
+
+def get_source_registry() -> SourceRegistry:
+    """获取进程内共享的数据源注册表（首次调用时根据 Config.SOURCES 创建）"""
+    global _registry
+    if _registry is None:
+        _registry = SourceRegistry(Config.SOURCES)
+    return _registry
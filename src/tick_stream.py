@@ -0,0 +1,89 @@
+"""
+推送行情模块 - 把 WebSocket 线程的报价合并后按帧率上限交给界面线程
+"""
+
+import threading
+import time
+from typing import Callable, Dict
+
+from PySide6.QtCore import Qt, QMetaObject, QObject, QTimer, Slot
+
+
+class ConflatingTickStream(QObject):
+    """
+    合并推送队列：每个数据源只保留最新的一条，界面线程按帧率上限批量取出
+
+    需要在界面线程中创建。push() 可在任意线程调用，同一批次只向界面线程投递一次调度，
+    行情爆发时不会为每条报价都重绘界面。
+    """
+
+    def __init__(self, on_ticks: Callable[[Dict[str, object]], None], fps: float):
+        """
+        Args:
+            on_ticks: 渲染回调 {source_id: 最新值}，在界面线程中调用
+            fps: 每秒最多渲染次数
+        """
+        super().__init__()
+        self.on_ticks = on_ticks
+        self.min_interval = 1.0 / fps
+        self._latest: Dict[str, object] = {}
+        self._pending = False  # 是否已通知界面线程、尚未取走
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self._flush)
+
+        # 统计
+        self.pushed = 0  # 收到的报价数
+        self.flushes = 0  # 实际渲染次数
+
+    def push(self, source_id: str, value: object):
+        """
+        写入数据源的最新值（覆盖尚未渲染的旧值）
+
+        Args:
+            source_id: 数据源ID
+            value: 最新值
+        """
+        with self._lock:
+            self._latest[source_id] = value
+            self.pushed += 1
+            if self._pending or self._stopped:
+                return
+            self._pending = True
+        # 投递到界面线程执行调度
+        QMetaObject.invokeMethod(self, "_schedule", Qt.ConnectionType.QueuedConnection)
+
+    @Slot()
+    def _schedule(self):
+        """安排下一次渲染：距上次渲染已超过帧间隔则立即渲染，否则等到下一帧"""
+        if self.flush_timer.isActive():
+            return
+        wait = self._last_flush + self.min_interval - time.monotonic()
+        if wait <= 0:
+            self._flush()
+        else:
+            self.flush_timer.start(int(wait * 1000) + 1)
+
+    @Slot()
+    def _flush(self):
+        """取出所有数据源的最新值并渲染"""
+        with self._lock:
+            latest = self._latest
+            self._latest = {}
+            self._pending = False
+        if not latest:
+            return
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+        self.on_ticks(latest)
+
+    def stop(self):
+        """停止渲染（丢弃尚未渲染的报价）"""
+        self.flush_timer.stop()
+        with self._lock:
+            self._latest = {}
+            self._stopped = True
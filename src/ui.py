@@ -6,7 +6,7 @@ import sys
 import ctypes
 from typing import Callable, Optional
 
-from PySide6.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, QTimer
+from PySide6.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, QTimer, Slot
 from PySide6.QtGui import QFont, QColor, QPainter, QBrush
 from PySide6.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QGraphicsOpacityEffect,
@@ -20,13 +20,16 @@ from .version import __version__
 class MainWindow(QWidget):
     """主窗口类"""
 
-    def __init__(self, on_close: Callable, on_api_switch: Callable = None):
+    def __init__(self, on_close: Callable, on_api_switch: Callable = None,
+                 on_prices_ready: Callable = None, on_late_price: Callable = None):
         """
         初始化主窗口
 
         Args:
             on_close: 关闭窗口时的回调函数
             on_api_switch: 切换API时的回调函数
+            on_prices_ready: 收到后台一轮抓取结果时的回调函数
+            on_late_price: 收到后台迟到的单个结果时的回调函数
         """
         # 确保 QApplication 存在
         self.app = QApplication.instance()
@@ -41,6 +44,8 @@ class MainWindow(QWidget):
         self.config = Config()
         self.on_close = on_close
         self.on_api_switch = on_api_switch
+        self.on_prices_ready = on_prices_ready
+        self.on_late_price = on_late_price
         self.theme_index = 0  # 0: dark, 1: light, 2: transparent
         self.themes = [ThemeConfig.DARK_THEME, ThemeConfig.LIGHT_THEME, ThemeConfig.TRANSPARENT_THEME]
 
@@ -351,11 +356,11 @@ class MainWindow(QWidget):
     def update_display(self, price_text: str, change_text: str,
                        info_text1: str, info_text2: str,
                        price_color: str):
-        """更新显示内容"""
-        self.price_label.setText(price_text)
-        self.change_label.setText(change_text)
-        self.info_label1.setText(info_text1)
-        self.info_label2.setText(info_text2)
+        """更新显示内容（只重设有变化的文本和颜色）"""
+        self._set_text(self.price_label, price_text)
+        self._set_text(self.change_label, change_text)
+        self._set_text(self.info_label1, info_text1)
+        self._set_text(self.info_label2, info_text2)
 
         # 设置价格颜色
         theme = self.themes[self.theme_index]
@@ -366,8 +371,28 @@ class MainWindow(QWidget):
         else:
             color = theme['neutral_color']
 
-        self.price_label.setStyleSheet(f"color: {color}; background: transparent;")
-        self.change_label.setStyleSheet(f"color: {color}; background: transparent;")
+        style = f"color: {color}; background: transparent;"
+        if self.price_label.styleSheet() != style:
+            self.price_label.setStyleSheet(style)
+            self.change_label.setStyleSheet(style)
+
+    @staticmethod
+    def _set_text(label: QLabel, text: str):
+        """文本变化时才重设标签（避免重复排版和重绘）"""
+        if label.text() != text:
+            label.setText(text)
+
+    @Slot(object)
+    def receive_prices(self, all_prices: dict):
+        """接收后台抓取结果（队列信号，在界面线程中执行）"""
+        if self.on_prices_ready:
+            self.on_prices_ready(all_prices)
+
+    @Slot(str, object)
+    def receive_late_price(self, source_id: str, result: tuple):
+        """接收后台迟到的单个结果（队列信号，在界面线程中执行）"""
+        if self.on_late_price:
+            self.on_late_price(source_id, result)
 
     def show_error(self, error_text: str):
         """显示错误信息"""
@@ -7,10 +7,19 @@ from datetime import date
 from typing import Optional
 
 import shiboken6
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import Qt, QMetaObject, QThread, QTimer
+from PySide6.QtNetwork import QNetworkInformation
 
 from .config import Config
-from .api import GoldPriceAPI, LondonGoldWebSocket
+from .api import GoldPriceAPI, LondonGoldWebSocket, Quote
+from .async_api import get_async_engine
+from .scheduler import PollScheduler
+from .fetch_worker import PriceFetchWorker
+from .tick_stream import ConflatingTickStream
+from .price_display import PriceDisplay
+from .circuit_breaker import STATE_CLOSED
+from .market_calendar import build_market_calendars
+from .sources import get_source_registry
 from .ui import MainWindow, AlertWindow
 from .ai_analyzer import AIAnalyzer
 
@@ -21,24 +30,31 @@ class GoldPriceWidget:
     def __init__(self):
         self.config = Config()
         self.api = GoldPriceAPI()
+        self.registry = get_source_registry()
 
         # 初始化AI分析器
         self.ai_analyzer = AIAnalyzer(self.config) if self.config.AI_ENABLED else None
 
-        # 初始化伦敦金 WebSocket 客户端
+        # 每个数据源的交易日历 {source_id: MarketCalendar}
+        self.market_calendars = build_market_calendars() if self.config.MARKET_CALENDAR_ENABLED else {}
+
+        # 初始化伦敦金 WebSocket 客户端（休市时不连接）
         self.london_gold_ws = LondonGoldWebSocket()
-        self.london_gold_ws.start()
+        if self._is_websocket_active():
+            self.london_gold_ws.start()
+
+        # 显示币种/单位换算（使用伦敦金客户端的汇率表，不额外请求）
+        self.price_display = PriceDisplay(self.london_gold_ws.exchange_rate_api)
 
         # 状态变量
         self.is_running = True
         self.last_update_time = ""
 
-        # 为每个API维护独立的状态
-        # 结构：{api_index: {'base_price': float, 'base_price_date': date, 'last_alert_price': float}}
+        # 为每个数据源（HTTP 和 WebSocket）维护独立的状态
+        # 结构：{source_id: {'base_price': float, 'base_price_date': date, 'last_alert_price': float}}
         self.api_states = {}
-        # 为前两个 HTTP API 和伦敦金（索引2）初始化状态
-        for i in range(len(self.config.API_URLS) + 1):  # +1 包含伦敦金
-            self.api_states[i] = {
+        for source_id in self.registry.ids():
+            self.api_states[source_id] = {
                 'base_price': None,
                 'base_price_date': None,
                 'last_alert_price': None
@@ -46,27 +62,109 @@ class GoldPriceWidget:
 
         # 缓存所有API的最新价格数据
         self.cached_prices = {}
+        # 当前界面上显示的数据源ID（数据未变化时跳过重新渲染）
+        self.rendered_source_id = None
 
         self.current_alert_window: Optional[AlertWindow] = None
 
         # 创建 UI
-        self.main_window = MainWindow(on_close=self._on_close, on_api_switch=self._on_api_switch)
+        self.main_window = MainWindow(
+            on_close=self._on_close,
+            on_api_switch=self._on_api_switch,
+            on_prices_ready=self._on_prices_ready,
+            on_late_price=self._on_late_price
+        )
 
-        # 使用 QTimer 代替线程进行定时更新
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self._update_price_display)
-        self.update_timer.start(self.config.UPDATE_INTERVAL * 1000)  # 转换为毫秒
+        # 每个 HTTP 数据源独立的自适应轮询间隔（基准间隔见 Config.SOURCES）
+        http_ids = self.registry.http_ids()
+        self.scheduler = PollScheduler(
+            http_ids,
+            {source_id: self.registry.get(source_id).interval for source_id in http_ids}
+        )
 
-        # 立即执行一次更新
-        self._update_price_display()
+        # 网络抓取在后台线程中进行，结果通过队列信号回到界面线程，界面不受上游延迟影响
+        # 启动时所有数据源立即到期（休市时也先取一次价格作为展示）
+        self.fetch_thread = QThread()
+        self.fetch_worker = PriceFetchWorker(self.api, self.london_gold_ws, self.scheduler)
+        self.fetch_worker.moveToThread(self.fetch_thread)
+        self.fetch_thread.started.connect(self.fetch_worker.start)
+        self.fetch_worker.prices_ready.connect(self.main_window.receive_prices)
+        self.fetch_worker.late_price_ready.connect(self.main_window.receive_late_price)
+        self.fetch_thread.start()
+
+        # WebSocket 行情由推送驱动：报价按数据源合并，按帧率上限渲染，不等待轮询
+        self.tick_stream = ConflatingTickStream(self._on_prices_ready, self.config.PUSH_RENDER_FPS)
+        for source_id in self.registry.websocket_ids():
+            self.london_gold_ws.subscribe(
+                self.registry.get(source_id).symbol, self._make_tick_handler(source_id)
+            )
+
+        # 按交易日历暂停/恢复轮询和 WebSocket
+        self.market_timer = QTimer()
+        self.market_timer.timeout.connect(self._apply_market_sessions)
+        if self.config.MARKET_CALENDAR_ENABLED:
+            self._apply_market_sessions()
+            self.market_timer.start(self.config.MARKET_CHECK_INTERVAL * 1000)
+
+        # 系统报告网络恢复时立即重连 WebSocket（如笔记本睡眠唤醒、切换网络）
+        self.network_info = self._watch_network()
+
+    def _make_tick_handler(self, source_id: str):
+        """
+        创建 WebSocket 报价回调（在 WebSocket 线程中读取报价快照后写入推送队列，不请求汇率）
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            Callable: 订阅回调 (symbol, quote)
+        """
+        name = self.registry.get(source_id).name
+
+        def on_tick(symbol: str, quote: Quote):
+            price_data, display_text, update_time = self.london_gold_ws.get_cached_price(symbol)
+            self.tick_stream.push(source_id, (price_data, display_text, update_time, name))
+
+        return on_tick
+
+    def _watch_network(self) -> Optional[QNetworkInformation]:
+        """
+        监听系统网络可达性变化
+
+        Returns:
+            Optional[QNetworkInformation]: 当前平台不支持时返回 None（仍按退避间隔重连）
+        """
+        if not QNetworkInformation.loadDefaultBackend():
+            return None
+        network_info = QNetworkInformation.instance()
+        if network_info is None:
+            return None
+        network_info.reachabilityChanged.connect(self._on_reachability_changed)
+        return network_info
+
+    def _on_reachability_changed(self, reachability: QNetworkInformation.Reachability):
+        """网络可达性变化回调：恢复联网时唤醒 WebSocket 重连"""
+        if reachability == QNetworkInformation.Reachability.Online and self._is_websocket_active():
+            self.london_gold_ws.notify_network_available()
 
     def _on_close(self):
         """关闭回调"""
         self.is_running = False
-        self.update_timer.stop()
+        self.market_timer.stop()
+        # 停止后台抓取线程（定时器需在所属线程中停止，最多等待一轮截止时间）
+        QMetaObject.invokeMethod(self.fetch_worker, "stop", Qt.ConnectionType.BlockingQueuedConnection)
+        self.fetch_thread.quit()
+        self.fetch_thread.wait(int(self.config.REFRESH_DEADLINE * 1000) + 1000)
+        self.tick_stream.stop()
+        # 关闭抓取线程池
+        self.api.shutdown()
         # 停止 WebSocket 连接
         if hasattr(self, 'london_gold_ws'):
             self.london_gold_ws.stop()
+            # 关闭汇率请求线程池
+            self.london_gold_ws.exchange_rate_api.shutdown()
+        # 停止异步 I/O 事件循环（取消进行中的地址择优与汇率刷新）
+        get_async_engine().stop()
         if self.current_alert_window:
             try:
                 if shiboken6.isValid(self.current_alert_window):
@@ -145,82 +243,164 @@ class GoldPriceWidget:
             self.main_window.show_error("正在加载数据...")
             return
 
-        current_api_index = self.api.current_api_index
-        if current_api_index not in self.cached_prices:
-            self.main_window.show_error("数据未就绪...")
+        current_source_id = self.api.current_source_id
+        if current_source_id not in self.cached_prices:
+            if not self._is_market_active(current_source_id):
+                self.main_window.show_error(f"{self.registry.get(current_source_id).name}: 休市")
+            else:
+                self.main_window.show_error("数据未就绪...")
             return
 
-        price_data, display_text, update_time, api_name = self.cached_prices[current_api_index]
+        self._render_source(current_source_id)
 
-        if price_data is not None:
-            self.last_update_time = update_time
-            state = self.api_states[current_api_index]
+    def _render_source(self, source_id: str):
+        """
+        使用缓存数据渲染指定数据源
 
-            # 如果该API还没有基准价格，先设置
-            if state['base_price'] is None:
-                state['base_price'] = price_data
-                state['base_price_date'] = date.today()
-
-            # 计算当前API的变化（用于显示）
-            change_vs_base = price_data - state['base_price']
-            change_percent_vs_base = (change_vs_base / state['base_price']) * 100
-
-            # 确定颜色和符号
-            if change_vs_base > 0:
-                price_color = 'up'
-                change_symbol = "↑"
-            elif change_vs_base < 0:
-                price_color = 'down'
-                change_symbol = "↓"
-            else:
-                price_color = 'neutral'
-                change_symbol = "→"
+        Args:
+            source_id: 数据源ID
+        """
+        price_data, display_text, update_time, api_name = self.cached_prices[source_id]
 
+        if price_data is None:
+            self.rendered_source_id = None
+            health = self.api.get_source_health(source_id)
+            if not self._is_market_active(source_id):
+                display_text = f"{api_name}: 休市"
+            elif health and health['state'] != STATE_CLOSED:
+                display_text = f"{api_name}: {health['text']}（{health['retry_in']:.0f}秒后重试）"
+            self.main_window.show_error(display_text)
+            return
+
+        self.last_update_time = update_time
+        state = self.api_states[source_id]
+        self.rendered_source_id = source_id
+
+        # 如果该API还没有基准价格，先设置
+        if state['base_price'] is None:
+            state['base_price'] = price_data
+            state['base_price_date'] = date.today()
+
+        # 计算当前API的变化（用于显示）
+        change_vs_base = price_data - state['base_price']
+        change_percent_vs_base = (change_vs_base / state['base_price']) * 100
+
+        # 确定颜色和符号
+        if change_vs_base > 0:
+            price_color = 'up'
+            change_symbol = "↑"
+        elif change_vs_base < 0:
+            price_color = 'down'
+            change_symbol = "↓"
+        else:
+            price_color = 'neutral'
+            change_symbol = "→"
+
+        # 休市时在最后一行提示下次开盘时间
+        market_text = self._get_market_status_text(source_id)
+
+        # WebSocket 数据源（伦敦金、伦敦银）使用4行显示详细信息
+        source = self.registry.get(source_id)
+        if source.is_websocket:
+            line1, line2, line3, line4 = self.london_gold_ws.get_detailed_info(
+                source.symbol, state['base_price'], state['last_alert_price'],
+                self.last_update_time, change_vs_base,
+                change_percent_vs_base, change_symbol, self.price_display
+            )
+            if market_text:
+                line4 = market_text
+            # 使用所有4个标签显示详细信息
+            self.main_window.update_display(
+                line1, line2, line3, line4, price_color
+            )
+        else:
             # 生成显示文本
             change_text = f"基准: {state['base_price']:.2f}  {change_symbol} {change_vs_base:+.2f} ({change_percent_vs_base:+.2f}%)"
-
-            # 如果是伦敦金（索引2），使用4行显示详细信息
-            if current_api_index == 2:
-                line1, line2, line3, line4 = self.london_gold_ws.get_detailed_info(
-                    state['base_price'], state['last_alert_price'],
-                    self.last_update_time, change_vs_base,
-                    change_percent_vs_base, change_symbol
-                )
-                # 使用所有4个标签显示伦敦金信息
-                self.main_window.update_display(
-                    line1, line2, line3, line4, price_color
-                )
+            info_text1 = f"更新: {self.last_update_time} | API: {api_name}"
+            if market_text:
+                info_text2 = market_text
             else:
-                info_text1 = f"更新: {self.last_update_time} | API: {api_name}"
                 alert_info = f"上次提醒: {state['last_alert_price']:.2f}" if state['last_alert_price'] else "上次提醒: 无"
                 info_text2 = f"{alert_info} | 滚轮切换API | 右键关闭"
-                # 更新显示
-                self.main_window.update_display(
-                    display_text, change_text, info_text1, info_text2, price_color
-                )
-        else:
-            self.main_window.show_error(display_text)
+            # 更新显示
+            self.main_window.update_display(
+                display_text, change_text, info_text1, info_text2, price_color
+            )
+
+    def _is_market_active(self, source_id: str) -> bool:
+        """数据源当前是否处于交易时段（含开盘前预热时间）"""
+        calendar = self.market_calendars.get(source_id)
+        return calendar is None or calendar.is_active()
+
+    def _is_websocket_active(self) -> bool:
+        """是否有 WebSocket 数据源处于交易时段（决定是否保持连接）"""
+        return any(self._is_market_active(source_id) for source_id in self.registry.websocket_ids())
+
+    def _get_market_status_text(self, source_id: str) -> str:
+        """
+        获取休市提示文本
+
+        Args:
+            source_id: 数据源ID
+
+        Returns:
+            str: 休市时返回提示文本，交易时段返回空字符串
+        """
+        calendar = self.market_calendars.get(source_id)
+        if calendar is None or calendar.is_open():
+            return ""
+        next_open = calendar.next_open()
+        if next_open is None:
+            return "休市中"
+        return f"休市中 | 开盘: {next_open.strftime('%m-%d %H:%M')}"
+
+    def _apply_market_sessions(self):
+        """根据交易日历暂停/恢复轮询和 WebSocket 连接"""
+        for source_id in self.registry.http_ids():
+            self.scheduler.set_paused(source_id, not self._is_market_active(source_id))
+
+        if self._is_websocket_active():
+            self.london_gold_ws.start()
+        elif self.london_gold_ws.is_running():
+            self.london_gold_ws.stop()
 
-    def _update_price_display(self):
-        """更新价格显示，仅监控当前选中的API"""
-        # 获取所有API的价格数据（并行请求，速度快）
-        all_prices = self.api.fetch_all_prices()
+        # 开收盘切换时刷新提示
+        if self.rendered_source_id is not None:
+            self._update_display_from_cache()
 
-        # 获取伦敦金价格（索引2）
-        london_price_data, london_display_text, london_update_time = self.london_gold_ws.get_latest_price()
-        all_prices[2] = (london_price_data, london_display_text, london_update_time, "伦敦金")
+    def _on_late_price(self, source_id: str, result: tuple):
+        """
+        迟到结果回调（界面线程）：到达即写入缓存并按需刷新显示
+
+        Args:
+            source_id: 数据源ID
+            result: (价格浮点数, 显示文本, 更新时间, API名称)
+        """
+        self._on_prices_ready({source_id: result})
+
+    def _on_prices_ready(self, all_prices: dict):
+        """
+        后台抓取结果回调（界面线程）：更新缓存、检查提醒并刷新显示
+
+        Args:
+            all_prices: {source_id: (价格浮点数, 显示文本, 更新时间, API名称)}
+        """
+        # 按配置的显示币种/单位换算，基准价格和提醒均使用换算后的价格
+        all_prices = {
+            source_id: self.price_display.apply(result) for source_id, result in all_prices.items()
+        }
 
         # 更新缓存
-        self.cached_prices = all_prices
+        self.cached_prices.update(all_prices)
 
         today = date.today()
 
         # 遍历所有API，更新基准价格（但不检查提醒）
-        for api_index, (price_data, display_text, update_time, api_name) in all_prices.items():
+        for source_id, (price_data, display_text, update_time, api_name) in all_prices.items():
             if price_data is None:
                 continue
 
-            state = self.api_states[api_index]
+            state = self.api_states[source_id]
 
             # 检查是否需要更新基准价格
             if state['base_price'] is None or state['base_price_date'] != today:
@@ -229,65 +409,31 @@ class GoldPriceWidget:
                 state['last_alert_price'] = None
 
         # 只对当前选中的API检查提醒和显示数据
-        current_api_index = self.api.current_api_index
-        if current_api_index in all_prices:
-            price_data, display_text, update_time, api_name = all_prices[current_api_index]
-
-            if price_data is not None:
-                self.last_update_time = update_time
-                state = self.api_states[current_api_index]
-
-                # 计算当前API的变化
-                change_vs_base = price_data - state['base_price']
-                change_percent_vs_base = (change_vs_base / state['base_price']) * 100
-
-                # 检查是否需要触发提醒（仅针对当前选中的API）
-                if state['last_alert_price'] is not None:
-                    change_vs_last_alert = price_data - state['last_alert_price']
-                    change_percent_vs_last_alert = (change_vs_last_alert / state['last_alert_price']) * 100
-                else:
-                    change_percent_vs_last_alert = change_percent_vs_base
-
-                if abs(change_percent_vs_last_alert) >= self.config.ALERT_THRESHOLD:
-                    self._show_alert(change_percent_vs_last_alert, api_name, price_data, state['base_price'])
-                    state['last_alert_price'] = price_data
-
-
-                # 确定颜色和符号
-                if change_vs_base > 0:
-                    price_color = 'up'
-                    change_symbol = "↑"
-                elif change_vs_base < 0:
-                    price_color = 'down'
-                    change_symbol = "↓"
-                else:
-                    price_color = 'neutral'
-                    change_symbol = "→"
-
-                # 生成显示文本
-                change_text = f"基准: {state['base_price']:.2f}  {change_symbol} {change_vs_base:+.2f} ({change_percent_vs_base:+.2f}%)"
-
-                # 如果是伦敦金（索引2），使用4行显示详细信息
-                if current_api_index == 2:
-                    line1, line2, line3, line4 = self.london_gold_ws.get_detailed_info(
-                        state['base_price'], state['last_alert_price'],
-                        self.last_update_time, change_vs_base,
-                        change_percent_vs_base, change_symbol
-                    )
-                    # 使用所有4个标签显示伦敦金信息
-                    self.main_window.update_display(
-                        line1, line2, line3, line4, price_color
-                    )
-                else:
-                    info_text1 = f"更新: {self.last_update_time} | API: {api_name}"
-                    alert_info = f"上次提醒: {state['last_alert_price']:.2f}" if state['last_alert_price'] else "上次提醒: 无"
-                    info_text2 = f"{alert_info} | 滚轮切换API | 右键关闭"
-                    # 更新显示
-                    self.main_window.update_display(
-                        display_text, change_text, info_text1, info_text2, price_color
-                    )
+        current_source_id = self.api.current_source_id
+        if current_source_id == self.rendered_source_id and current_source_id not in all_prices:
+            # 当前数据源本次未请求，界面无需重新计算和渲染
+            # （内容未变化时仍需渲染：更新时间和跨日重置的基准价格会变化，未变化的文本由界面跳过）
+            return
+
+        if current_source_id not in self.cached_prices:
+            return
+
+        price_data, display_text, update_time, api_name = self.cached_prices[current_source_id]
+        if price_data is not None:
+            state = self.api_states[current_source_id]
+
+            # 检查是否需要触发提醒（仅针对当前选中的API）
+            if state['last_alert_price'] is not None:
+                change_vs_last_alert = price_data - state['last_alert_price']
+                change_percent_vs_last_alert = (change_vs_last_alert / state['last_alert_price']) * 100
             else:
-                self.main_window.show_error(display_text)
+                change_percent_vs_last_alert = (price_data - state['base_price']) / state['base_price'] * 100
+
+            if abs(change_percent_vs_last_alert) >= self.config.ALERT_THRESHOLD:
+                self._show_alert(change_percent_vs_last_alert, api_name, price_data, state['base_price'])
+                state['last_alert_price'] = price_data
+
+        self._render_source(current_source_id)
 
     def run(self):
         """运行应用"""
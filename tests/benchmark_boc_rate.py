@@ -0,0 +1,56 @@
+"""
+中国银行牌价解析基准测试 - 对比 BeautifulSoup 整页解析与流式解析
+
+运行: python -m tests.benchmark_boc_rate [页面文件]
+默认使用 tests/fixtures/boc_whpj.html，可传入从 https://www.boc.cn/sourcedb/whpj/ 另存的页面。
+"""
+
+import os
+import sys
+import time
+import timeit
+
+from src.boc_rate import extract_boc_rate
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'boc_whpj.html')
+CHUNK_SIZE = 8192  # 与 ExchangeRateAPI._fetch_from_boc 的读取块大小一致
+
+
+def parse_with_soup(html: str) -> float:
+    """原实现：构建整页文档树后遍历所有行查找美元"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for row in soup.find_all('tr'):
+        cells = row.find_all('td')
+        if len(cells) >= 4 and '美元' in cells[0].get_text():
+            return float(''.join(cells[3].get_text().split())) / 100
+    return None
+
+
+def parse_streaming(html: str) -> float:
+    """流式解析：按块输入，读到美元行即停止"""
+    chunks = (html[start:start + CHUNK_SIZE] for start in range(0, len(html), CHUNK_SIZE))
+    return extract_boc_rate(chunks)
+
+
+def main():
+    """运行基准测试"""
+    path = sys.argv[1] if len(sys.argv) > 1 else FIXTURE
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    print(f"页面: {path} ({len(html)} 字符)")
+
+    start = time.perf_counter()
+    import bs4  # noqa: F401
+    print(f"导入 bs4: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    number = 200
+    for name, parse in (('BeautifulSoup', parse_with_soup), ('流式解析', parse_streaming)):
+        rate = parse(html)
+        elapsed = min(timeit.repeat(lambda: parse(html), number=number, repeat=3)) / number
+        print(f"{name}: {elapsed * 1000:.3f} ms/次, 汇率 {rate}")
+
+
+if __name__ == '__main__':
+    main()
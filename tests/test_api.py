@@ -2,9 +2,13 @@
 API 模块测试
 """
 
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
-from src.api import GoldPriceAPI
+
+import requests
+
+from src.api import GoldPriceAPI, FETCH_OK, FETCH_UNCHANGED, FETCH_CIRCUIT_OPEN
 
 
 class TestGoldPriceAPI(unittest.TestCase):
@@ -14,27 +18,33 @@ class TestGoldPriceAPI(unittest.TestCase):
         """测试前的准备工作"""
         self.api = GoldPriceAPI()
 
+    def tearDown(self):
+        """测试后关闭线程池"""
+        self.api.shutdown()
+
     def test_switch_api(self):
         """测试 API 切换功能"""
-        initial_index = self.api.current_api_index
+        initial_id = self.api.current_source_id
         api_name = self.api.switch_api()
 
-        # 验证索引已切换
-        self.assertNotEqual(initial_index, self.api.current_api_index)
+        # 验证数据源已切换
+        self.assertNotEqual(initial_id, self.api.current_source_id)
         # 验证返回了 API 名称
         self.assertIsInstance(api_name, str)
 
     def test_get_current_api_name(self):
         """测试获取当前 API 名称"""
         name = self.api.get_current_api_name()
-        self.assertIn(name, self.api.config.API_NAMES)
+        self.assertIn(name, [self.api.registry.get(i).name for i in self.api.registry.ids()])
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_price_success(self, mock_get):
         """测试成功获取价格"""
         # 模拟成功的 API 响应
         mock_response = MagicMock()
         mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.content = b'{"code": 0, "data": {"price": "500.00"}}'
         mock_response.json.return_value = {
             'code': 0,
             'data': {
@@ -51,17 +61,147 @@ class TestGoldPriceAPI(unittest.TestCase):
         self.assertIsInstance(text, str)
         self.assertIsInstance(time, str)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_price_failure(self, mock_get):
         """测试获取价格失败的情况"""
         # 模拟请求失败
-        mock_get.side_effect = Exception("网络错误")
+        mock_get.side_effect = requests.exceptions.ConnectionError("连接被拒绝")
 
         price, text, time = self.api.fetch_price()
 
         # 验证失败情况下的返回值
         self.assertIsNone(price)
-        self.assertIn("获取失败", text)
+        self.assertIn("网络错误", text)
+
+    def test_fetch_all_prices_reuses_executor(self):
+        """测试多次轮询复用同一个线程池"""
+        executor = self.api.executor
+        with patch.object(self.api, '_fetch_price_from_api', return_value=(500.0, "500 元/克", "10:00:00")):
+            first = self.api.fetch_all_prices()
+            second = self.api.fetch_all_prices()
+
+        self.assertIs(executor, self.api.executor)
+        self.assertEqual(first, second)
+        # 结果按完成顺序写入，只比较数据源集合
+        self.assertEqual(set(first), set(self.api.registry.http_ids()))
+
+    def test_submit_fetch_reuses_inflight_future(self):
+        """测试同一数据源的在途请求被复用，排队计数正确"""
+        release = threading.Event()
+
+        def slow_fetch(source_id):
+            release.wait(2)
+            return 500.0, "500 元/克", "10:00:00"
+
+        with patch.object(self.api, '_fetch_price_from_api', side_effect=slow_fetch):
+            first = self.api.submit_fetch('czbank')
+            second = self.api.submit_fetch('czbank')
+            self.assertIs(first, second)
+            release.set()
+            self.assertEqual(first.result(timeout=2)[0], 500.0)
+
+        self.assertEqual(self.api.get_queue_depth(), 0)
+
+    def test_extract_price_learns_path(self):
+        """测试记住成功路径，路径失效后重新学习"""
+        nested = {'result': {'items': [{'name': 'AU'}, {'price': '612.30'}]}}
+        self.assertEqual(self.api._extract_price(nested, 'czbank'), '612.30')
+        self.assertEqual(self.api._price_paths['czbank'], ('result', 'items', 1, 'price'))
+
+        # 已学习的路径直接命中，不再遍历
+        with patch.object(self.api, '_find_price_path') as mock_find:
+            nested['result']['items'][1]['price'] = '613.00'
+            self.assertEqual(self.api._extract_price(nested, 'czbank'), '613.00')
+            mock_find.assert_not_called()
+
+        # 结构变化后重新学习
+        self.assertEqual(self.api._extract_price({'data': {'price': 600}}, 'czbank'), 600)
+        self.assertEqual(self.api._price_paths['czbank'], ('data', 'price'))
+
+    def test_find_price_path_bounded(self):
+        """测试超深或超大响应的遍历有上限"""
+        deep = {'price': 1.0}
+        for _ in range(self.api.config.PRICE_SEARCH_MAX_DEPTH + 5):
+            deep = {'next': deep}
+        self.assertIsNone(self.api._find_price_path(deep))
+
+        wide = [{'x': i} for i in range(self.api.config.PRICE_SEARCH_MAX_NODES)]
+        wide.append({'price': 1.0})
+        self.assertIsNone(self.api._find_price_path(wide))
+
+    @patch('requests.Session.get')
+    def test_fetch_price_unchanged_skips_parsing(self, mock_get):
+        """测试响应未变化时跳过解析，沿用上次价格并更新时间"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {'ETag': '"v1"'}
+        mock_response.content = b'{"data": {"price": "500.00"}}'
+        mock_response.json.return_value = {'data': {'price': '500.00'}}
+        mock_get.return_value = mock_response
+
+        first = self.api.fetch_price()
+        self.assertEqual(self.api.get_fetch_outcome('czbank'), FETCH_OK)
+
+        # 相同响应体：不再解析 JSON，更新时间为本次确认的时间
+        with patch('src.api.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "23:59:59"
+            second = self.api.fetch_price()
+        self.assertEqual(second, (first[0], first[1], "23:59:59"))
+        self.assertEqual(self.api.get_fetch_outcome('czbank'), FETCH_UNCHANGED)
+        self.assertEqual(mock_response.json.call_count, 1)
+
+        # 第二次请求应带上条件请求头；服务端返回 304
+        self.assertEqual(mock_get.call_args.kwargs['headers']['If-None-Match'], '"v1"')
+        mock_response.status_code = 304
+        self.assertEqual(self.api.fetch_price()[:2], first[:2])
+        self.assertEqual(self.api.get_fetch_outcome('czbank'), FETCH_UNCHANGED)
+
+    @patch('requests.Session.get')
+    def test_open_circuit_skips_request(self, mock_get):
+        """测试熔断后不再发起请求"""
+        mock_get.side_effect = requests.exceptions.ConnectTimeout("timeout")
+        for _ in range(self.api.config.BREAKER_FAILURE_THRESHOLD):
+            self.api.fetch_price()
+        calls = mock_get.call_count
+
+        price, text, _ = self.api.fetch_price()
+
+        self.assertIsNone(price)
+        self.assertEqual(mock_get.call_count, calls)
+        self.assertEqual(self.api.get_fetch_outcome('czbank'), FETCH_CIRCUIT_OPEN)
+        self.assertEqual(self.api.get_source_health('czbank')['state'], 'open')
+
+    def test_fetch_all_prices_returns_at_deadline(self):
+        """测试慢数据源不阻塞本轮刷新，结果到达后通过回调补充"""
+        release = threading.Event()
+        late = {}
+        late_arrived = threading.Event()
+
+        def fetch(source_id):
+            if source_id == 'cmbc':
+                release.wait(2)
+            return 500.0, "500 元/克", "10:00:00"
+
+        def on_late(source_id, result):
+            late[source_id] = result
+            late_arrived.set()
+
+        with patch.object(self.api, '_fetch_price_from_api', side_effect=fetch):
+            results = self.api.fetch_all_prices(deadline=0.2, on_late_result=on_late)
+            self.assertIn('czbank', results)
+            self.assertNotIn('cmbc', results)
+
+            release.set()
+            self.assertTrue(late_arrived.wait(2))
+        self.assertEqual(late['cmbc'], (500.0, "500 元/克", "10:00:00", "民生银行"))
+
+    def test_per_source_timeouts(self):
+        """测试连接/读取超时按数据源配置"""
+        config = self.api.config
+        self.assertEqual(self.api._get_timeout('czbank'), (config.API_CONNECT_TIMEOUT, config.API_READ_TIMEOUT))
+        source = self.api.registry.get('cmbc')
+        with patch.object(source, 'read_timeout', 2):
+            self.assertEqual(self.api._get_timeout('cmbc'), (config.API_CONNECT_TIMEOUT, 2))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,110 @@
+"""
+异步 I/O 模块测试
+"""
+
+import asyncio
+import socket
+import threading
+import time
+import unittest
+
+from src.async_api import AsyncEngine, open_stream_socket
+
+
+class TestAsyncEngine(unittest.TestCase):
+    """测试 AsyncEngine 类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.engine = AsyncEngine()
+
+    def tearDown(self):
+        """测试后停止事件循环"""
+        self.engine.stop()
+
+    def test_coroutines_share_one_thread(self):
+        """测试并发的协程都在同一个事件循环线程上运行，不随数量增加线程"""
+        threads = set()
+
+        async def wait():
+            threads.add(threading.current_thread().name)
+            await asyncio.sleep(0.2)
+
+        self.engine.start()
+        baseline = threading.active_count()
+        start = time.monotonic()
+        futures = [self.engine.submit(wait()) for _ in range(50)]
+        for future in futures:
+            future.result(timeout=2)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(threads, {'gold-async-loop'})
+        self.assertEqual(threading.active_count(), baseline)
+
+    def test_stop_cancels_pending_and_restarts(self):
+        """测试停止时未完成的协程被取消，之后提交时自动重新启动"""
+        future = self.engine.submit(asyncio.sleep(10))
+        self.engine.stop()
+        self.assertTrue(future.cancelled())
+
+        async def answer():
+            return 42
+
+        self.assertEqual(self.engine.submit(answer()).result(timeout=2), 42)
+
+
+class TestOpenStreamSocket(unittest.TestCase):
+    """测试 open_stream_socket 函数"""
+
+    def setUp(self):
+        """测试前的准备工作：本地监听端口"""
+        self.engine = AsyncEngine()
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen()
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        """测试后关闭监听端口并停止事件循环"""
+        self.server.close()
+        self.engine.stop()
+
+    def test_plain_connection(self):
+        """测试返回的连接为带超时的阻塞模式，可直接交给阻塞的 WebSocket 客户端使用"""
+        sock = self.engine.submit(open_stream_socket('127.0.0.1', self.port, False, 3)).result(timeout=2)
+        peer, _ = self.server.accept()
+        try:
+            self.assertEqual(sock.gettimeout(), 3)
+            peer.sendall(b'ping')
+            self.assertEqual(sock.recv(4), b'ping')
+        finally:
+            peer.close()
+            sock.close()
+
+    def test_tls_failure_raises(self):
+        """测试对端在 TLS 握手期间断开时抛出异常"""
+        def close_peer():
+            peer, _ = self.server.accept()
+            peer.close()
+
+        threading.Thread(target=close_peer, daemon=True).start()
+        future = self.engine.submit(open_stream_socket('127.0.0.1', self.port, True, 3))
+        with self.assertRaises(OSError):
+            future.result(timeout=2)
+
+    def test_tls_timeout_does_not_block_loop(self):
+        """测试 TLS 握手无响应时按超时结束，等待期间事件循环照常处理其他协程"""
+        async def probe():
+            return await asyncio.wait_for(open_stream_socket('127.0.0.1', self.port, True, 3), 0.3)
+
+        async def answer():
+            return 42
+
+        future = self.engine.submit(probe())
+        self.assertEqual(self.engine.submit(answer()).result(timeout=0.2), 42)
+        with self.assertRaises(asyncio.TimeoutError):
+            future.result(timeout=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
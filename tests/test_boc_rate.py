@@ -0,0 +1,59 @@
+"""
+中国银行牌价解析测试
+"""
+
+import os
+import unittest
+
+from src.boc_rate import BocRateParser, extract_boc_rate
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'boc_whpj.html')
+
+
+class TestBocRate(unittest.TestCase):
+    """测试 extract_boc_rate 函数"""
+
+    def setUp(self):
+        """测试前读取牌价页面"""
+        with open(FIXTURE, encoding='utf-8') as f:
+            self.html = f.read()
+
+    def _chunks(self, size: int = 4096):
+        """按块切分页面，记录已读取的块数"""
+        self.consumed = 0
+        for start in range(0, len(self.html), size):
+            self.consumed += 1
+            yield self.html[start:start + size]
+
+    def test_extracts_usd_spot_sell_rate(self):
+        """测试提取美元现汇卖出价并换算为每 1 美元"""
+        self.assertAlmostEqual(extract_boc_rate(self._chunks()), 7.2129)
+
+    def test_other_currency_and_column(self):
+        """测试按货币名称和列序号提取"""
+        self.assertAlmostEqual(extract_boc_rate(self._chunks(), currency='欧元', column=1), 8.1839)
+
+    def test_stops_after_target_row(self):
+        """测试找到目标行后不再读取后续内容"""
+        total = len(range(0, len(self.html), 4096))
+        extract_boc_rate(self._chunks())
+        self.assertLess(self.consumed, total)
+
+    def test_skips_rows_without_value(self):
+        """测试目标列为空或非数字的行被跳过，未闭合的单元格也能解析"""
+        html = (
+            "<table><tr><td>美元<td><td><td>-</tr>"
+            "<tr><td> 美元 </td><td>1</td><td>2</td><td> 713.5\n</td></tr></table>"
+        )
+        self.assertAlmostEqual(extract_boc_rate([html]), 7.135)
+
+    def test_missing_currency(self):
+        """测试页面中没有目标货币时返回 None"""
+        self.assertIsNone(extract_boc_rate(self._chunks(), currency='不存在的货币'))
+        parser = BocRateParser()
+        parser.feed("<html><body>维护中</body></html>")
+        self.assertIsNone(parser.rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
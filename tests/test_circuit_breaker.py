@@ -0,0 +1,71 @@
+"""
+熔断模块测试
+"""
+
+import unittest
+from unittest.mock import patch
+
+from src.circuit_breaker import CircuitBreaker, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """测试 CircuitBreaker 类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.breaker = CircuitBreaker()
+        self.threshold = self.breaker.config.BREAKER_FAILURE_THRESHOLD
+
+    def _trip(self, now: float = 0.0):
+        """连续失败直到熔断"""
+        for _ in range(self.threshold):
+            self.breaker.record_failure(now)
+
+    def test_opens_after_threshold(self):
+        """测试连续失败达到阈值后熔断，熔断期间请求被拒绝"""
+        self._trip()
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        self.assertFalse(self.breaker.allow_request(now=0.0))
+
+    def test_half_open_allows_single_probe(self):
+        """测试熔断到期后只放行一个探测请求，探测成功后恢复"""
+        self._trip()
+        later = self.breaker.retry_at
+        self.assertTrue(self.breaker.allow_request(now=later))
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+        self.assertFalse(self.breaker.allow_request(now=later))
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+        self.assertTrue(self.breaker.allow_request(now=later))
+
+    def test_failed_probe_backs_off_longer(self):
+        """测试探测失败后重新熔断，退避时间比上次更长且不超过上限"""
+        config = self.breaker.config
+        # 去掉随机抖动（取抖动区间上限），便于比较退避时长
+        with patch('src.backoff.random.uniform', side_effect=lambda low, high: high):
+            self._trip(now=0.0)
+            first_delay = self.breaker.retry_at
+            self.breaker.allow_request(now=first_delay)
+            self.breaker.record_failure(now=first_delay)
+            second_delay = self.breaker.retry_at - first_delay
+
+            self.assertEqual(self.breaker.state, STATE_OPEN)
+            self.assertEqual(self.breaker.open_count, 2)
+            self.assertGreater(second_delay, first_delay)
+            self.assertLessEqual(second_delay, config.BREAKER_MAX_DELAY)
+
+            # 持续探测失败：退避时长单调不减，最终停在上限
+            last_delay, now = second_delay, self.breaker.retry_at
+            for _ in range(20):
+                self.breaker.allow_request(now=now)
+                self.breaker.record_failure(now=now)
+                delay = self.breaker.retry_at - now
+                self.assertGreaterEqual(delay, last_delay)
+                self.assertLessEqual(delay, config.BREAKER_MAX_DELAY)
+                last_delay, now = delay, self.breaker.retry_at
+            self.assertEqual(last_delay, config.BREAKER_MAX_DELAY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,13 +13,16 @@ class TestConfig(unittest.TestCase):
         """测试 API 配置"""
         config = Config()
 
-        # 验证 API URLs 配置
-        self.assertIsInstance(config.API_URLS, list)
-        self.assertGreater(len(config.API_URLS), 0)
-
-        # 验证 API 名称配置
-        self.assertIsInstance(config.API_NAMES, list)
-        self.assertEqual(len(config.API_NAMES), 3)
+        # 验证数据源配置
+        self.assertIsInstance(config.SOURCES, list)
+        self.assertGreater(len(config.SOURCES), 0)
+        for source in config.SOURCES:
+            self.assertIn('id', source)
+            self.assertIn('name', source)
+            self.assertIn(source['transport'], ('http', 'websocket'))
+
+        # 验证默认数据源存在
+        self.assertIn(config.DEFAULT_SOURCE_ID, [source['id'] for source in config.SOURCES])
 
     def test_window_config(self):
         """测试窗口配置"""
@@ -0,0 +1,52 @@
+"""
+磁盘缓存模块测试
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.config import Config
+from src import disk_cache
+
+
+class TestDiskCache(unittest.TestCase):
+    """测试 JSON 磁盘缓存"""
+
+    def setUp(self):
+        """测试前的准备工作：使用临时缓存目录"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        self.patcher = patch.object(Config, 'CACHE_DIR', self.cache_dir)
+        self.patcher.start()
+
+    def tearDown(self):
+        """测试后清理临时目录"""
+        self.patcher.stop()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """测试写入后读取，目录不存在时自动创建"""
+        self.assertIsNone(disk_cache.load_json('demo'))
+        self.assertTrue(disk_cache.save_json('demo', {'links': ['wss://a'], 'name': '伦敦金'}))
+        self.assertEqual(disk_cache.load_json('demo'), {'links': ['wss://a'], 'name': '伦敦金'})
+
+    def test_corrupt_file_ignored(self):
+        """测试损坏的缓存文件按不存在处理"""
+        os.makedirs(self.cache_dir)
+        with open(os.path.join(self.cache_dir, 'demo.json'), 'w', encoding='utf-8') as f:
+            f.write('{"links": [')
+        self.assertIsNone(disk_cache.load_json('demo'))
+
+    def test_failed_write_keeps_old_file(self):
+        """测试写入失败时保留旧文件并清理临时文件"""
+        disk_cache.save_json('demo', {'v': 1})
+        self.assertFalse(disk_cache.save_json('demo', {'v': object()}))
+
+        self.assertEqual(disk_cache.load_json('demo'), {'v': 1})
+        self.assertEqual(os.listdir(self.cache_dir), ['demo.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+"""
+汇率 API 缓存测试（过期后返回旧汇率并在后台刷新，磁盘缓存跨实例共享）
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.api import ExchangeRateAPI
+from src.config import Config
+from src.disk_cache import load_json, save_json
+
+
+class TestExchangeRateAPI(unittest.TestCase):
+    """测试 ExchangeRateAPI 类"""
+
+    def setUp(self):
+        """测试前的准备工作：使用临时缓存目录"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_patcher = patch.object(Config, 'CACHE_DIR', self.tmp.name)
+        self.cache_patcher.start()
+        self.api = ExchangeRateAPI()
+        self.release = threading.Event()
+        self.calls = []
+
+        def slow_primary():
+            self.calls.append(time.monotonic())
+            self.release.wait(5)
+            return 7.2
+
+        self.providers_patcher = patch.dict(
+            self.api.providers, {'exchangerate_api': slow_primary, 'boc': lambda: None}, clear=True
+        )
+        self.providers_patcher.start()
+
+    def tearDown(self):
+        """测试后结束后台刷新"""
+        self.release.set()
+        self._wait_idle()
+        self.providers_patcher.stop()
+        self.cache_patcher.stop()
+        self.tmp.cleanup()
+
+    def _wait_idle(self):
+        """等待后台刷新结束"""
+        deadline = time.monotonic() + 2
+        while self.api._refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_cold_start_returns_default_without_blocking(self):
+        """测试首次获取不等待网络，返回默认汇率并只启动一次后台刷新"""
+        started = time.monotonic()
+        first = self.api.get_usd_to_cny()
+        second = self.api.get_usd_to_cny()
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual((first, second), (self.api.config.DEFAULT_EXCHANGE_RATE,) * 2)
+
+        self.release.set()
+        self._wait_idle()
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.api.get_usd_to_cny(), 7.2)
+
+    def test_expired_rate_served_while_refreshing(self):
+        """测试缓存过期后先返回旧汇率，刷新完成后换算系数与汇率一起更新并通知回调"""
+        updates = []
+        self.api.add_listener(lambda rate, factor: updates.append((rate, factor)))
+        self.api._set_rate(7.0)
+        self.api._state = (7.0, self.api._state[1], time.time() - self.api.config.EXCHANGE_RATE_CACHE_TIME - 1)
+
+        self.assertEqual(self.api.get_usd_to_cny(), 7.0)
+        self.release.set()
+        self._wait_idle()
+
+        rate, factor = self.api.get_conversion()
+        self.assertEqual(rate, 7.2)
+        self.assertAlmostEqual(factor, 7.2 / self.api.config.OUNCE_TO_GRAM)
+        self.assertEqual(updates[-1], (rate, factor))
+
+    def test_failed_refresh_keeps_rate_and_throttles_retries(self):
+        """测试刷新失败时继续使用旧汇率，重试间隔内不再发起请求"""
+        failing = MagicMock(return_value=None)
+        self.api.providers['exchangerate_api'] = failing
+        self.api.get_usd_to_cny()
+        self._wait_idle()
+        self.api.get_usd_to_cny()
+        self._wait_idle()
+
+        self.assertEqual(failing.call_count, 1)
+        self.assertEqual(self.api.get_usd_to_cny(), self.api.config.DEFAULT_EXCHANGE_RATE)
+
+    def test_fastest_plausible_provider_wins(self):
+        """测试同时请求所有来源：采用最快的有效结果，不等待慢来源，偏离过大的结果被忽略"""
+        self.api.providers['boc'] = lambda: 710.5  # 未按每 100 外币换算的错误结果
+        self.api.register_provider('local', lambda: 7.1)
+
+        started = time.monotonic()
+        self.assertEqual(self.api.refresh(), 7.1)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(self.api.last_provider, 'local')
+
+    def test_table_only_from_plausible_provider(self):
+        """测试未通过合理性检查的来源附带的汇率表不被采用"""
+        self.api.providers['exchangerate_api'] = lambda: (71.0, {'CNY': 71.0, 'HKD': 78.0})
+        self.api.register_provider('local', lambda: 7.1)
+        self.assertEqual(self.api.refresh(), 7.1)
+        self.assertIsNone(self.api._table)
+
+    def test_table_refreshed_when_tableless_provider_wins(self):
+        """测试汇率由不带汇率表的来源先返回时，稍后到达的汇率表同样被采用并写入磁盘缓存"""
+        table_ready = threading.Event()
+
+        def slow_primary():
+            time.sleep(0.05)
+            return 7.2, {'CNY': 7.2, 'HKD': 7.8}
+
+        self.api.providers['exchangerate_api'] = slow_primary
+        self.api.register_provider('london_usdcnh', lambda: 7.1)
+        with patch.object(self.api, '_set_table', side_effect=lambda *args: (
+                ExchangeRateAPI._set_table(self.api, *args), table_ready.set())):
+            self.assertEqual(self.api.refresh(), 7.1)
+            self.assertEqual(self.api.last_provider, 'london_usdcnh')
+            self.assertTrue(table_ready.wait(2))
+
+        self.assertEqual(self.api.get_usd_to_cny(), 7.1)
+        self.assertEqual(self.api.get_rate('HKD'), 7.8)
+        deadline = time.monotonic() + 2
+        while 'rates' not in (load_json(ExchangeRateAPI.EXCHANGE_RATE_CACHE) or {}) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(load_json(ExchangeRateAPI.EXCHANGE_RATE_CACHE)['rates']['HKD'], 7.8)
+
+    def test_executor_reused(self):
+        """测试每次刷新复用同一线程池"""
+        self.api.register_provider('local', lambda: 7.1)
+        self.api.providers['exchangerate_api'] = lambda: None
+        with patch('src.api.ThreadPoolExecutor') as mock_executor, \
+                patch.object(self.api, '_load_cache', return_value=False):
+            self.assertEqual(self.api.refresh(), 7.1)
+            self.assertEqual(self.api.refresh(), 7.1)
+        mock_executor.assert_not_called()
+
+    def test_background_refresh_runs_on_event_loop(self):
+        """测试后台刷新在共享的异步 I/O 事件循环上进行，不另起刷新线程"""
+        threads = []
+        self.api.register_provider('local', lambda: 7.1)
+        self.api.add_listener(lambda rate, factor: threads.append(threading.current_thread().name))
+        self.api.get_usd_to_cny()
+        self._wait_idle()
+
+        self.assertEqual(self.api.cached_rate, 7.1)
+        self.assertEqual(threads, ['gold-async-loop'])
+
+    def test_refresh_after_shutdown(self):
+        """测试线程池关闭后刷新直接返回 None，保留旧汇率"""
+        self.api._set_rate(7.0)
+        self.api.shutdown()
+        self.assertIsNone(self.api.refresh())
+        self.assertEqual(self.api.cached_rate, 7.0)
+
+    def test_all_providers_fail(self):
+        """测试所有来源都失败或异常时返回 None，保留旧汇率"""
+        self.api._set_rate(7.0)
+
+        def broken():
+            raise RuntimeError('boom')
+
+        self.api.providers.update({'exchangerate_api': broken, 'boc': lambda: None})
+        self.assertIsNone(self.api.refresh())
+        self.assertEqual(self.api.cached_rate, 7.0)
+
+    def test_rate_shared_through_disk_cache(self):
+        """测试刷新得到的汇率和汇率表写入磁盘，新实例启动时直接使用且不再请求"""
+        # 只保留 local 一个来源，结果不受其他来源返回先后的影响
+        self.api.providers.clear()
+        self.api.register_provider('local', lambda: (7.1, {'CNY': 7.1, 'HKD': 7.8}))
+        self.assertEqual(self.api.refresh(), 7.1)
+        self.assertEqual(load_json(ExchangeRateAPI.EXCHANGE_RATE_CACHE)['provider'], 'local')
+
+        other = ExchangeRateAPI()
+        with patch.object(other, '_start_refresh') as mock_refresh:
+            self.assertEqual(other.get_usd_to_cny(), 7.1)
+            self.assertEqual(other.get_rate('HKD'), 7.8)
+            mock_refresh.assert_not_called()
+        self.assertEqual(other.cache_time, self.api.cache_time)
+
+    def test_expired_disk_cache_served_while_refreshing(self):
+        """测试磁盘缓存已过期时先使用缓存汇率，同时在后台刷新"""
+        save_json(ExchangeRateAPI.EXCHANGE_RATE_CACHE, {
+            'rate': 7.05, 'fetched_at': time.time() - Config.EXCHANGE_RATE_CACHE_TIME - 1
+        })
+        api = ExchangeRateAPI()
+        with patch.object(api, '_start_refresh') as mock_refresh:
+            self.assertEqual(api.get_usd_to_cny(), 7.05)
+            mock_refresh.assert_called_once()
+
+    def test_refresh_adopts_newer_disk_cache(self):
+        """测试其他进程刚刷新过时直接采用磁盘中的汇率，不发起请求"""
+        self.api._set_rate(7.0, time.time() - Config.EXCHANGE_RATE_CACHE_TIME - 1)
+        save_json(ExchangeRateAPI.EXCHANGE_RATE_CACHE,
+                  {'rate': 7.15, 'fetched_at': time.time(), 'rates': {'CNY': 7.15, 'HKD': 7.8}})
+
+        self.assertEqual(self.api.refresh(), 7.15)
+        self.assertEqual(self.calls, [])
+
+    def test_refresh_fetches_missing_table(self):
+        """测试磁盘缓存中的汇率有效但没有汇率表时仍发起请求获取汇率表"""
+        save_json(ExchangeRateAPI.EXCHANGE_RATE_CACHE, {'rate': 7.15, 'fetched_at': time.time()})
+        self.api.providers['exchangerate_api'] = lambda: (7.16, {'CNY': 7.16, 'HKD': 7.8})
+
+        self.assertEqual(self.api.refresh(), 7.16)
+        self.assertEqual(self.api.get_rate('HKD'), 7.8)
+
+    def test_corrupt_disk_cache_ignored(self):
+        """测试损坏的磁盘缓存被忽略"""
+        save_json(ExchangeRateAPI.EXCHANGE_RATE_CACHE, {'rate': 'n/a', 'fetched_at': time.time()})
+        self.assertIsNone(ExchangeRateAPI().cached_rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+后台抓取工作者测试
+"""
+
+import os
+import time
+import unittest
+from unittest.mock import MagicMock
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import Qt, QCoreApplication, QEventLoop, QMetaObject, QThread, QTimer
+
+from src.fetch_worker import PriceFetchWorker
+from src.scheduler import PollScheduler
+from src.sources import get_source_registry
+
+
+class TestPriceFetchWorker(unittest.TestCase):
+    """测试 PriceFetchWorker 类"""
+
+    def setUp(self):
+        """测试前的准备工作：模拟一个很慢的上游"""
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+
+        def slow_fetch_all(source_ids, **kwargs):
+            time.sleep(0.3)
+            return {i: (500.0, "500 元/克", "10:00:00", "测试") for i in source_ids}
+
+        self.api = MagicMock()
+        self.api.registry = get_source_registry()
+        self.api.current_source_id = 'czbank'
+        self.api.fetch_all_prices.side_effect = slow_fetch_all
+        self.london_ws = MagicMock()
+        self.london_ws.is_connected = False
+        self.london_ws.get_quote.return_value = None
+        self.london_ws.get_cached_price.return_value = (None, "伦敦金: 离线", "")
+
+        self.thread = QThread()
+        self.worker = PriceFetchWorker(self.api, self.london_ws, PollScheduler(['czbank', 'cmbc']))
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.start)
+
+    def tearDown(self):
+        """测试后停止工作线程"""
+        if self.thread.isRunning():
+            QMetaObject.invokeMethod(self.worker, "stop", Qt.ConnectionType.BlockingQueuedConnection)
+        self.thread.quit()
+        self.thread.wait(2000)
+
+    def test_event_loop_not_blocked_during_fetch(self):
+        """测试抓取期间界面线程事件循环不被阻塞，结果通过信号送回"""
+        received = []
+        gaps = []
+        last_tick = [time.perf_counter()]
+
+        def on_tick():
+            now = time.perf_counter()
+            gaps.append(now - last_tick[0])
+            last_tick[0] = now
+
+        self.worker.prices_ready.connect(received.append)
+        ticker = QTimer()
+        ticker.timeout.connect(on_tick)
+        ticker.start(1)
+
+        loop = QEventLoop()
+        QTimer.singleShot(1000, loop.quit)
+        self.thread.start()
+        last_tick[0] = time.perf_counter()
+        loop.exec()
+        ticker.stop()
+
+        self.assertTrue(received)
+        self.assertEqual(received[0]['czbank'][0], 500.0)
+        self.assertEqual(received[0]['london_gold'][1], "伦敦金: 离线")
+        self.assertLess(max(gaps), 0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
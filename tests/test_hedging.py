@@ -0,0 +1,85 @@
+"""
+对冲请求模块测试
+"""
+
+import threading
+import unittest
+
+from src.hedging import HedgeController
+from src.sources import get_source_registry
+
+
+class TestHedgeController(unittest.TestCase):
+    """测试 HedgeController 类"""
+
+    def setUp(self):
+        """测试前的准备工作：启用对冲并预置延迟样本"""
+        self.hedger = HedgeController()
+        self.source_id, self.other_id = get_source_registry().http_ids()[:2]
+        self.hedger.config.HEDGE_ENABLED = True
+        self.hedger.config.HEDGE_BUDGET_RATIO = 1
+        for _ in range(self.hedger.config.HEDGE_MIN_SAMPLES):
+            self.hedger._record_latency(self.source_id, 0.05)
+
+    def tearDown(self):
+        """测试后关闭线程池"""
+        self.hedger.shutdown()
+
+    def test_hedge_wins_when_primary_stalls(self):
+        """测试主请求卡住时对冲请求胜出，落败请求被清理"""
+        stall = threading.Event()
+        calls = []
+        discarded = []
+
+        def request():
+            calls.append(1)
+            if len(calls) == 1:
+                stall.wait(2)
+                return 'primary'
+            return 'hedge'
+
+        result = self.hedger.execute(self.source_id, request, on_discard=discarded.append)
+        stall.set()
+
+        self.assertEqual(result, 'hedge')
+        metrics = self.hedger.get_metrics()[self.source_id]
+        self.assertEqual(metrics['hedges'], 1)
+        self.assertEqual(metrics['hedge_wins'], 1)
+        self.assertEqual(metrics['win_rate'], 1.0)
+        self.hedger.executor.shutdown(wait=True)
+        self.assertEqual(discarded, ['primary'])
+
+    def test_no_hedge_without_budget(self):
+        """测试对冲预算耗尽时不补发请求"""
+        self.hedger.config.HEDGE_BUDGET_RATIO = 0
+        stall = threading.Event()
+        calls = []
+
+        def request():
+            calls.append(1)
+            stall.wait(0.3)
+            return 'primary'
+
+        self.assertEqual(self.hedger.execute(self.source_id, request), 'primary')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.hedger.get_metrics()[self.source_id]['hedges'], 0)
+
+    def test_failed_requests_recorded(self):
+        """测试超时和异常的请求同样计入延迟样本"""
+        self.hedger.config.HEDGE_ENABLED = False
+
+        def timeout():
+            raise TimeoutError('read timeout')
+
+        with self.assertRaises(TimeoutError):
+            self.hedger.execute(self.other_id, timeout)
+        self.assertEqual(len(self.hedger._latencies[self.other_id]), 1)
+
+    def test_disabled_runs_inline(self):
+        """测试未启用时直接在调用线程执行"""
+        self.hedger.config.HEDGE_ENABLED = False
+        self.assertEqual(self.hedger.execute(self.source_id, threading.current_thread), threading.current_thread())
+
+
+if __name__ == '__main__':
+    unittest.main()
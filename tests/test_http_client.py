@@ -0,0 +1,40 @@
+"""
+HTTP 会话池测试
+"""
+
+import unittest
+from unittest.mock import patch
+
+from src.http_client import HttpSessionPool, get_http_pool
+
+
+class TestHttpSessionPool(unittest.TestCase):
+    """测试 HttpSessionPool 类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.pool = HttpSessionPool()
+
+    def tearDown(self):
+        """测试后清理"""
+        self.pool.close()
+
+    def test_session_reused(self):
+        """测试多次获取复用同一个会话"""
+        self.assertIs(self.pool.get_session(), self.pool.get_session())
+
+    def test_session_recreated_after_idle_timeout(self):
+        """测试空闲超时后重建会话"""
+        first = self.pool.get_session()
+        with patch('src.http_client.time.monotonic',
+                   return_value=self.pool._last_used + self.pool.config.HTTP_IDLE_TIMEOUT + 1):
+            second = self.pool.get_session()
+        self.assertIsNot(first, second)
+
+    def test_shared_pool_singleton(self):
+        """测试全局会话池为单例"""
+        self.assertIs(get_http_pool(), get_http_pool())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+JSON 解码模块测试
+"""
+
+import json
+import sys
+import unittest
+from unittest.mock import patch
+
+from src import json_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    """测试解码库选择"""
+
+    def test_falls_back_to_stdlib(self):
+        """测试加速解码库都未安装时使用标准库"""
+        with patch.dict(sys.modules, {'orjson': None, 'ujson': None}):
+            name, loads = json_codec.select_decoder()
+        self.assertEqual(name, 'json')
+        self.assertIs(loads, json.loads)
+
+    def test_preferred_decoder(self):
+        """测试指定标准库时不使用加速解码库"""
+        name, loads = json_codec.select_decoder('json')
+        self.assertEqual(name, 'json')
+        self.assertEqual(loads('[{"symbol": "GOLD", "bid": 1.5}]'), [{'symbol': 'GOLD', 'bid': 1.5}])
+
+    def test_selected_decoder_round_trip(self):
+        """测试进程内选定的解码函数可解析 str 和 bytes，错误时抛出 ValueError"""
+        self.assertIn(json_codec.DECODER_NAME, json_codec.DECODER_PREFERENCE)
+        self.assertEqual(json_codec.loads('{"a": 1}'), {'a': 1})
+        self.assertEqual(json_codec.loads(b'{"a": 1}'), {'a': 1})
+        with self.assertRaises(ValueError):
+            json_codec.loads('{bad')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,649 @@
+"""
+伦敦金 WebSocket 客户端测试
+"""
+
+import asyncio
+import json
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.api import LondonGoldWebSocket
+from src.config import Config
+from src.disk_cache import load_json, save_json
+from src.price_display import PriceDisplay
+from src.sources import SourceRegistry
+
+
+class TestLondonGoldWebSocket(unittest.TestCase):
+    """测试 LondonGoldWebSocket 类"""
+
+    def setUp(self):
+        """测试前的准备工作：使用临时缓存目录"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_patcher = patch.object(Config, 'CACHE_DIR', self.tmp.name)
+        self.cache_patcher.start()
+        self.ws = LondonGoldWebSocket()
+        self.frame = json.dumps([
+            {'symbol': 'USDX', 'bid': 99.1, 'ask': 99.2},
+            {'symbol': 'GOLD', 'bid': 2850.5, 'ask': 2851.5},
+            {'symbol': 'SILVER', 'bid': 32.1, 'ask': 32.2},
+            {'symbol': 'COPPER', 'bid': 4.5, 'ask': '4.6'},
+        ])
+
+    def tearDown(self):
+        """测试后停止重连线程，等待地址择优写完排名"""
+        self.ws.stop()
+        self._join_lanes()
+        self.ws.wait_for_races(2)
+        self.cache_patcher.stop()
+        self.tmp.cleanup()
+
+    def _join_lanes(self):
+        """等待所有连接线程退出"""
+        for lane in self.ws.lanes:
+            if lane.thread is not None:
+                lane.thread.join(2)
+
+    def test_quote_table_preallocated(self):
+        """测试行情表按配置的品种预分配"""
+        for symbol in self.ws.config.WS_SYMBOLS:
+            self.assertIn(symbol, self.ws.quotes)
+            self.assertIsNone(self.ws.get_quote(symbol))
+
+    def test_decodes_every_symbol(self):
+        """测试一帧中的所有品种都被写入行情表"""
+        self.ws._on_message(None, self.frame)
+
+        self.assertEqual(self.ws.get_quote('GOLD').bid, 2850.5)
+        self.assertEqual(self.ws.get_quote('SILVER').ask, 32.2)
+        self.assertEqual(self.ws.get_quote('USDX').bid, 99.1)
+        # 未预分配的品种首次出现时追加
+        self.assertEqual(self.ws.get_quote('COPPER').ask, 4.6)
+
+    def test_subscribers_per_symbol(self):
+        """测试订阅者只收到所订阅品种的报价"""
+        received = []
+        self.ws.subscribe('SILVER', lambda symbol, quote: received.append((symbol, quote.bid)))
+
+        self.ws._on_message(None, self.frame)
+        self.ws._on_message(None, json.dumps([{'symbol': 'GOLD', 'bid': 2860.0, 'ask': 2861.0}]))
+
+        self.assertEqual(received, [('SILVER', 32.1)])
+
+    def test_bad_items_skipped(self):
+        """测试无法解析的条目被跳过，不影响同一帧中的其他品种"""
+        self.ws._on_message(None, json.dumps([{'symbol': 'GOLD', 'bid': 'n/a'}, 'x', {'symbol': 'SILVER', 'bid': 30, 'ask': 31}]))
+        self.assertIsNone(self.ws.get_quote('GOLD'))
+        self.assertEqual(self.ws.get_quote('SILVER').bid, 30.0)
+
+    def test_prefilter_skips_untracked_frames(self):
+        """测试不含关注品种的帧在解码前被跳过"""
+        with patch('src.api.decode_json') as mock_decode:
+            self.ws._on_message(None, json.dumps([{'symbol': 'COPPER', 'bid': 4.5, 'ask': 4.6}]))
+            mock_decode.assert_not_called()
+        self.assertEqual(self.ws.skipped_frames, 1)
+        self.assertIsNone(self.ws.get_quote('COPPER'))
+
+        # 订阅后该品种的帧不再被跳过（bytes 消息同样适用）
+        self.ws.subscribe('COPPER', lambda symbol, quote: None)
+        self.ws._on_message(None, json.dumps([{'symbol': 'COPPER', 'bid': 4.5, 'ask': 4.6}]).encode())
+        self.assertEqual(self.ws.get_quote('COPPER').bid, 4.5)
+
+    def test_latest_price_per_symbol(self):
+        """测试按品种换算人民币/克价格"""
+        self.ws._on_message(None, self.frame)
+        self.ws.exchange_rate_api._set_rate(7.0)
+        gold, gold_text, _ = self.ws.get_latest_price('GOLD')
+        silver, _, _ = self.ws.get_latest_price('SILVER')
+
+        self.assertAlmostEqual(gold, round(2850.5 * 7.0 / self.ws.config.OUNCE_TO_GRAM, 2))
+        self.assertIn("元/克", gold_text)
+        self.assertAlmostEqual(silver, round(32.1 * 7.0 / self.ws.config.OUNCE_TO_GRAM, 2))
+        self.assertEqual(self.ws.get_latest_price('PLATINUM'), (None, "PLATINUM: 离线", ""))
+
+    def test_parser_and_unit_from_registry(self):
+        """测试 WebSocket 数据源的帧解析器和价格单位来自数据源注册表"""
+        self.ws.stop()
+        registry = SourceRegistry([
+            {'id': 'gold', 'name': '伦敦金', 'transport': 'websocket', 'symbol': 'GOLD', 'unit': '元/克(估)'},
+        ])
+        with patch('src.api.get_source_registry', return_value=registry):
+            self.ws = LondonGoldWebSocket()
+        self.assertEqual(registry.get('gold').parser, 'quote_list')
+
+        self.ws._on_message(None, self.frame)
+        self.ws.exchange_rate_api._set_rate(7.0)
+        _, text, _ = self.ws.get_cached_price('GOLD')
+        self.assertTrue(text.endswith(" 元/克(估)"))
+        self.assertTrue(self.ws.get_detailed_info('GOLD', 0, None, '', 0, 0, '→')[0].endswith(" 元/克(估)"))
+
+        # 未知解析器或同一连接上混用不同解析器时拒绝启动
+        for specs in (
+            [{'id': 'gold', 'name': 'G', 'transport': 'websocket', 'symbol': 'GOLD', 'parser': 'csv'}],
+            [{'id': 'gold', 'name': 'G', 'transport': 'websocket', 'symbol': 'GOLD'},
+             {'id': 'silver', 'name': 'S', 'transport': 'websocket', 'symbol': 'SILVER', 'parser': 'json_price'}],
+        ):
+            with patch('src.api.get_source_registry', return_value=SourceRegistry(specs)):
+                with self.assertRaises(ValueError):
+                    LondonGoldWebSocket()
+
+    def test_quotes_are_immutable_snapshots(self):
+        """测试每次报价生成新快照，已取得的快照不会被后续报价或汇率更新修改"""
+        self.ws._on_message(None, self.frame)
+        first = self.ws.get_quote('GOLD')
+        with self.assertRaises(AttributeError):
+            first.bid = 0
+
+        self.ws._on_message(None, json.dumps([{'symbol': 'GOLD', 'bid': 2860.0, 'ask': 2861.0}]))
+        self.ws.exchange_rate_api._set_rate(7.5)
+
+        self.assertEqual(first.bid, 2850.5)
+        latest = self.ws.get_quote('GOLD')
+        self.assertEqual((latest.bid, latest.exchange_rate), (2860.0, 7.5))
+        self.assertAlmostEqual(latest.bid_cny, round(2860.0 * 7.5 / self.ws.config.OUNCE_TO_GRAM, 2))
+        self.assertEqual(self.ws.get_detailed_info('GOLD', 0, None, '', 0, 0, '→')[0], f"{latest.bid_cny:.2f} 元/克")
+
+    def test_detailed_info_through_display(self):
+        """测试详细信息的买入价和汇率按显示币种/单位输出"""
+        self.ws._on_message(None, self.frame)
+        rate_api = self.ws.exchange_rate_api
+        rate_api._set_table({'CNY': 7.0, 'HKD': 7.8})
+        rate_api._set_rate(7.0)
+        display = PriceDisplay(rate_api, 'HKD', 'ounce')
+
+        line1, _, _, line4 = self.ws.get_detailed_info('GOLD', 0, 8000.0, '', 0, 0, '→', display)
+        bid_cny = self.ws.get_quote('GOLD').bid_cny
+        self.assertEqual(line1, display.format(display.convert(bid_cny)))
+        self.assertEqual(line4, "上次提醒: 8000.00 | 汇率: 7.8000 (HKD)")
+        self.assertNotIn("元/克", line1)
+
+    def test_rate_update_during_message_not_lost(self):
+        """测试报价生成期间到达的汇率更新不会被按旧汇率生成的快照覆盖"""
+        self.ws._apply_conversion(7.0, 7.0 / self.ws.config.OUNCE_TO_GRAM)
+        make_quote = self.ws._make_quote
+        updater = threading.Thread(
+            target=self.ws._apply_conversion, args=(7.5, 7.5 / self.ws.config.OUNCE_TO_GRAM)
+        )
+
+        def racing_make_quote(*args):
+            # 生成快照时汇率恰好更新
+            if updater.ident is None:
+                updater.start()
+                updater.join(0.2)
+            return make_quote(*args)
+
+        with patch.object(self.ws, '_make_quote', side_effect=racing_make_quote):
+            self.ws._on_message(None, self.frame)
+        updater.join(2)
+
+        self.assertEqual(self.ws.get_quote('GOLD').exchange_rate, 7.5)
+        self.assertEqual(self.ws.get_quote('SILVER').exchange_rate, 7.5)
+
+    def test_price_never_waits_for_exchange_rate(self):
+        """测试汇率请求进行中时报价照常写入和读取（使用上次的汇率换算），汇率到达后快照按新汇率更新"""
+        fetching = threading.Event()
+        release = threading.Event()
+
+        def slow_rate():
+            fetching.set()
+            release.wait(5)
+            return 7.0
+
+        rate_api = self.ws.exchange_rate_api
+        with patch.dict(rate_api.providers, {'exchangerate_api': slow_rate}, clear=True):
+            started = time.monotonic()
+            self.ws._on_message(None, self.frame)
+            price, _, _ = self.ws.get_latest_price('GOLD')
+            self.assertLess(time.monotonic() - started, 0.5)
+            self.assertTrue(fetching.wait(2))
+            self.assertEqual(self.ws.get_quote('GOLD').exchange_rate, self.ws.config.DEFAULT_EXCHANGE_RATE)
+
+            release.set()
+            deadline = time.monotonic() + 2
+            while rate_api.cached_rate is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(self.ws.get_quote('GOLD').exchange_rate, 7.0)
+
+    def test_cold_start_uses_cached_rate(self):
+        """测试启动时使用磁盘缓存中的汇率，首个报价即按该汇率换算"""
+        self.ws.stop()
+        save_json('exchange_rate', {'rate': 7.2, 'fetched_at': time.time()})
+        self.ws = LondonGoldWebSocket()
+
+        self.ws._on_message(None, self.frame)
+        self.assertEqual(self.ws.get_quote('GOLD').exchange_rate, 7.2)
+
+    def test_usdcnh_quote_as_rate_provider(self):
+        """测试推送中新鲜的美元兑离岸人民币报价作为汇率来源"""
+        rate_provider = self.ws.exchange_rate_api.providers['london_usdcnh']
+        self.assertIsNone(rate_provider())
+
+        self.ws._on_message(None, json.dumps([{'symbol': 'USDCNH', 'bid': 7.1, 'ask': 7.12}]))
+        self.assertAlmostEqual(rate_provider(), 7.11)
+
+        with patch('src.api.time.monotonic', return_value=time.monotonic() + self.ws.config.WS_USDCNH_MAX_AGE + 1):
+            self.assertIsNone(rate_provider())
+
+    def test_reconnects_without_limit(self):
+        """测试连续失败后仍持续重连（不再受最大次数限制）"""
+        self.ws.config.WS_RECONNECT_INTERVAL = 0.001
+        self.ws.config.WS_RECONNECT_MAX_INTERVAL = 0.01
+        attempts = []
+
+        def fail(url, lane_index=0):
+            attempts.append(url)
+            if len(attempts) >= 12:
+                self.ws.should_stop = True
+            raise ConnectionError("down")
+
+        with patch.object(self.ws, '_fetch_ws_url', return_value='wss://test'), \
+                patch.object(self.ws, '_connect', side_effect=fail):
+            self.ws.start()
+            self._join_lanes()
+
+        self.assertEqual(len(attempts), 12)
+        self.assertEqual(self.ws.get_connection_stats()['consecutive_failures'], 11)
+
+    def test_stop_during_link_race_skips_connect(self):
+        """测试择优地址期间停止时不再建立连接，择优保留的连接被关闭"""
+        sock = MagicMock()
+
+        def fetch(lane_index=None):
+            self.ws.lanes[lane_index].prepared_socket = ('wss://test', sock)
+            self.ws.stop()
+            return 'wss://test'
+
+        with patch.object(self.ws, '_fetch_ws_url', side_effect=fetch), \
+                patch.object(self.ws, '_connect') as mock_connect:
+            self.ws.start()
+            self._join_lanes()
+
+        mock_connect.assert_not_called()
+        sock.close.assert_called_once()
+        self.assertFalse(self.ws.is_running())
+
+    def test_restart_while_old_thread_racing(self):
+        """测试停止后旧线程仍在择优地址时重新启动：新线程建立连接，旧线程择优结束后退出"""
+        racing = threading.Event()
+        release = threading.Event()
+        connected = []
+
+        def fetch(lane_index=None):
+            if not racing.is_set():
+                racing.set()
+                release.wait(2)
+            return 'wss://test'
+
+        def connect(url, lane_index=0):
+            connected.append(threading.current_thread())
+            self.ws.should_stop = True
+
+        with patch.object(self.ws, '_fetch_ws_url', side_effect=fetch), \
+                patch.object(self.ws, '_connect', side_effect=connect):
+            self.ws.start()
+            old_thread = self.ws.lanes[0].thread
+            self.assertTrue(racing.wait(2))
+            self.ws.stop()
+            self.ws.start()
+            self.assertIsNot(self.ws.lanes[0].thread, old_thread)
+            self._join_lanes()
+            release.set()
+            old_thread.join(2)
+
+        self.assertEqual(connected, [self.ws.lanes[0].thread])
+
+    def test_open_after_stop_closes(self):
+        """测试停止时正在握手的连接建立后立即关闭"""
+        ws = MagicMock()
+        self.ws.stop()
+        self.ws._on_open(ws, 0)
+        ws.close.assert_called_once()
+        self.assertFalse(self.ws.is_connected)
+
+    def test_network_available_wakes_backoff(self):
+        """测试网络恢复通知跳过剩余的退避等待"""
+        self.ws.config.WS_RECONNECT_INTERVAL = 30
+        attempts = []
+        second_attempt = threading.Event()
+
+        def fail(url, lane_index=0):
+            attempts.append(url)
+            if len(attempts) == 2:
+                second_attempt.set()
+            raise ConnectionError("down")
+
+        with patch.object(self.ws, '_fetch_ws_url', return_value='wss://test'), \
+                patch.object(self.ws, '_connect', side_effect=fail):
+            self.ws.start()
+            time.sleep(0.1)
+            self.assertEqual(len(attempts), 1)
+            self.ws.notify_network_available()
+            self.assertTrue(second_attempt.wait(1))
+            self.ws.stop()
+
+    def test_connection_stats(self):
+        """测试连接时长、恢复次数和恢复耗时统计"""
+        self.assertFalse(self.ws.get_connection_stats()['connected'])
+
+        self.ws._on_open(None)
+        self.assertTrue(self.ws.get_connection_stats()['connected'])
+        self.ws._on_close(None, 1006, "lost")
+        time.sleep(0.05)
+        self.assertGreaterEqual(self.ws.get_connection_stats()['down_for'], 0.05)
+        self.ws._on_open(None)
+
+        stats = self.ws.get_connection_stats()
+        self.assertEqual(stats['reconnects'], 1)
+        self.assertGreaterEqual(stats['last_recover_time'], 0.05)
+        self.assertEqual(stats['down_for'], 0.0)
+        self.assertGreaterEqual(stats['uptime'], 0.0)
+
+    def test_cached_links_skip_discovery(self):
+        """测试缓存有效时不请求地址发现接口，冷启动同样在缓存的候选地址中择优"""
+        save_json(self.ws.WS_LINKS_CACHE, {'discovered_at': time.time(), 'links': ['wss://slow', 'wss://fast']})
+        delays = {'wss://slow': 0.2, 'wss://fast': 0.01}
+
+        async def probe(url):
+            await asyncio.sleep(delays[url])
+            return delays[url], MagicMock()
+
+        with patch.object(self.ws.http, 'get') as mock_get, \
+                patch.object(self.ws, '_probe_ws_link', side_effect=probe):
+            self.assertEqual(self.ws._fetch_ws_url(0), 'wss://fast')
+            mock_get.assert_not_called()
+
+        # 缓存过期后重新发现
+        save_json(self.ws.WS_LINKS_CACHE, {'discovered_at': time.time() - self.ws.config.WS_LINKS_CACHE_TTL - 1,
+                                           'links': ['wss://fast']})
+        self.assertIsNone(self.ws._load_cached_links())
+
+    def test_race_picks_fastest_and_ranks(self):
+        """测试并行握手取最快的地址，并按握手耗时记录排名"""
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'code': 0, 'data': {'hq_ws_links': {
+            'a': 'wss://slow', 'b': 'wss://fast', 'c': 'wss://down', 'd': 'wss://fast'
+        }}}
+        delays = {'wss://slow': 0.2, 'wss://fast': 0.01}
+
+        async def probe(url):
+            if url not in delays:
+                raise ConnectionError("refused")
+            await asyncio.sleep(delays[url])
+            return delays[url], MagicMock()
+
+        with patch.object(self.ws.http, 'get', return_value=response), \
+                patch.object(self.ws, '_probe_ws_link', side_effect=probe):
+            start = time.monotonic()
+            self.assertEqual(self.ws._fetch_ws_url(), 'wss://fast')
+            self.assertLess(time.monotonic() - start, 0.15)
+            time.sleep(0.3)
+
+        self.assertEqual(load_json(self.ws.WS_LINKS_CACHE)['links'], ['wss://fast', 'wss://slow', 'wss://down'])
+
+    def test_winning_connection_reused(self):
+        """测试择优胜出的连接交给 WebSocketApp 直接使用，落选的连接被关闭"""
+        save_json(self.ws.WS_LINKS_CACHE, {'discovered_at': time.time(), 'links': ['wss://fast', 'wss://slow']})
+        sockets = {'wss://fast': MagicMock(), 'wss://slow': MagicMock()}
+        delays = {'wss://fast': 0.01, 'wss://slow': 0.1}
+
+        async def probe(url):
+            await asyncio.sleep(delays[url])
+            return delays[url], sockets[url]
+
+        with patch.object(self.ws, '_probe_ws_link', side_effect=probe):
+            url = self.ws._fetch_ws_url(0)
+            time.sleep(0.2)
+        self.assertEqual(url, 'wss://fast')
+        self.assertEqual(self.ws.lanes[0].prepared_socket, ('wss://fast', sockets['wss://fast']))
+        sockets['wss://fast'].close.assert_not_called()
+        sockets['wss://slow'].close.assert_called_once()
+
+        with patch('src.api.WebSocketApp') as mock_app:
+            self.ws._connect(url, 0)
+        self.assertIs(mock_app.call_args.kwargs['socket'], sockets['wss://fast'])
+        self.assertIsNone(self.ws.lanes[0].prepared_socket)
+
+        # 只查询地址时不保留连接
+        with patch.object(self.ws, '_probe_ws_link', side_effect=probe):
+            self.assertEqual(self.ws._fetch_ws_url(), 'wss://fast')
+        self.assertEqual(sockets['wss://fast'].close.call_count, 1)
+
+    def test_all_links_down_uses_backup(self):
+        """测试所有候选地址握手失败时使用备用地址"""
+        save_json(self.ws.WS_LINKS_CACHE, {'discovered_at': time.time(), 'links': ['wss://down']})
+        self.ws.lanes[0].failures = 1
+        with patch.object(self.ws, '_probe_ws_link', side_effect=ConnectionError("refused")):
+            self.assertEqual(self.ws._fetch_ws_url(0), self.ws.config.WS_BACKUP_URL)
+
+    def test_race_connects_on_event_loop(self):
+        """测试择优的握手在异步 I/O 事件循环上完成，胜出的连接为带握手超时的阻塞模式 socket"""
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen()
+        url = f'ws://127.0.0.1:{server.getsockname()[1]}'
+        save_json(self.ws.WS_LINKS_CACHE, {'discovered_at': time.time(), 'links': [url]})
+        try:
+            self.assertEqual(self.ws._fetch_ws_url(0), url)
+            self.assertTrue(self.ws.wait_for_races(2))
+            sock = self.ws.lanes[0].prepared_socket[1]
+            self.assertEqual(sock.gettimeout(), self.ws.config.WS_HANDSHAKE_TIMEOUT)
+            self.assertEqual(sock.getpeername(), server.getsockname())
+        finally:
+            self.ws._close_prepared_socket(self.ws.lanes[0])
+            server.close()
+
+    def test_heartbeat_configured(self):
+        """测试连接启用 ping/pong 心跳"""
+        with patch('src.api.WebSocketApp') as mock_app:
+            self.ws._connect('wss://test')
+        mock_app.return_value.run_forever.assert_called_once_with(
+            ping_interval=self.ws.config.WS_PING_INTERVAL,
+            ping_timeout=self.ws.config.WS_PING_TIMEOUT
+        )
+
+    def test_watchdog_forces_reconnect(self):
+        """测试长时间无推送的连接被强制重连，并记录检测耗时"""
+        lane = self.ws.lanes[0]
+        lane.ws = MagicMock()
+        self.ws._on_open(None)
+        now = time.monotonic()
+
+        self.ws._check_stale(now + self.ws.config.WS_TICK_TIMEOUT - 1)
+        lane.ws.close.assert_not_called()
+
+        # pong 不能代替推送
+        self.ws._touch(0)
+        self.ws._check_stale(now + self.ws.config.WS_TICK_TIMEOUT + 1)
+        lane.ws.close.assert_called_once()
+
+        stats = self.ws.get_connection_stats()
+        self.assertFalse(stats['connected'])
+        self.assertEqual(stats['lanes'][0]['stale_reconnects'], 1)
+        self.assertIsNotNone(stats['lanes'][0]['last_detect_latency'])
+
+    def test_detect_latency_measured(self):
+        """测试断线检测耗时以最后一次收到数据的时间为起点"""
+        self.ws._on_open(None)
+        self.ws.lanes[0].last_activity -= 12
+        self.ws._on_error(None, TimeoutError("ping/pong timed out"))
+
+        lane_stats = self.ws.get_connection_stats()['lanes'][0]
+        self.assertGreaterEqual(lane_stats['last_detect_latency'], 12)
+        self.assertLess(lane_stats['last_detect_latency'], 13)
+        # 随后的 on_close 不重复记录
+        self.ws._on_close(None, None, None)
+        self.assertEqual(self.ws.get_connection_stats()['lanes'][0]['last_detect_latency'],
+                         lane_stats['last_detect_latency'])
+
+
+class TestRedundantConnections(unittest.TestCase):
+    """测试双连接冗余模式"""
+
+    def setUp(self):
+        """测试前的准备工作：开启冗余模式并使用临时缓存目录"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patchers = [
+            patch.object(Config, 'CACHE_DIR', self.tmp.name),
+            patch.object(Config, 'WS_REDUNDANT_CONNECTIONS', True),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.ws = LondonGoldWebSocket()
+        self.tick = json.dumps([{'symbol': 'GOLD', 'bid': 2850.5, 'ask': 2851.5}])
+
+    def tearDown(self):
+        """测试后恢复配置"""
+        self.ws.stop()
+        self.ws.wait_for_races(2)
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tmp.cleanup()
+
+    def test_first_arrival_wins(self):
+        """测试相同报价以先到的连接为准，另一条连接的重复报价被丢弃并统计落后时间"""
+        received = []
+        self.ws.subscribe('GOLD', lambda symbol, quote: received.append(quote.bid))
+
+        self.ws._on_message(None, self.tick, 1)
+        time.sleep(0.02)
+        self.ws._on_message(None, self.tick, 0)
+
+        self.assertEqual(received, [2850.5])
+        lanes = self.ws.get_connection_stats()['lanes']
+        self.assertEqual((lanes[1]['first_arrivals'], lanes[1]['duplicates']), (1, 0))
+        self.assertEqual((lanes[0]['first_arrivals'], lanes[0]['duplicates']), (0, 1))
+        self.assertGreaterEqual(lanes[0]['avg_lag_ms'], 20)
+
+        # 新报价照常接收
+        self.ws._on_message(None, json.dumps([{'symbol': 'GOLD', 'bid': 2851.0, 'ask': 2852.0}]), 0)
+        self.assertEqual(received, [2850.5, 2851.0])
+
+    def test_lagging_lane_never_overwrites_newer_quote(self):
+        """测试落后连接送达已被取代的旧报价时被丢弃，同一连接上价格回到旧值时照常发布"""
+        newer = json.dumps([{'symbol': 'GOLD', 'bid': 2851.0, 'ask': 2852.0}])
+        received = []
+        self.ws.subscribe('GOLD', lambda symbol, quote: received.append(quote.bid))
+
+        # 快连接依次送达 X、Y，慢连接随后送达 X、Y
+        self.ws._on_message(None, self.tick, 0)
+        self.ws._on_message(None, newer, 0)
+        self.ws._on_message(None, self.tick, 1)
+        self.assertEqual(self.ws.get_quote('GOLD').bid, 2851.0)
+        self.ws._on_message(None, newer, 1)
+
+        self.assertEqual(received, [2850.5, 2851.0])
+        lanes = self.ws.get_connection_stats()['lanes']
+        self.assertEqual((lanes[1]['first_arrivals'], lanes[1]['duplicates']), (0, 2))
+
+        # 快连接上价格回到 X：新报价，照常发布；慢连接随后送达的 X 仍被丢弃
+        self.ws._on_message(None, self.tick, 0)
+        self.ws._on_message(None, self.tick, 1)
+        self.assertEqual(received, [2850.5, 2851.0, 2850.5])
+        self.assertEqual(self.ws.get_quote('GOLD').bid, 2850.5)
+
+    def test_lagging_lane_replay_never_publishes_older_quote(self):
+        """测试落后连接重放包含重复价格的整段旧报价时全部丢弃，最新报价不被覆盖"""
+        def frame(bid):
+            return json.dumps([{'symbol': 'GOLD', 'bid': bid, 'ask': bid + 1}])
+
+        for bid in (100.0, 101.0, 100.0, 102.0):
+            self.ws._on_message(None, frame(bid), 0)
+        for bid in (100.0, 101.0, 100.0):
+            self.ws._on_message(None, frame(bid), 1)
+
+        self.assertEqual(self.ws.get_quote('GOLD').bid, 102.0)
+        lanes = self.ws.get_connection_stats()['lanes']
+        self.assertEqual((lanes[1]['first_arrivals'], lanes[1]['duplicates']), (0, 3))
+
+        # 落后连接追上后送达的 102 同样丢弃，此后的新报价照常发布
+        self.ws._on_message(None, frame(102.0), 1)
+        self.ws._on_message(None, frame(103.0), 1)
+        self.assertEqual(self.ws.get_quote('GOLD').bid, 103.0)
+        self.ws._on_message(None, frame(103.0), 0)
+        self.assertEqual(self.ws.get_connection_stats()['lanes'][0]['duplicates'], 1)
+
+    def test_dedupe_window_bounded(self):
+        """测试每个品种只记住最近 WS_DEDUPE_WINDOW 个报价"""
+        for i in range(self.ws.config.WS_DEDUPE_WINDOW + 5):
+            self.ws._on_message(None, json.dumps([{'symbol': 'GOLD', 'bid': 2800.0 + i, 'ask': 2801.0 + i}]), 0)
+        self.assertEqual(len(self.ws._recent_ticks['GOLD']), self.ws.config.WS_DEDUPE_WINDOW)
+
+    def test_failover_without_gap(self):
+        """测试一条连接断开时另一条继续提供报价，整体不算断线"""
+        self.ws._on_open(None, 0)
+        self.ws._on_open(None, 1)
+        self.ws._on_close(None, 1006, "lost", 0)
+
+        stats = self.ws.get_connection_stats()
+        self.assertTrue(stats['connected'])
+        self.assertEqual(stats['down_for'], 0.0)
+        self.ws._on_message(None, self.tick, 1)
+        self.assertEqual(self.ws.get_quote('GOLD').bid, 2850.5)
+
+        self.ws._on_close(None, 1006, "lost", 1)
+        self.assertFalse(self.ws.get_connection_stats()['connected'])
+
+    def test_in_use_link_keeps_measured_rank(self):
+        """测试其他连接正在使用的最快地址不参与择优时，排名沿用之前测得的耗时"""
+        save_json(self.ws.WS_LINKS_CACHE, {
+            'discovered_at': time.time(), 'links': ['wss://a', 'wss://b', 'wss://c'],
+            'latencies': {'wss://a': 0.01, 'wss://b': 0.05, 'wss://c': 0.08}
+        })
+        self.ws.lanes[0].url = 'wss://a'
+        self.ws._on_open(None, 0)
+        delays = {'wss://b': 0.09, 'wss://c': 0.02}
+
+        async def probe(url):
+            await asyncio.sleep(delays[url])
+            return delays[url], MagicMock()
+
+        with patch.object(self.ws, '_probe_ws_link', side_effect=probe):
+            self.assertEqual(self.ws._fetch_ws_url(1), 'wss://c')
+            self.assertTrue(self.ws.wait_for_races(2))
+
+        cached = load_json(self.ws.WS_LINKS_CACHE)
+        self.assertEqual(cached['links'], ['wss://a', 'wss://c', 'wss://b'])
+        self.assertEqual(cached['latencies'], {'wss://a': 0.01, 'wss://b': 0.09, 'wss://c': 0.02})
+
+    def test_late_ranking_written_to_original_cache_dir(self):
+        """测试调用方返回后才结束的握手把排名写入择优开始时的缓存目录"""
+        save_json(self.ws.WS_LINKS_CACHE, {'discovered_at': time.time(), 'links': ['wss://a', 'wss://b']})
+        release = threading.Event()
+
+        async def probe(url):
+            if url == 'wss://b':
+                while not release.is_set():
+                    await asyncio.sleep(0.01)
+                raise ConnectionError("refused")
+            return 0.01, MagicMock()
+
+        with patch.object(self.ws, '_probe_ws_link', side_effect=probe):
+            self.assertEqual(self.ws._fetch_ws_url(0), 'wss://a')
+            with tempfile.TemporaryDirectory() as other_dir, patch.object(Config, 'CACHE_DIR', other_dir):
+                release.set()
+                self.assertTrue(self.ws.wait_for_races(2))
+                self.assertIsNone(load_json(self.ws.WS_LINKS_CACHE))
+        self.assertEqual(load_json(self.ws.WS_LINKS_CACHE)['links'], ['wss://a', 'wss://b'])
+
+    def test_lanes_use_different_endpoints(self):
+        """测试两条连接使用不同的地址"""
+        save_json(self.ws.WS_LINKS_CACHE, {'discovered_at': time.time(), 'links': ['wss://a', 'wss://b']})
+        delays = {'wss://a': 0.01, 'wss://b': 0.1}
+
+        async def probe(url):
+            await asyncio.sleep(delays[url])
+            return delays[url], MagicMock()
+
+        with patch.object(self.ws, '_probe_ws_link', side_effect=probe):
+            self.ws.lanes[0].url = self.ws._fetch_ws_url(0)
+            self.ws._on_open(None, 0)
+            self.assertEqual(self.ws.lanes[0].url, 'wss://a')
+            self.assertEqual(self.ws._fetch_ws_url(1), 'wss://b')
+
+
+if __name__ == '__main__':
+    unittest.main()
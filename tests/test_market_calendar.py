@@ -0,0 +1,47 @@
+"""
+交易日历模块测试
+"""
+
+import unittest
+from datetime import datetime
+
+from src.market_calendar import MarketCalendar
+
+
+class TestMarketCalendar(unittest.TestCase):
+    """测试 MarketCalendar 类"""
+
+    def setUp(self):
+        """测试前的准备工作：工作日 09:00 开盘，次日 02:30 收盘"""
+        self.calendar = MarketCalendar(
+            [{'days': [0, 1, 2, 3, 4], 'start': '09:00', 'end': '02:30'}],
+            holidays=['2026-10-01'],
+            preopen_lead=120
+        )
+
+    def test_is_open_across_midnight(self):
+        """测试跨日时段：周五开盘的时段在周六凌晨收盘"""
+        self.assertTrue(self.calendar.is_open(datetime(2026, 10, 16, 10, 0)))  # 周五
+        self.assertTrue(self.calendar.is_open(datetime(2026, 10, 17, 1, 0)))  # 周六凌晨
+        self.assertFalse(self.calendar.is_open(datetime(2026, 10, 17, 3, 0)))
+        self.assertFalse(self.calendar.is_open(datetime(2026, 10, 18, 12, 0)))  # 周日
+
+    def test_holiday_closed(self):
+        """测试节假日休市"""
+        self.assertFalse(self.calendar.is_open(datetime(2026, 10, 1, 10, 0)))
+        self.assertEqual(self.calendar.next_open(datetime(2026, 10, 1, 10, 0)),
+                         self.calendar._now(datetime(2026, 10, 2, 9, 0)))
+
+    def test_next_open_after_weekend(self):
+        """测试周末之后的下次开盘时间"""
+        next_open = self.calendar.next_open(datetime(2026, 10, 17, 12, 0))
+        self.assertEqual(next_open, self.calendar._now(datetime(2026, 10, 19, 9, 0)))
+
+    def test_active_shortly_before_open(self):
+        """测试开盘前预热时间内即视为活跃"""
+        self.assertFalse(self.calendar.is_active(datetime(2026, 10, 19, 8, 50)))
+        self.assertTrue(self.calendar.is_active(datetime(2026, 10, 19, 8, 59)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+显示币种/单位换算测试
+"""
+
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+from src.api import ExchangeRateAPI
+from src.config import Config
+from src.disk_cache import load_json
+from src.price_display import PriceDisplay
+
+
+class TestPriceDisplay(unittest.TestCase):
+    """测试 PriceDisplay 类"""
+
+    def setUp(self):
+        """测试前的准备工作：使用临时缓存目录并写入汇率表"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_patcher = patch.object(Config, 'CACHE_DIR', self.tmp.name)
+        self.cache_patcher.start()
+        self.rate_api = ExchangeRateAPI()
+        self.rate_api._set_table({'USD': 1, 'CNY': 7.2, 'HKD': 7.8, 'EUR': 0.9, 'BAD': 'n/a'})
+        self.rate_api._set_rate(7.2)
+
+    def tearDown(self):
+        """测试后清理临时缓存目录"""
+        self.cache_patcher.stop()
+        self.tmp.cleanup()
+
+    def test_default_is_identity(self):
+        """测试默认人民币/克不换算"""
+        display = PriceDisplay(self.rate_api, 'CNY', 'gram')
+        result = (500.0, "500 元/克", "10:00:00", "浙商银行")
+        self.assertIs(display.apply(result), result)
+
+    def test_hkd_per_tael(self):
+        """测试换算为港元/两"""
+        display = PriceDisplay(self.rate_api, 'HKD', 'tael')
+        price, text, update_time, name = display.apply((500.0, "500 元/克", "10:00:00", "浙商银行"))
+
+        self.assertAlmostEqual(price, round(500.0 / 7.2 * 7.8 * 37.429, 2))
+        self.assertEqual(text, f"{price:.2f} 港元/两")
+        self.assertEqual((update_time, name), ("10:00:00", "浙商银行"))
+
+    def test_usd_per_ounce(self):
+        """测试换算为美元/盎司"""
+        display = PriceDisplay(self.rate_api, 'usd', 'ounce')
+        self.assertAlmostEqual(display.convert(500.0), round(500.0 / 7.2 * Config.OUNCE_TO_GRAM, 2))
+        self.assertEqual(display.label, "美元/盎司")
+
+    def test_missing_rate(self):
+        """测试汇率表中没有该币种时不显示错误价格"""
+        display = PriceDisplay(self.rate_api, 'XYZ', 'gram')
+        self.assertEqual(
+            display.apply((500.0, "500 元/克", "10:00:00", "浙商银行")),
+            (None, "浙商银行: 等待XYZ汇率...", "10:00:00", "浙商银行")
+        )
+        self.assertIsNone(self.rate_api.get_rate('BAD'))
+
+    def test_rate_text(self):
+        """测试汇率行按显示币种输出"""
+        self.assertEqual(PriceDisplay(self.rate_api, 'CNY', 'ounce').rate_text(7.2), "汇率: 7.2000")
+        self.assertEqual(PriceDisplay(self.rate_api, 'HKD', 'gram').rate_text(7.2), "汇率: 7.8000 (HKD)")
+        self.assertEqual(PriceDisplay(self.rate_api, 'XYZ', 'gram').rate_text(7.2), "汇率: 等待XYZ汇率...")
+
+    def test_unknown_unit(self):
+        """测试未知的重量单位"""
+        with self.assertRaises(ValueError):
+            PriceDisplay(self.rate_api, 'CNY', 'catty')
+
+    def test_table_from_primary_response(self):
+        """测试主汇率 API 的响应中所有币种一并缓存"""
+        rate_api = ExchangeRateAPI()
+        with patch.object(rate_api.http, 'get') as mock_get:
+            mock_get.return_value.status_code = 200
+            mock_get.return_value.json.return_value = {'rates': {'CNY': 7.1, 'HKD': 7.82, 'EUR': 0.91}}
+            rates = {'CNY': 7.1, 'HKD': 7.82, 'EUR': 0.91}
+            self.assertEqual(rate_api._fetch_from_primary_api(), (7.1, rates))
+            # 汇率表随汇率一起被采用
+            self.assertIsNone(rate_api._table)
+            with patch.dict(rate_api.providers, {'exchangerate_api': rate_api.providers['exchangerate_api']},
+                            clear=True):
+                self.assertEqual(rate_api.refresh(), 7.1)
+        self.assertEqual(rate_api.get_rate('HKD'), 7.82)
+        self.assertEqual(rate_api.get_rate('USD'), 1.0)
+        self.assertEqual(rate_api._table[1].typecode, 'd')
+
+    def test_refresh_then_format_end_to_end(self):
+        """测试刷新汇率后即可按港元显示：汇率由推送来源先返回时，汇率表同样来自主汇率 API 的响应"""
+        rate_api = ExchangeRateAPI()
+        rate_api.register_provider('london_usdcnh', lambda: 7.1)
+
+        def get(url, **kwargs):
+            if url != Config.EXCHANGE_RATE_APIS[0]:
+                raise ConnectionError("offline")
+            time.sleep(0.05)
+            response = MagicMock(status_code=200)
+            response.json.return_value = {'rates': {'USD': 1, 'CNY': 7.1, 'HKD': 7.8}}
+            return response
+
+        display = PriceDisplay(rate_api, 'HKD', 'gram')
+        with patch.object(rate_api.http, 'get', side_effect=get), patch.object(rate_api, '_start_refresh'):
+            self.assertEqual(rate_api.refresh(), 7.1)
+            deadline = time.monotonic() + 2
+            # 汇率表随后写入磁盘缓存
+            while 'rates' not in (load_json(rate_api.EXCHANGE_RATE_CACHE) or {}) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        price, text, _, _ = display.apply((500.0, "500.00 元/克", "10:00:00", "浙商银行"))
+        self.assertAlmostEqual(price, round(500.0 / 7.1 * 7.8, 2))
+        self.assertEqual(text, f"{price:.2f} 港元/克")
+
+
+if __name__ == '__main__':
+    unittest.main()
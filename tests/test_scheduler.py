@@ -0,0 +1,64 @@
+"""
+自适应轮询调度模块测试
+"""
+
+import time
+import unittest
+
+from src.scheduler import PollScheduler
+
+
+class TestPollScheduler(unittest.TestCase):
+    """测试 PollScheduler 类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.scheduler = PollScheduler(['czbank', 'cmbc'])
+        self.config = self.scheduler.config
+
+    def test_all_sources_due_initially(self):
+        """测试启动时所有数据源立即到期，取出后不会被重复调度"""
+        now = time.monotonic()
+        self.assertEqual(sorted(self.scheduler.due_sources(now)), ['cmbc', 'czbank'])
+        self.assertEqual(self.scheduler.due_sources(now), [])
+
+    def test_fast_move_tightens_interval(self):
+        """测试剧烈波动时收紧到最小间隔"""
+        self.scheduler.record_result('czbank', 600.0, now=0)
+        self.scheduler.record_result('czbank', 603.0, now=1)
+        self.assertEqual(self.scheduler.get_interval('czbank'), self.config.POLL_MIN_INTERVAL)
+
+    def test_flat_price_relaxes_interval(self):
+        """测试价格持平时逐步放宽到最大间隔"""
+        for i in range(30):
+            self.scheduler.record_result('czbank', 600.0, now=i)
+        self.assertEqual(self.scheduler.get_interval('czbank'), self.config.POLL_MAX_INTERVAL)
+
+    def test_error_backs_off(self):
+        """测试请求失败时间隔变长且不超过上限"""
+        for i in range(10):
+            self.scheduler.record_result('cmbc', None, now=i)
+        interval = self.scheduler.get_interval('cmbc')
+        self.assertGreater(interval, self.config.UPDATE_INTERVAL)
+        self.assertLessEqual(interval, self.config.POLL_ERROR_BACKOFF_MAX)
+
+    def test_request_budget(self):
+        """测试每分钟请求预算限制"""
+        self.scheduler.config.POLL_MAX_REQUESTS_PER_MINUTE = 1
+        now = time.monotonic()
+        self.assertEqual(len(self.scheduler.due_sources(now)), 1)
+        self.assertEqual(self.scheduler.due_sources(now + 1), [])
+        # 一分钟后预算恢复，未调度的数据源依然到期
+        self.assertEqual(len(self.scheduler.due_sources(now + 61)), 1)
+
+    def test_per_source_base_interval(self):
+        """测试每个数据源使用自己的基准间隔"""
+        scheduler = PollScheduler(['czbank', 'cmbc'], {'cmbc': 30})
+        self.assertEqual(scheduler.get_interval('czbank'), self.config.UPDATE_INTERVAL)
+        self.assertEqual(scheduler.get_interval('cmbc'), 30)
+        scheduler.record_result('cmbc', 600.0, now=0)
+        self.assertEqual(scheduler.get_interval('cmbc'), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+数据源注册表测试
+"""
+
+import unittest
+
+from src.config import Config
+from src.sources import SourceRegistry, get_source_registry
+
+
+class TestSourceRegistry(unittest.TestCase):
+    """测试 SourceRegistry 类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.registry = SourceRegistry([
+            {'id': 'a', 'name': 'A', 'transport': 'http', 'url': 'https://a.example/price', 'interval': 10},
+            {'id': 'ws', 'name': 'WS', 'transport': 'websocket', 'symbol': 'GOLD'},
+            {'id': 'b', 'name': 'B', 'transport': 'http', 'url': 'https://b.example/price', 'read_timeout': 2},
+        ])
+
+    def test_lookup_and_order(self):
+        """测试按 ID 查找并保持配置顺序"""
+        self.assertEqual(self.registry.ids(), ['a', 'ws', 'b'])
+        self.assertEqual(self.registry.http_ids(), ['a', 'b'])
+        self.assertEqual(self.registry.websocket_ids(), ['ws'])
+        self.assertEqual(self.registry.get('ws').symbol, 'GOLD')
+        self.assertIn('b', self.registry)
+        self.assertNotIn('c', self.registry)
+
+    def test_defaults(self):
+        """测试未配置的字段使用全局默认值"""
+        config = Config()
+        source = self.registry.get('b')
+        self.assertEqual(source.parser, 'json_price')
+        self.assertEqual(source.interval, config.UPDATE_INTERVAL)
+        self.assertEqual(source.connect_timeout, config.API_CONNECT_TIMEOUT)
+        self.assertEqual(source.read_timeout, 2)
+        self.assertEqual(self.registry.get('a').interval, 10)
+        # WebSocket 数据源默认使用报价列表帧解析器
+        self.assertEqual(self.registry.get('ws').parser, 'quote_list')
+
+    def test_next_id_wraps(self):
+        """测试切换数据源时循环"""
+        self.assertEqual(self.registry.next_id('a'), 'ws')
+        self.assertEqual(self.registry.next_id('b'), 'a')
+
+    def test_invalid_specs(self):
+        """测试重复 ID 和未知传输方式"""
+        with self.assertRaises(ValueError):
+            SourceRegistry([
+                {'id': 'a', 'name': 'A', 'transport': 'http'},
+                {'id': 'a', 'name': 'A2', 'transport': 'http'},
+            ])
+        with self.assertRaises(ValueError):
+            SourceRegistry([{'id': 'x', 'name': 'X', 'transport': 'ftp'}])
+
+    def test_default_registry_from_config(self):
+        """测试默认注册表来自 Config.SOURCES"""
+        registry = get_source_registry()
+        self.assertEqual(registry.ids(), [source['id'] for source in Config.SOURCES])
+        self.assertIs(registry, get_source_registry())
+
+
+if __name__ == '__main__':
+    unittest.main()
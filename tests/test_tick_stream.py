@@ -0,0 +1,81 @@
+"""
+推送行情合并队列测试
+"""
+
+import os
+import threading
+import time
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from src.tick_stream import ConflatingTickStream
+
+
+class TestConflatingTickStream(unittest.TestCase):
+    """测试 ConflatingTickStream 类"""
+
+    def setUp(self):
+        """测试前的准备工作"""
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.renders = []
+        self.stream = ConflatingTickStream(
+            lambda ticks: self.renders.append((time.monotonic(), ticks)), fps=10
+        )
+
+    def tearDown(self):
+        """测试后停止队列"""
+        self.stream.stop()
+
+    def _run_loop(self, ms: int):
+        """运行事件循环一段时间"""
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+
+    def test_first_tick_renders_immediately(self):
+        """测试空闲时的报价立即渲染"""
+        pushed_at = time.monotonic()
+        threading.Thread(target=self.stream.push, args=('london_gold', 1)).start()
+        self._run_loop(200)
+
+        self.assertEqual(len(self.renders), 1)
+        self.assertLess(self.renders[0][0] - pushed_at, 0.1)
+        self.assertEqual(self.renders[0][1], {'london_gold': 1})
+
+    def test_burst_conflated_and_fps_capped(self):
+        """测试行情爆发时只保留每个数据源的最新值，渲染次数不超过帧率上限"""
+        def burst():
+            for i in range(500):
+                self.stream.push('london_gold', i)
+                self.stream.push('london_silver', -i)
+                time.sleep(0.001)
+
+        start = time.monotonic()
+        thread = threading.Thread(target=burst)
+        thread.start()
+        while thread.is_alive():
+            self._run_loop(20)
+        self._run_loop(150)
+        elapsed = time.monotonic() - start
+
+        self.assertLessEqual(len(self.renders), elapsed * 10 + 1)
+        self.assertEqual(self.renders[-1][1].get('london_gold', 499), 499)
+        last_seen = {}
+        for _, ticks in self.renders:
+            last_seen.update(ticks)
+        self.assertEqual(last_seen, {'london_gold': 499, 'london_silver': -499})
+        self.assertEqual(self.stream.pushed, 1000)
+
+    def test_stop_discards_pending(self):
+        """测试停止后不再渲染"""
+        self.stream.stop()
+        self.stream.push('london_gold', 1)
+        self._run_loop(50)
+        self.assertEqual(self.renders, [])
+
+
+if __name__ == '__main__':
+    unittest.main()